@@ -0,0 +1,297 @@
+"""
+Managed Artifact Store
+
+This module owns the finished episode files. Each episode is written to a
+private temp file and published under a content-addressed name
+(`{slug}-{sha256[:16]}.mp3`) with an atomic rename. Readers therefore never
+see a half-written file, and two jobs can't overwrite each other's output.
+
+Every artifact has a JSON metadata sidecar (`{name}.json`) with its hash,
+size, creation time, last access and whatever the producer attached (topic,
+job id). Derived JSON documents, such as the chapter manifest, can be
+attached as `{name}.{kind}.json`; they share the artifact's lifetime. A
+garbage collector removes artifacts older than ARTIFACT_MAX_AGE. It then
+evicts the least recently accessed ones until the directory fits in
+ARTIFACT_MAX_MB.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from typing import Dict, Optional
+
+
+# Configuration
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", "output")
+ARTIFACT_MAX_MB = float(os.getenv("ARTIFACT_MAX_MB", "2048"))
+ARTIFACT_MAX_AGE = int(os.getenv("ARTIFACT_MAX_AGE", str(7 * 24 * 60 * 60)))
+ARTIFACT_GC_INTERVAL = int(os.getenv("ARTIFACT_GC_INTERVAL", "600"))
+
+META_SUFFIX = ".json"
+TEMP_PREFIX = ".tmp"
+# Temp files older than this belong to a write that will never be published
+STALE_TEMP_SECONDS = 6 * 60 * 60
+# Access times are written back to the sidecar at most this often
+ACCESS_WRITE_INTERVAL = 60
+
+
+def slugify(topic: str, max_length: int = 60) -> str:
+    """Turn a topic into a safe, readable file name prefix."""
+    slug = re.sub(r"[^a-z0-9]+", "_", topic.lower()).strip("_")
+    return slug[:max_length].rstrip("_") or "episode"
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """Directory of published, content-addressed episode files with disk-usage GC."""
+
+    def __init__(self, directory: str, max_bytes: int, max_age: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.removed = 0
+        self._lock = threading.Lock()
+        # name -> metadata
+        self._artifacts: Dict[str, dict] = {}
+        # name -> last_access as last written to the sidecar
+        self._written_access: Dict[str, float] = {}
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load_index(self):
+        """Read the sidecars on disk and adopt episode files that predate the store."""
+        names = set(os.listdir(self.directory))
+        for name in names:
+            if name.startswith(TEMP_PREFIX) or name.endswith(META_SUFFIX) or not os.path.isfile(self._path(name)):
+                continue
+            meta = None
+            if name + META_SUFFIX in names:
+                try:
+                    with open(self._path(name + META_SUFFIX)) as f:
+                        meta = json.load(f)
+                except (OSError, ValueError):
+                    meta = None
+            if meta is None:
+                path = self._path(name)
+                stat = os.stat(path)
+                meta = {
+                    "name": name,
+                    "sha256": hash_file(path),
+                    "size": stat.st_size,
+                    "created_at": stat.st_mtime,
+                    "last_access": stat.st_mtime,
+                }
+                self._write_meta(meta)
+            self._artifacts[name] = meta
+
+        # Sidecars and attachments whose artifact is gone
+        for name in names:
+            if name.endswith(META_SUFFIX) and not name.startswith(TEMP_PREFIX):
+                base = name[:-len(META_SUFFIX)]
+                if base not in self._artifacts and base.rsplit(".", 1)[0] not in self._artifacts:
+                    os.remove(self._path(name))
+
+    def _write_meta(self, meta: dict):
+        self._written_access[meta["name"]] = meta["last_access"]
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, self._path(meta["name"] + META_SUFFIX))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def create_temp(self, suffix: str = ".mp3") -> str:
+        """Return a new private temp path to write an artifact into."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=TEMP_PREFIX, suffix=suffix)
+        os.close(fd)
+        return tmp_path
+
+    def discard(self, tmp_path: str):
+        """Remove a temp file that will not be published."""
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+
+    def publish(self, tmp_path: str, slug: str, suffix: str = ".mp3", **metadata) -> dict:
+        """
+        Publish a finished temp file under its content-addressed name.
+
+        Args:
+            tmp_path: File returned by create_temp, fully written
+            slug: Readable name prefix, see slugify()
+            suffix: File extension
+            **metadata: Extra fields stored in the sidecar (e.g. topic, job_id)
+
+        Returns:
+            The artifact's metadata, including its file `name`
+        """
+        sha256 = hash_file(tmp_path)
+        name = f"{slug}-{sha256[:16]}{suffix}"
+        now = time.time()
+        meta = {
+            **metadata,
+            "name": name,
+            "sha256": sha256,
+            "size": os.path.getsize(tmp_path),
+            "created_at": now,
+            "last_access": now,
+        }
+        with self._lock:
+            if name in self._artifacts and os.path.exists(self._path(name)):
+                # Identical content is already published
+                self.discard(tmp_path)
+                meta = self._artifacts[name]
+                meta["last_access"] = now
+            else:
+                # mkstemp files are private to the owner; published episodes are not
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, self._path(name))
+                self._artifacts[name] = meta
+            self._write_meta(meta)
+        return dict(meta)
+
+    def get(self, name: str) -> Optional[dict]:
+        """Return an artifact's metadata, or None if it isn't published."""
+        with self._lock:
+            meta = self._artifacts.get(name)
+            return dict(meta) if meta is not None else None
+
+    def path(self, name: str) -> Optional[str]:
+        """Return the file path of a published artifact, or None."""
+        with self._lock:
+            if name not in self._artifacts:
+                return None
+        path = self._path(name)
+        return path if os.path.exists(path) else None
+
+    def attach_json(self, name: str, kind: str, document) -> bool:
+        """
+        Store a JSON document alongside a published artifact.
+
+        Returns:
+            False if the artifact is not published
+        """
+        payload = json.dumps(document, separators=(",", ":")).encode("utf-8")
+        with self._lock:
+            meta = self._artifacts.get(name)
+            if meta is None:
+                return False
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=TEMP_PREFIX)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, self._path(f"{name}.{kind}{META_SUFFIX}"))
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            if kind not in meta.setdefault("attachments", []):
+                meta["attachments"].append(kind)
+                self._write_meta(meta)
+        return True
+
+    def attachment_path(self, name: str, kind: str) -> Optional[str]:
+        """Return the file path of an artifact's attachment, or None."""
+        with self._lock:
+            meta = self._artifacts.get(name)
+            if meta is None or kind not in meta.get("attachments", ()):
+                return None
+        path = self._path(f"{name}.{kind}{META_SUFFIX}")
+        return path if os.path.exists(path) else None
+
+    def touch(self, name: str):
+        """Record an access for LRU eviction."""
+        with self._lock:
+            meta = self._artifacts.get(name)
+            if meta is None:
+                return
+            meta["last_access"] = time.time()
+            if meta["last_access"] - self._written_access.get(name, 0) >= ACCESS_WRITE_INTERVAL:
+                self._write_meta(meta)
+
+    def _remove(self, name: str) -> int:
+        meta = self._artifacts.pop(name)
+        self._written_access.pop(name, None)
+        paths = [self._path(name), self._path(name + META_SUFFIX)]
+        paths += [self._path(f"{name}.{kind}{META_SUFFIX}") for kind in meta.get("attachments", ())]
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.removed += 1
+        return meta["size"]
+
+    def collect_garbage(self) -> int:
+        """
+        Enforce the age limit and the disk quota.
+
+        Returns:
+            Number of artifacts removed
+        """
+        now = time.time()
+        removed = 0
+        with self._lock:
+            for name, meta in list(self._artifacts.items()):
+                if now - meta["created_at"] > self.max_age or not os.path.exists(self._path(name)):
+                    self._remove(name)
+                    removed += 1
+
+            total = sum(meta["size"] for meta in self._artifacts.values())
+            by_access = sorted(self._artifacts.values(), key=lambda meta: meta["last_access"])
+            for meta in by_access:
+                if total <= self.max_bytes:
+                    break
+                total -= self._remove(meta["name"])
+                removed += 1
+
+        # Temp files left behind by crashed or killed jobs
+        for name in os.listdir(self.directory):
+            path = self._path(name)
+            if name.startswith(TEMP_PREFIX):
+                try:
+                    if now - os.path.getmtime(path) > STALE_TEMP_SECONDS:
+                        os.remove(path)
+                except FileNotFoundError:
+                    pass
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "artifacts": len(self._artifacts),
+                "bytes": sum(meta["size"] for meta in self._artifacts.values()),
+                "max_bytes": self.max_bytes,
+                "removed": self.removed,
+            }
+
+
+_artifact_store: Optional[ArtifactStore] = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Return the shared artifact store."""
+    global _artifact_store
+    if _artifact_store is None:
+        _artifact_store = ArtifactStore(ARTIFACT_DIR, int(ARTIFACT_MAX_MB * 1024 * 1024), ARTIFACT_MAX_AGE)
+    return _artifact_store
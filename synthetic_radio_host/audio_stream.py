@@ -0,0 +1,63 @@
+"""
+Progressive Episode Streams
+
+An EpisodeStream is an append-only MP3 buffer for a single job. The
+synthesis pipeline appends each segment as soon as it is ready (in script
+order) and any number of listeners can follow along, blocking until the
+next segment arrives. This lets clients start playing an episode while the
+rest of it is still being synthesized.
+"""
+
+import asyncio
+from typing import AsyncIterator, List, Optional
+
+
+class EpisodeStream:
+    """Append-only audio buffer that readers can follow while it grows."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._closed = False
+        self.error: Optional[str] = None
+        self._event = asyncio.Event()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def size(self) -> int:
+        return sum(len(chunk) for chunk in self._chunks)
+
+    def _wake(self):
+        # Wake everyone waiting on the current event and start a fresh one
+        self._event.set()
+        self._event = asyncio.Event()
+
+    def append(self, data: bytes):
+        """Publish the next piece of audio to all listeners."""
+        if self._closed:
+            raise RuntimeError("Cannot append to a closed episode stream")
+        if data:
+            self._chunks.append(data)
+            self._wake()
+
+    def close(self, error: Optional[str] = None):
+        """Mark the stream finished. Safe to call more than once."""
+        if self._closed:
+            return
+        self._closed = True
+        self.error = error
+        self._wake()
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        """Yield audio from the start, waiting for new chunks until closed."""
+        index = 0
+        while True:
+            event = self._event
+            while index < len(self._chunks):
+                yield self._chunks[index]
+                index += 1
+            if self._closed:
+                return
+            await event.wait()
@@ -0,0 +1,184 @@
+"""
+Batch Podcast Generation
+
+This module runs a whole slate of topics in one process (`python main.py
+--batch topics.txt`). All topics share one event loop, so the Groq and
+Wikipedia connection pools and the TTS segment and Wikipedia caches are
+also shared, instead of being rebuilt by a cold process per episode.
+
+Every finished topic is appended to a JSON Lines manifest with its output
+file, stage timings and evaluation scores (with whether they came from the
+critic or the local heuristic scorer). The manifest doubles as the
+checkpoint: a rerun skips topics already recorded as completed, so an
+interrupted batch resumes where it stopped.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import contextlib
+from typing import Awaitable, Callable, Iterable, List, Optional, Set
+
+from wikipedia_client import normalize_title
+
+
+# Topics generated at the same time
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+
+def parse_topics(lines: Iterable[str]) -> List[str]:
+    """One topic per line; blank lines, # comments and repeated topics are skipped."""
+    topics = []
+    seen = set()
+    for line in lines:
+        topic = line.strip()
+        if not topic or topic.startswith("#"):
+            continue
+        key = normalize_title(topic)
+        if key not in seen:
+            seen.add(key)
+            topics.append(topic)
+    return topics
+
+
+def default_manifest_path(source: str) -> str:
+    """Manifest next to the topics file, or in the working directory for stdin."""
+    if source == "-":
+        return "batch-manifest.jsonl"
+    return os.path.splitext(source)[0] + ".manifest.jsonl"
+
+
+def load_checkpoint(path: str) -> Set[str]:
+    """Normalized titles of the topics a previous run already completed."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by an interrupted write
+                continue
+            if record.get("status") == "completed":
+                done.add(record["topic_key"])
+    return done
+
+
+def evaluation_scores(evaluation: Optional[dict]) -> Optional[dict]:
+    """Overall and per-category critic scores, or None if there was no usable evaluation."""
+    if not evaluation or evaluation.get("error"):
+        return None
+    scores = {"overall": evaluation.get("overall_score")}
+    for category, data in evaluation.get("categories", {}).items():
+        scores[category] = data.get("score")
+    return scores
+
+
+def evaluation_source(evaluation: Optional[dict]) -> Optional[str]:
+    """"critic" or "local" (heuristic) for a usable evaluation, else None."""
+    if not evaluation or evaluation.get("error"):
+        return None
+    # Critic results cached before sources were recorded have none
+    return evaluation.get("source", "critic")
+
+
+class ManifestWriter:
+    """Appends one JSON record per line and syncs it, so a crash loses at most the line being written."""
+
+    def __init__(self, path: str, truncate: bool = False):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "w" if truncate else "a", encoding="utf-8")
+
+    def write(self, record: dict):
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+async def run_batch(topics: List[str], generate: Callable[..., Awaitable[dict]], manifest_path: str,
+                    concurrency: int = BATCH_CONCURRENCY, resume: bool = True,
+                    include_improvement_prompt: bool = False, quiet: bool = False) -> dict:
+    """
+    Generate a podcast for every topic, `concurrency` at a time.
+
+    Args:
+        topics: Topics in the order they should be started
+        generate: run_podcast_generation (passed in to keep this module free of the pipeline imports)
+        manifest_path: JSON Lines manifest, also used as the checkpoint
+        concurrency: Topics generated at the same time
+        resume: Skip topics the manifest already has as completed; otherwise start a new manifest
+        include_improvement_prompt: Also generate improvement prompts
+        quiet: Hide the pipeline's own output and only print one line per topic
+
+    Returns:
+        dict: {"completed": int, "failed": int, "skipped": int, "manifest": str}
+    """
+    done = load_checkpoint(manifest_path) if resume else set()
+    pending = [topic for topic in topics if normalize_title(topic) not in done]
+    skipped = len(topics) - len(pending)
+
+    log = sys.stdout
+    print(f"📚 Batch: {len(pending)} topics to generate, {skipped} already done, {max(1, concurrency)} at a time", file=log)
+
+    writer = ManifestWriter(manifest_path, truncate=not resume)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    counts = {"completed": 0, "failed": 0}
+
+    async def run_one(topic: str):
+        async with semaphore:
+            started = time.time()
+            record = {"topic": topic, "topic_key": normalize_title(topic), "started_at": round(started, 3)}
+            try:
+                result = await generate(topic, include_improvement_prompt=include_improvement_prompt)
+            except Exception as e:
+                record.update(status="failed", error=str(e) or type(e).__name__)
+            else:
+                output_file = result["output_file"]
+                chapters_file = output_file + ".chapters.json"
+                improvement_prompt = result.get("improvement_prompt")
+                record.update(
+                    status="completed",
+                    output_file=output_file,
+                    chapters_file=chapters_file if os.path.exists(chapters_file) else None,
+                    timings=result["timings"],
+                    scores=evaluation_scores(result["evaluation"]),
+                    score_source=evaluation_source(result["evaluation"]),
+                    improvement_prompt=improvement_prompt["prompt"] if improvement_prompt and not improvement_prompt.get("error") else None,
+                )
+            record["duration"] = round(time.time() - started, 3)
+            writer.write(record)
+            counts[record["status"]] += 1
+
+            position = f"[{counts['completed'] + counts['failed']}/{len(pending)}]"
+            if record["status"] == "completed":
+                overall = (record["scores"] or {}).get("overall")
+                source = f" ({record['score_source']})" if record["score_source"] else ""
+                print(f"✅ {position} {topic} -> {record['output_file']} ({record['duration']}s, score {overall}{source})", file=log)
+            else:
+                print(f"❌ {position} {topic}: {record['error']}", file=log)
+
+    output = open(os.devnull, "w") if quiet else contextlib.nullcontext(sys.stdout)
+    try:
+        with output as stream, contextlib.redirect_stdout(stream):
+            await asyncio.gather(*(run_one(topic) for topic in pending))
+    finally:
+        writer.close()
+
+    print(f"\n📦 Batch finished: {counts['completed']} completed, {counts['failed']} failed, "
+          f"{skipped} skipped. Manifest: {manifest_path}", file=log)
+    return {**counts, "skipped": skipped, "manifest": manifest_path}
+
+
+def read_topics(source: str) -> List[str]:
+    """Topics from a file, or from stdin for '-'."""
+    if source == "-":
+        return parse_topics(sys.stdin)
+    with open(source, encoding="utf-8") as f:
+        return parse_topics(f)
@@ -0,0 +1,312 @@
+"""
+Local Stand-ins for Groq, Wikipedia and edge-tts
+
+This module serves canned responses shaped like the real upstream APIs, so
+the pipeline can be benchmarked offline:
+
+- Groq: POST /openai/v1/chat/completions (OpenAI-compatible chat completion,
+  streamed as server-sent chunks when "stream" is true)
+- Wikipedia: GET /w/api.php (action=query extracts/revisions, action=opensearch)
+- edge-tts: websocket /edge/v1 speaking the readaloud protocol, streaming
+  real MPEG-2 Layer III frames plus WordBoundary metadata
+
+Each service waits a configurable latency plus uniform jitter before it
+answers. TTS audio is streamed at a configurable multiple of real time.
+
+Usage:
+    python benchmarks/fake_services.py --port 8899 --llm-latency 0.8 --tts-speed 8
+"""
+
+import json
+import time
+import uuid
+import random
+import struct
+import asyncio
+import argparse
+
+from aiohttp import web, WSMsgType
+
+
+# MPEG-2 Layer III, 48 kbps, 24 kHz, mono - the format edge-tts produces
+FRAME_HEADER = 0xFFE00000 | (0b10 << 19) | (0b01 << 17) | (1 << 16) | (6 << 12) | (1 << 10) | (0b11 << 6)
+FRAME_SIZE = 144
+FRAME_SECONDS = 576 / 24000
+SILENT_FRAME = struct.pack(">I", FRAME_HEADER) + bytes(FRAME_SIZE - 4)
+TICKS_PER_SECOND = 10_000_000
+# Roughly how long one spoken word lasts
+WORD_SECONDS = 0.32
+# Streamed completions: share of the latency before the first token, characters per chunk
+LLM_FIRST_TOKEN_SHARE = 0.15
+LLM_CHARS_PER_CHUNK = 12
+
+SCRIPT_LINES = [
+    ("Priya", "Hey everyone! Aaj ka topic sunke na, mera dimaag literally ghoom gaya."),
+    ("Amit", "Arre yaar, sach mein? Matlab itna interesting hai kya?"),
+    ("Priya", "Haan haan, basically iski history hi itni wild hai ki kya bataun."),
+    ("Amit", "Accha? Chal shuru se bata, mujhe bhi thoda context chahiye."),
+    ("Priya", "Dekh, sabse pehle toh yeh samajh ki yeh cheez shuru kaise hui."),
+    ("Amit", "Hmm, matlab pehle log isko seriously lete hi nahi the?"),
+    ("Priya", "Bilkul nahi! Sab bolte the yeh toh bas ek phase hai, chal jayega."),
+    ("Amit", "Lol, classic. Aur phir kya hua, sab ne U-turn maar liya?"),
+    ("Priya", "Exactly! Phir research aayi aur sabka mood hi change ho gaya."),
+    ("Amit", "Wait wait, research matlab kis type ki? Thoda detail mein bata na."),
+    ("Priya", "Toh basically scientists ne dekha ki iska impact bahut bada hai."),
+    ("Amit", "Yaar yeh toh genuinely mind-blowing hai, mujhe pata hi nahi tha."),
+    ("Priya", "Aur sabse mazedaar baat, aaj bhi isme naye discoveries ho rahe hain."),
+    ("Amit", "Sahi hai bhai. Toh future mein kya expect karein hum?"),
+    ("Priya", "Honestly, abhi toh bas shuruaat hai, aage aur bhi crazy hoga."),
+    ("Amit", "Accha chal, listeners ko ek line mein summary de de."),
+    ("Priya", "Simple hai, yeh topic chhota lagta hai par game bada hai."),
+    ("Amit", "Perfect. Accha chal, baad mein aur bataunga, bye guys!"),
+]
+
+EVALUATION = {
+    "scores": {
+        "hinglish_quality": {"code_mixing_naturalness": 4, "cultural_appropriateness": 4, "romanized_hindi_fluency": 4},
+        "conversational_naturalness": {"human_likeness": 4, "natural_imperfections": 3, "filler_words_usage": 4, "turn_taking_flow": 4},
+        "emotional_expression": {"emotional_variation": 4, "pacing_markers": 3},
+        "content_coherence": {"topic_coherence": 4, "information_accuracy": 3, "avoids_ai_telltales": 3},
+        "host_chemistry": {"distinct_personalities": 3, "playful_banter": 4},
+    },
+    "strengths": ["Natural code-mixing", "Good back-and-forth", "Energetic opening"],
+    "improvements": ["More specific facts", "Fewer stock phrases", "Sharper host personalities"],
+    "feedback": "A lively, mostly natural conversation that could use more concrete detail.",
+}
+
+IMPROVEMENT_PROMPT = (
+    "<improvement_prompt><context>Hinglish podcast generator</context>"
+    "<focus>content_coherence, host_chemistry</focus>"
+    "<instructions>Ground every claim in the source article and give Amit a sceptical streak.</instructions>"
+    "</improvement_prompt>"
+)
+
+
+def make_article(title: str, sections: int = 8, paragraph_words: int = 120) -> str:
+    """Plain-text extract in the shape TextExtracts returns, with == Section == headings."""
+    rng = random.Random(title)
+    vocabulary = (
+        "history research discovery theory scientists observed early modern impact society "
+        "energy structure evidence model century experiment public culture development global "
+        "technology origin system population effect study record analysis future"
+    ).split()
+    parts = [f"{title} is a subject studied for a long time. " + " ".join(rng.choice(vocabulary) for _ in range(paragraph_words))]
+    for index in range(sections):
+        parts.append(f"\n\n== Section {index + 1} ==\n")
+        parts.append(" ".join(rng.choice(vocabulary) for _ in range(paragraph_words)).capitalize() + ".")
+    return "".join(parts)
+
+
+class FakeServices:
+    """aiohttp application serving all three fake upstreams."""
+
+    def __init__(self, llm_latency=0.8, wiki_latency=0.15, tts_latency=0.25, jitter=0.2,
+                 tts_speed=10.0, error_rate=0.0, seed=None):
+        self.llm_latency = llm_latency
+        self.wiki_latency = wiki_latency
+        self.tts_latency = tts_latency
+        self.jitter = jitter
+        self.tts_speed = tts_speed
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.requests = {"llm": 0, "wikipedia": 0, "tts": 0}
+
+    def _latency(self, base: float) -> float:
+        return max(0.0, base + self.random.uniform(-self.jitter, self.jitter) * base)
+
+    async def _delay(self, base: float):
+        await asyncio.sleep(self._latency(base))
+
+    def _fail(self) -> bool:
+        return self.random.random() < self.error_rate
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/openai/v1/chat/completions", self.chat_completions)
+        app.router.add_get("/w/api.php", self.wikipedia)
+        app.router.add_get("/edge/v1", self.tts)
+        app.router.add_get("/stats", self.stats)
+        return app
+
+    async def stats(self, request):
+        return web.json_response(self.requests)
+
+    # --- Groq ---
+
+    async def chat_completions(self, request):
+        self.requests["llm"] += 1
+        body = await request.json()
+        model = body.get("model", "")
+        latency = self._latency(self.llm_latency)
+        # A streamed completion sends its first token early and the rest over the remaining time
+        await asyncio.sleep(latency * LLM_FIRST_TOKEN_SHARE if body.get("stream") else latency)
+        if self._fail():
+            return web.json_response({"error": {"message": "Service unavailable", "type": "server_error"}}, status=503)
+
+        if model.startswith("llama"):
+            content = json.dumps({"conversation": [{"speaker": s, "text": t} for s, t in SCRIPT_LINES]})
+        elif model.startswith("qwen"):
+            content = json.dumps(EVALUATION)
+        else:
+            content = IMPROVEMENT_PROMPT
+
+        if body.get("stream"):
+            return await self._stream_completion(request, model, content, latency * (1 - LLM_FIRST_TOKEN_SHARE))
+
+        return web.json_response({
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 1200, "completion_tokens": len(content) // 4, "total_tokens": 1200 + len(content) // 4},
+        })
+
+    async def _stream_completion(self, request, model: str, content: str, duration: float):
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        pieces = [content[i:i + LLM_CHARS_PER_CHUNK] for i in range(0, len(content), LLM_CHARS_PER_CHUNK)]
+
+        def chunk(delta: dict, finish_reason=None) -> bytes:
+            data = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            return f"data: {json.dumps(data)}\n\n".encode()
+
+        try:
+            await response.write(chunk({"role": "assistant", "content": ""}))
+            for piece in pieces:
+                await response.write(chunk({"content": piece}))
+                await asyncio.sleep(duration / len(pieces))
+            await response.write(chunk({}, finish_reason="stop"))
+            await response.write(b"data: [DONE]\n\n")
+        except ConnectionResetError:
+            # The client stopped reading (e.g. it had enough lines)
+            pass
+        return response
+
+    # --- Wikipedia ---
+
+    async def wikipedia(self, request):
+        self.requests["wikipedia"] += 1
+        params = request.query
+        await self._delay(self.wiki_latency)
+        if self._fail():
+            return web.Response(status=503, text="Service unavailable")
+
+        if params.get("action") == "opensearch":
+            search = params.get("search", "")
+            limit = int(params.get("limit", "10"))
+            titles = [f"{search.title()} {suffix}".strip() for suffix in ("", "History", "Theory", "Science", "Culture", "Future", "Basics")]
+            return web.json_response([search, titles[:limit], [""] * limit, [""] * limit])
+
+        title = params.get("titles", "").replace("_", " ").strip()
+        if title.lower().startswith("missing"):
+            return web.json_response({"query": {"pages": {"-1": {"ns": 0, "title": title, "missing": ""}}}})
+
+        page = {"pageid": abs(hash(title)) % 10_000_000, "ns": 0, "title": title, "revisions": [{"revid": 1000 + len(title)}]}
+        if "extracts" in params.get("prop", ""):
+            page["extract"] = make_article(title)
+        return web.json_response({"batchcomplete": "", "query": {"pages": {str(page["pageid"]): page}}})
+
+    # --- edge-tts ---
+
+    async def tts(self, request):
+        self.requests["tts"] += 1
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        if self._fail():
+            # edge-tts reports a connection that closes without audio as NoAudioReceived
+            await ws.close()
+            return ws
+        async for message in ws:
+            if message.type != WSMsgType.TEXT or "Path:ssml" not in message.data:
+                continue
+            request_id = message.data.split("X-RequestId:", 1)[1].split("\r\n", 1)[0]
+            text = message.data.split("</prosody>", 1)[0].rsplit("'>", 1)[-1]
+            try:
+                await self._speak(ws, request_id, text.split())
+            except ConnectionResetError:
+                # The client gave up on this segment (e.g. its job was cancelled)
+                pass
+            break
+        await ws.close()
+        return ws
+
+    async def _speak(self, ws, request_id: str, words):
+        await self._delay(self.tts_latency)
+        await ws.send_str(self._text_message(request_id, "turn.start", "{}"))
+
+        offset = 0.05
+        for word in words or ["..."]:
+            metadata = {"Metadata": [{
+                "Type": "WordBoundary",
+                "Data": {
+                    "Offset": int(offset * TICKS_PER_SECOND),
+                    "Duration": int(WORD_SECONDS * 0.9 * TICKS_PER_SECOND),
+                    "text": {"Text": word, "Length": len(word), "BoundaryType": "WordBoundary"},
+                },
+            }]}
+            await ws.send_str(self._text_message(request_id, "audio.metadata", json.dumps(metadata)))
+
+            frames = max(1, round(WORD_SECONDS / FRAME_SECONDS))
+            await ws.send_bytes(self._audio_message(request_id, SILENT_FRAME * frames))
+            offset += frames * FRAME_SECONDS
+            # Synthesis runs faster than real time, by tts_speed
+            await asyncio.sleep(frames * FRAME_SECONDS / self.tts_speed)
+
+        await ws.send_str(self._text_message(request_id, "turn.end", "{}"))
+
+    @staticmethod
+    def _text_message(request_id: str, path: str, body: str) -> str:
+        return (
+            f"X-RequestId:{request_id}\r\n"
+            "Content-Type:application/json; charset=utf-8\r\n"
+            f"Path:{path}\r\n\r\n{body}"
+        )
+
+    @staticmethod
+    def _audio_message(request_id: str, audio: bytes) -> bytes:
+        headers = f"X-RequestId:{request_id}\r\nContent-Type:audio/mpeg\r\nPath:audio\r\n".encode()
+        return len(headers).to_bytes(2, "big") + headers + audio
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Serve fake Groq, Wikipedia and edge-tts endpoints")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="Seconds per LLM completion")
+    parser.add_argument("--wiki-latency", type=float, default=0.15, help="Seconds per Wikipedia request")
+    parser.add_argument("--tts-latency", type=float, default=0.25, help="Seconds before TTS audio starts")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Uniform jitter as a fraction of each latency")
+    parser.add_argument("--tts-speed", type=float, default=10.0, help="Audio seconds synthesized per wall-clock second")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser
+
+
+def main():
+    args = build_arg_parser().parse_args()
+    services = FakeServices(
+        llm_latency=args.llm_latency,
+        wiki_latency=args.wiki_latency,
+        tts_latency=args.tts_latency,
+        jitter=args.jitter,
+        tts_speed=args.tts_speed,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    web.run_app(services.app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
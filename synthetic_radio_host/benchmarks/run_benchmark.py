@@ -0,0 +1,294 @@
+"""
+Offline End-to-End Pipeline Benchmark
+
+This script runs `run_podcast_generation` against the local fakes in
+fake_services.py, so no Groq key, Wikipedia or Microsoft TTS access is
+needed. For each concurrency level it runs that many jobs at once and reports:
+
+- per-stage wall time (content, script, local_score, evaluation, audio, improvement_prompt)
+- time to first audio (first MP3 bytes ready for listeners)
+- end-to-end wall time per job
+- throughput (jobs per minute) for the level
+- peak RSS of the benchmark process
+
+Results are saved as JSON so runs can be compared (see --compare).
+
+Usage (from synthetic_radio_host/):
+    python benchmarks/run_benchmark.py --concurrency 1 4 8
+    python benchmarks/run_benchmark.py --llm-latency 1.5 --compare benchmarks/results/baseline.json
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+import contextlib
+import urllib.request
+from typing import Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+STAGES = ("content", "script", "local_score", "evaluation", "audio", "improvement_prompt", "first_audio")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def summarize(values: List[float]) -> Optional[dict]:
+    """Mean and nearest-rank percentiles of a list of seconds."""
+    if not values:
+        return None
+    ordered = sorted(values)
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered) + 0.5) - 1))]
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "p50": round(percentile(50), 3),
+        "p95": round(percentile(95), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+class FirstAudio:
+    """Stands in for an EpisodeStream and notes when the first audio arrives."""
+
+    def __init__(self):
+        self.at: Optional[float] = None
+
+    def append(self, data: bytes):
+        if self.at is None and data:
+            self.at = time.perf_counter()
+
+    def close(self, error: Optional[str] = None):
+        pass
+
+
+def peak_rss_mb() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return round(usage / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def start_fake_services(args, port: int) -> subprocess.Popen:
+    command = [
+        sys.executable, os.path.join(BENCH_DIR, "fake_services.py"),
+        "--port", str(port),
+        "--llm-latency", str(args.llm_latency),
+        "--wiki-latency", str(args.wiki_latency),
+        "--tts-latency", str(args.tts_latency),
+        "--jitter", str(args.jitter),
+        "--tts-speed", str(args.tts_speed),
+        "--error-rate", str(args.error_rate),
+    ]
+    if args.seed is not None:
+        command += ["--seed", str(args.seed)]
+    process = subprocess.Popen(command)
+
+    # Wait until the fakes answer
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/stats", timeout=1).read()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Fake services did not start")
+
+
+def configure_environment(args, port: int, workdir: str):
+    """Point every upstream at the fakes; must run before main is imported."""
+    base = f"http://127.0.0.1:{port}"
+    os.environ["GROQ_API_KEY"] = "benchmark"
+    os.environ["GROQ_BASE_URL"] = base
+    os.environ["WIKIPEDIA_API_URL"] = base + "/w/api.php"
+    os.environ["ARTIFACT_DIR"] = os.path.join(workdir, "output")
+    os.environ["TTS_CACHE_DIR"] = os.path.join(workdir, "tts")
+    os.environ["WIKI_CACHE_PATH"] = os.path.join(workdir, "wikipedia.db")
+    os.environ["TTS_CACHE_ENABLED"] = "1" if args.cache else "0"
+    os.environ["LLM_CACHE_PATH"] = os.path.join(workdir, "llm.db")
+    os.environ["LLM_CACHE_ENABLED"] = "1" if args.cache else "0"
+    if args.tts_concurrency:
+        os.environ["TTS_CONCURRENCY"] = str(args.tts_concurrency)
+
+
+async def run_level(run_podcast_generation, level: int, jobs: int, quiet: bool) -> dict:
+    """Run `jobs` generations, `level` at a time."""
+    semaphore = asyncio.Semaphore(level)
+    stage_times: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    durations: List[float] = []
+    errors: List[str] = []
+
+    async def run_one(index: int):
+        async with semaphore:
+            started = time.perf_counter()
+            first_audio = FirstAudio()
+            try:
+                result = await run_podcast_generation(f"Benchmark Topic {level}-{index}", audio_stream=first_audio,
+                                                      include_improvement_prompt=True)
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+                return
+            durations.append(time.perf_counter() - started)
+            for stage, seconds in result["timings"].items():
+                stage_times.setdefault(stage, []).append(seconds)
+            if first_audio.at is not None:
+                stage_times["first_audio"].append(first_audio.at - started)
+
+    output = io.StringIO() if quiet else sys.stdout
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        await asyncio.gather(*(run_one(i) for i in range(jobs)))
+    wall = time.perf_counter() - started
+
+    return {
+        "concurrency": level,
+        "jobs": jobs,
+        "completed": len(durations),
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "throughput_jobs_per_min": round(len(durations) / wall * 60, 2) if wall else 0.0,
+        "end_to_end": summarize(durations),
+        "stages": {stage: summarize(times) for stage, times in stage_times.items()},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def print_level(result: dict):
+    e2e = result["end_to_end"] or {}
+    print(f"\n=== concurrency {result['concurrency']}: {result['completed']}/{result['jobs']} jobs "
+          f"in {result['wall_seconds']}s, {result['throughput_jobs_per_min']} jobs/min, "
+          f"peak RSS {result['peak_rss_mb']} MB ===")
+    print(f"{'stage':<20}{'mean':>9}{'p50':>9}{'p95':>9}{'max':>9}")
+    for name, stats in [*result["stages"].items(), ("end_to_end", e2e)]:
+        if stats:
+            print(f"{name:<20}{stats['mean']:>9.3f}{stats['p50']:>9.3f}{stats['p95']:>9.3f}{stats['max']:>9.3f}")
+    for error in result["errors"][:5]:
+        print(f"  ! {error}")
+
+
+def print_comparison(current: dict, baseline: dict):
+    """Show p50 changes against a previous results file, per level and stage."""
+    previous = {level["concurrency"]: level for level in baseline.get("levels", [])}
+    print(f"\n=== compared with {baseline.get('git_commit') or 'baseline'} ({baseline.get('timestamp')}) ===")
+    for level in current["levels"]:
+        old = previous.get(level["concurrency"])
+        if not old:
+            continue
+        print(f"concurrency {level['concurrency']}:")
+        rows = [*level["stages"].items(), ("end_to_end", level["end_to_end"])]
+        old_rows = {**old["stages"], "end_to_end": old["end_to_end"]}
+        for name, stats in rows:
+            before = old_rows.get(name)
+            if stats and before:
+                change = (stats["p50"] - before["p50"]) / before["p50"] * 100 if before["p50"] else 0.0
+                print(f"  {name:<20} p50 {before['p50']:>8.3f} -> {stats['p50']:>8.3f}  ({change:+.1f}%)")
+        before_tp, after_tp = old["throughput_jobs_per_min"], level["throughput_jobs_per_min"]
+        print(f"  {'throughput':<20}     {before_tp:>8.2f} -> {after_tp:>8.2f} jobs/min")
+
+
+async def run(args, port: int) -> dict:
+    # Imported here: module-level configuration reads the environment set above
+    sys.path.insert(0, APP_DIR)
+    import edge_tts.communicate
+    from main import run_podcast_generation
+    from llm_client import aclose_llm_clients
+    from wikipedia_client import get_wikipedia_client
+
+    edge_tts.communicate.WSS_URL = f"ws://127.0.0.1:{port}/edge/v1?TrustedClientToken=benchmark"
+
+    levels = []
+    for level in args.concurrency:
+        result = await run_level(run_podcast_generation, level, args.jobs or level, args.quiet)
+        print_level(result)
+        levels.append(result)
+    await aclose_llm_clients()
+    await get_wikipedia_client().aclose()
+
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/stats") as response:
+        upstream_requests = json.load(response)
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "llm_latency": args.llm_latency,
+            "wiki_latency": args.wiki_latency,
+            "tts_latency": args.tts_latency,
+            "jitter": args.jitter,
+            "tts_speed": args.tts_speed,
+            "error_rate": args.error_rate,
+            "cache": args.cache,
+            "tts_concurrency": args.tts_concurrency,
+        },
+        "upstream_requests": upstream_requests,
+        "levels": levels,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the podcast pipeline against local fakes")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4], help="Concurrent jobs per level")
+    parser.add_argument("--jobs", type=int, default=None, help="Jobs per level (default: the level's concurrency)")
+    parser.add_argument("--llm-latency", type=float, default=0.8)
+    parser.add_argument("--wiki-latency", type=float, default=0.15)
+    parser.add_argument("--tts-latency", type=float, default=0.25)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--tts-speed", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--tts-concurrency", type=int, default=None, help="Override TTS_CONCURRENCY")
+    parser.add_argument("--cache", action="store_true", help="Keep the TTS, Wikipedia and LLM result caches on (warm runs)")
+    parser.add_argument("--output", default=None, help="Results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier results file to compare against")
+    parser.add_argument("--verbose", dest="quiet", action="store_false", help="Show pipeline output")
+    args = parser.parse_args()
+
+    port = free_port()
+    fakes = start_fake_services(args, port)
+    try:
+        with tempfile.TemporaryDirectory(prefix="srh-bench-") as workdir:
+            configure_environment(args, port, workdir)
+            results = asyncio.run(run(args, port))
+    finally:
+        fakes.terminate()
+        fakes.wait()
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results saved to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
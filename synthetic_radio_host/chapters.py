@@ -0,0 +1,81 @@
+"""
+Chapter Manifest
+
+This module builds the per-line index of an episode. For each script line
+the manifest records where that line's audio sits in the published MP3:
+start time and duration in seconds, plus byte offset and length. Times come
+from the assembler's frame index, and word timings come from the
+WordBoundary events edge-tts reports. A client can seek to a line with a
+single Range request, or highlight the transcript as it plays, without
+decoding any audio.
+"""
+
+from typing import List, Optional
+
+from mp3_frames import Mp3Assembler
+
+
+MANIFEST_VERSION = 1
+
+# edge-tts reports offsets and durations in 100-nanosecond ticks
+TICKS_PER_SECOND = 10_000_000
+
+
+def words_from_boundaries(boundaries: List[dict]) -> List[list]:
+    """Convert edge-tts WordBoundary chunks into compact [start, duration, word] entries."""
+    return [
+        [
+            round(boundary["offset"] / TICKS_PER_SECOND, 3),
+            round(boundary["duration"] / TICKS_PER_SECOND, 3),
+            boundary["text"],
+        ]
+        for boundary in boundaries
+    ]
+
+
+class ChapterIndex:
+    """Collects line positions while an episode is being assembled."""
+
+    def __init__(self):
+        self.lines: List[dict] = []
+
+    def add_line(self, index: int, speaker: str, text: str, assembler: Mp3Assembler,
+                 byte_length: int, samples_before: int, words: Optional[List[list]] = None):
+        """
+        Record one line right after its audio was appended.
+
+        Args:
+            index: Position of the line in the script
+            speaker: Speaker name
+            text: Line text as written in the script
+            assembler: Assembler the line's audio was just appended to
+            byte_length: Number of bytes the append wrote
+            samples_before: assembler.total_samples before the append
+            words: [start, duration, word] entries relative to the line's start
+        """
+        sample_rate = assembler.template.sample_rate if assembler.template else 0
+        start = samples_before / sample_rate if sample_rate else 0.0
+        duration = (assembler.total_samples - samples_before) / sample_rate if sample_rate else 0.0
+        line = {
+            "index": index,
+            "speaker": speaker,
+            "text": text,
+            "start": round(start, 3),
+            "duration": round(duration, 3),
+            "byte_offset": assembler.size - byte_length,
+            "byte_length": byte_length,
+        }
+        if words is not None:
+            line["words"] = words
+        self.lines.append(line)
+
+    def manifest(self, assembler: Mp3Assembler, audio: Optional[str] = None) -> dict:
+        """Return the finished manifest for the episode `audio`."""
+        return {
+            "version": MANIFEST_VERSION,
+            "audio": audio,
+            "duration": round(assembler.duration, 3),
+            "sample_rate": assembler.template.sample_rate if assembler.template else None,
+            "frame_count": assembler.frame_count,
+            "lines": self.lines,
+        }
@@ -3,11 +3,27 @@ LLM Critic Judge for Hinglish Podcast Evaluation
 
 This module provides evaluation capabilities for generated podcast scripts
 using Mixtral 8x7B as the judge LLM (different from Llama 3.3 used for generation).
+Evaluations are memoized by script fingerprint (see llm_cache.py), so a
+script that was already judged is not sent to the critic again.
+
+A deterministic local scorer (`score_script_locally`) rates a script in the
+same category structure from measurable features. It is used as an instant
+preliminary score, as the fallback when the critic fails, and to skip the
+critic for scripts that are clearly good or clearly bad. Its results carry
+"source": "local" (critic results carry "source": "critic") and are never
+cached as critic evaluations.
 """
 
+import os
+import re
+import asyncio
 import json
-import httpx
-from groq import Groq
+import math
+from collections import Counter
+from typing import List, Optional
+
+from llm_client import create_chat_completion
+from llm_cache import canonical_hash, get_llm_cache, script_fingerprint
 
 
 # Evaluation weights for each category (must sum to 1.0)
@@ -19,6 +35,17 @@ CATEGORY_WEIGHTS = {
     "host_chemistry": 0.10
 }
 
+# Use Qwen3-32B as the critic model - excellent for evaluation and reasoning
+# This provides diversity from Llama 3.3 used for generation
+CRITIC_MODEL = "qwen/qwen3-32b"
+
+# System prompt for the judge
+CRITIC_SYSTEM_PROMPT = """You are an expert evaluator for Hinglish podcast conversations. 
+Your task is to critically assess the naturalness and quality of dialogue between two podcast hosts.
+You understand both Hindi and English, and you're familiar with Gen-Z Indian communication patterns.
+Be fair but critical in your evaluation. Give specific, actionable feedback.
+Always respond with valid JSON in the exact format requested."""
+
 
 def generate_evaluation_prompt(script: list) -> str:
     """Generate the evaluation prompt with the podcast script."""
@@ -163,16 +190,300 @@ def parse_evaluation_response(response_content: str) -> dict:
         }
 
 
-async def evaluate_podcast_script(script: list, api_key: str) -> dict:
+def critic_cache_key(script: list) -> str:
+    """Cache key for a script's evaluation; the model and prompt are included so editing them invalidates it."""
+    return canonical_hash(CRITIC_MODEL, CRITIC_SYSTEM_PROMPT, generate_evaluation_prompt([]), script_fingerprint(script))
+
+
+# === Local heuristic scorer ===
+
+LOCAL_SCORER = "local-heuristic"
+
+# Scripts the local scorer puts outside this range skip the LLM critic
+CRITIC_SKIP_BELOW = float(os.getenv("CRITIC_SKIP_BELOW", "2.5"))
+CRITIC_SKIP_ABOVE = float(os.getenv("CRITIC_SKIP_ABOVE", "4.7"))
+
+# Common romanized Hindi and English words; words that are both (to, do, main, the, hi, are) are in neither
+HINDI_WORDS = frozenset("""
+aaj aap aapko aaya aayi aur abhi accha acha achha agar apna apne apni arey arre baad baat baatein bada badi
+bade bahut bas bata batao bhai bhi bilkul bol bolo bolte chal chalo chhod chhota cheez cheezein chahiye dekh
+dekha dekho diya dono duniya ek ekdum gaya gaye gayi haan hai haina hain hamesha ho hota hoti hote hua hui hum
+iska iske iski isme jab jaane jayega jhooth kab kabhi kahan kaise kal kam kar karein karna karo karta karte karti
+kaun ke ki kis kitna kitne kiya koi kuch kya kyun lagta lekin liya liye log logon maine matlab mein mera meri
+mujhe na nahi nahin naya pata pehle peeche phir poora raha rahe rahi sab sabse sach sahi samajh samjha samjho
+saath shuru soch socha suno tha thi thik thoda thodi toh tu tum tumhe tune tujhe uska uski unka usme wahi waise
+wala wale wali woh yaar yahan yahi yeh ye zyada
+""".split())
+ENGLISH_WORDS = frozenset("""
+a about actually also amazing an and any basically be because been best but can cool could crazy did does even
+exactly first for from genuinely good great guys had has have he honestly how interesting is it its just know
+like literally made make mean more most much new not of okay on only or people perfect really right seriously she
+should simple so some still that their these they thing things think this those very was way we were what when
+where which who why will with world would wow yes you your
+""".split())
+FILLER_WORDS = frozenset("umm um hmm uh yaar bhai bro matlab basically like actually literally haina".split())
+HESITATION_WORDS = frozenset("umm um hmm uh erm".split())
+# Openers that react to the previous turn
+REACTION_WORDS = frozenset("""
+accha acha achha arey arre bilkul exactly haan hmm kya oh ohh really sahi seriously sach wahi wait wow
+""".split())
+# Everyday desi and Gen-Z expressions, matched as whole phrases
+DESI_PHRASES = (
+    "yaar", "bhai", "bro", "arre", "arey", "accha", "kya baat", "ekdum", "wahi toh", "sahi mein", "bilkul",
+    "pagal", "jhooth", "chal chhod", "koi na", "thik hai", "jaane de", "literally", "vibe", "scene", "mast",
+)
+BANTER_PHRASES = ("tu bhi na", "kuch bhi", "pagal", "jhooth", "chal chhod", "haha", "lol", "bakwaas", "drama")
+AI_TELLTALES = (
+    "in conclusion", "furthermore", "moreover", "delve", "it is important to note", "additionally",
+    "in summary", "dive into", "fascinating topic", "as an ai", "without further ado",
+)
+
+TOKEN_RE = re.compile(r"[a-z]+")
+MARKER_RE = re.compile(r"\[([^\]]+)\]")
+SENTENCE_RE = re.compile(r"[^.!?।]+")
+PAUSE_RE = re.compile(r"\.\.\.|…|—|--|,")
+DEVANAGARI_RE = re.compile(r"[\u0900-\u097F]")
+
+# Why a breakdown scored high or low, for the strengths and improvements lists
+BREAKDOWN_NOTES = {
+    "code_mixing_naturalness": ("Hindi and English are mixed in a natural ratio, often within a line",
+                                "Rebalance toward ~70% Roman Hindi and switch languages within lines"),
+    "cultural_appropriateness": ("Uses authentic desi expressions",
+                                 "Use more everyday expressions like 'arre', 'wahi toh', 'ekdum'"),
+    "romanized_hindi_fluency": ("Hindi is written consistently in Roman script",
+                                "Write more of the dialogue in Roman-script Hindi"),
+    "human_likeness": ("Turn lengths vary like real speech",
+                       "Vary turn lengths and drop formal phrasing"),
+    "natural_imperfections": ("Has natural hesitations and trailing pauses",
+                              "Add hesitations like 'umm', 'hmm' and trailing pauses"),
+    "filler_words_usage": ("Filler words are used in moderation",
+                           "Use fillers in roughly a third of the lines"),
+    "turn_taking_flow": ("Hosts alternate quickly and react to each other",
+                         "Alternate speakers more and open turns with reactions"),
+    "emotional_variation": ("Shows a range of emotions",
+                            "Add emotion markers like [laughs] and more questions and exclamations"),
+    "pacing_markers": ("Sentence lengths and pauses vary",
+                       "Mix short and long sentences and add pauses"),
+    "topic_coherence": ("Keeps coming back to the topic",
+                        "Mention the topic's key terms more consistently"),
+    "avoids_ai_telltales": ("Few repeated phrases or formal AI patterns",
+                            "Cut repeated phrases and formal connectors like 'furthermore'"),
+    "distinct_personalities": ("The two hosts sound different",
+                               "Give the hosts more distinct styles (one asks, one explains)"),
+    "playful_banter": ("Includes playful teasing",
+                       "Add teasing and jokes between the hosts"),
+}
+
+
+def _band(value: float, bad_low: float, good_low: float, good_high: float = math.inf,
+          bad_high: float = math.inf) -> float:
+    """Map a measurement to 1-5: 5 inside [good_low, good_high], falling linearly to 1 at bad_low / bad_high."""
+    if value < good_low:
+        fraction = (value - bad_low) / (good_low - bad_low)
+    elif value > good_high:
+        fraction = (bad_high - value) / (bad_high - good_high)
+    else:
+        fraction = 1.0
+    return round(1 + 4 * min(1.0, max(0.0, fraction)), 1)
+
+
+def _at_most(value: float, good: float, bad: float) -> float:
+    """5 up to `good`, falling to 1 at `bad`."""
+    return _band(value, -math.inf, -math.inf, good, bad)
+
+
+def _mean(*scores: float) -> float:
+    return round(sum(scores) / len(scores), 1)
+
+
+def _share(flags) -> float:
+    flags = list(flags)
+    return sum(flags) / len(flags) if flags else 0.0
+
+
+def _has_phrase(padded: str, phrases) -> bool:
+    # `padded` is " word word ... ", so phrases only match whole words
+    return any(f" {phrase} " in padded for phrase in phrases)
+
+
+def script_features(script: list) -> dict:
+    """Measurements the local scorer is based on (shares are 0-1)."""
+    speakers = [" ".join(str(line.get("speaker", "")).split()) for line in script]
+    texts = [str(line.get("text", "")) for line in script]
+    words = [TOKEN_RE.findall(MARKER_RE.sub(" ", text.lower())) for text in texts]
+    padded = [f" {' '.join(tokens)} " for tokens in words]
+    lengths = [len(tokens) for tokens in words]
+    count = len(script)
+
+    hindi = [sum(w in HINDI_WORDS for w in tokens) for tokens in words]
+    english = [sum(w in ENGLISH_WORDS for w in tokens) for tokens in words]
+    classified = sum(hindi) + sum(english)
+
+    mean_words = sum(lengths) / count
+    turn_spread = math.sqrt(sum((n - mean_words) ** 2 for n in lengths) / count) / mean_words if mean_words else 0.0
+
+    sentences = [len(sentence.split()) for text in texts for sentence in SENTENCE_RE.findall(MARKER_RE.sub(" ", text))
+                 if sentence.strip()]
+    sentence_mean = sum(sentences) / len(sentences) if sentences else 0.0
+    sentence_spread = (math.sqrt(sum((n - sentence_mean) ** 2 for n in sentences) / len(sentences)) / sentence_mean
+                       if sentence_mean else 0.0)
+
+    trigrams = Counter(tuple(tokens[i:i + 3]) for tokens in words for i in range(len(tokens) - 2))
+    total_trigrams = sum(trigrams.values())
+    openings = Counter(tuple(tokens[:2]) for tokens in words if len(tokens) >= 2)
+
+    # The script's key terms: frequent longer words that aren't function words or fillers
+    content = Counter(w for tokens in words for w in set(tokens)
+                      if len(w) >= 5 and w not in HINDI_WORDS and w not in ENGLISH_WORDS and w not in FILLER_WORDS)
+    key_terms = {term for term, n in content.most_common(5) if n >= 2}
+    long_lines = [set(tokens) for tokens in words if len(tokens) >= 6]
+
+    emotions = {marker.strip().lower() for text in texts for marker in MARKER_RE.findall(text)}
+    emotions |= {mark for mark in "!?" if any(mark in text for text in texts)}
+
+    # Per-speaker style, for the two hosts with the most lines
+    hosts = [name for name, _ in Counter(speakers).most_common(2)]
+    styles = []
+    for host in hosts:
+        turns = [i for i, name in enumerate(speakers) if name == host]
+        styles.append((_share("?" in texts[i] for i in turns), sum(lengths[i] for i in turns) / len(turns)))
+    turn_counts = Counter(speakers)
+
+    return {
+        "lines": count,
+        "words": sum(lengths),
+        "hindi_share": sum(hindi) / classified if classified else 0.0,
+        "mixed_line_share": _share(h and e for h, e in zip(hindi, english)),
+        "devanagari_share": sum(len(DEVANAGARI_RE.findall(text)) for text in texts) / max(1, sum(map(len, texts))),
+        "desi_line_share": _share(_has_phrase(p, DESI_PHRASES) for p in padded),
+        "filler_line_share": _share(any(w in FILLER_WORDS for w in tokens) for tokens in words),
+        "hesitation_line_share": _share(any(w in HESITATION_WORDS for w in tokens) or "..." in text or "…" in text
+                                        for tokens, text in zip(words, texts)),
+        "mean_turn_words": mean_words,
+        "turn_length_spread": turn_spread,
+        "long_turn_share": _share(n > 40 for n in lengths),
+        "speaker_alternation": _share(a != b for a, b in zip(speakers, speakers[1:])),
+        "speaker_balance": (min(turn_counts[h] for h in hosts) / max(turn_counts[h] for h in hosts)
+                            if len(hosts) == 2 else 0.0),
+        "reaction_share": _share(bool(tokens) and tokens[0] in REACTION_WORDS for tokens in words[1:]),
+        "emotion_kinds": len(emotions),
+        "emotive_line_share": _share("!" in text or "?" in text or MARKER_RE.search(text) is not None for text in texts),
+        "pause_line_share": _share(PAUSE_RE.search(text) is not None for text in texts),
+        "sentence_length_spread": sentence_spread,
+        "topic_line_share": _share(bool(tokens & key_terms) for tokens in long_lines),
+        "repeated_phrase_rate": (sum(n - 1 for n in trigrams.values() if n > 1) / total_trigrams
+                                 if total_trigrams else 0.0),
+        "repeated_opening_share": sum(n - 1 for n in openings.values() if n > 1) / count,
+        "ai_telltales_per_line": sum(_has_phrase(p, AI_TELLTALES) for p in padded) / count,
+        "style_gap": (abs(styles[0][0] - styles[1][0]) + abs(styles[0][1] - styles[1][1]) / max(styles[0][1], styles[1][1], 1)
+                      if len(styles) == 2 else 0.0),
+        "banter_line_share": _share(_has_phrase(p, BANTER_PHRASES) or "laugh" in text.lower()
+                                    for p, text in zip(padded, texts)),
+    }
+
+
+def score_script_locally(script: list) -> dict:
+    """
+    Score a script in milliseconds without an LLM, in the format of parse_evaluation_response.
+
+    Every breakdown the critic rates is derived from measurements of the
+    script (Hindi/English token mix, filler density, turn lengths, speaker
+    alternation, repeated phrases, ...). information_accuracy cannot be
+    judged offline and is always a neutral 3. The raw measurements are
+    returned under "metrics".
+    """
+    if not script:
+        return {
+            "overall_score": 0,
+            "categories": {},
+            "strengths": [],
+            "improvements": [],
+            "feedback": "Cannot evaluate empty script.",
+            "error": "Empty script provided"
+        }
+
+    f = script_features(script)
+    breakdowns = {
+        "hinglish_quality": {
+            # Only function words are classified, so Hindi grammar pushes the share above the 70% target
+            "code_mixing_naturalness": _mean(_band(f["hindi_share"], 0.3, 0.6, 0.95, 1.0),
+                                             _band(f["mixed_line_share"], 0.1, 0.5)),
+            "cultural_appropriateness": _band(f["desi_line_share"], 0.05, 0.35),
+            "romanized_hindi_fluency": min(_band(f["hindi_share"], 0.1, 0.45), _at_most(f["devanagari_share"], 0.0, 0.2)),
+        },
+        "conversational_naturalness": {
+            "human_likeness": _mean(_band(f["mean_turn_words"], 3, 7, 22, 45), _band(f["turn_length_spread"], 0.1, 0.4),
+                                    _at_most(f["ai_telltales_per_line"], 0.0, 0.2)),
+            "natural_imperfections": _band(f["hesitation_line_share"], 0.0, 0.2),
+            "filler_words_usage": _band(f["filler_line_share"], 0.0, 0.25, 0.6, 0.95),
+            "turn_taking_flow": _mean(_band(f["speaker_alternation"], 0.5, 0.9), _band(f["reaction_share"], 0.0, 0.3),
+                                      _at_most(f["long_turn_share"], 0.0, 0.3)),
+        },
+        "emotional_expression": {
+            "emotional_variation": _mean(_band(f["emotion_kinds"], 0, 3), _band(f["emotive_line_share"], 0.1, 0.5)),
+            "pacing_markers": _mean(_band(f["pause_line_share"], 0.1, 0.5), _band(f["sentence_length_spread"], 0.15, 0.45)),
+        },
+        "content_coherence": {
+            "topic_coherence": _band(f["topic_line_share"], 0.1, 0.4),
+            "information_accuracy": 3.0,
+            "avoids_ai_telltales": _mean(_at_most(f["repeated_phrase_rate"], 0.05, 0.3),
+                                         _at_most(f["ai_telltales_per_line"], 0.0, 0.2),
+                                         _at_most(f["repeated_opening_share"], 0.1, 0.4)),
+        },
+        "host_chemistry": {
+            "distinct_personalities": min(_band(f["style_gap"], 0.0, 0.4), _band(f["speaker_balance"], 0.2, 0.6)),
+            "playful_banter": _band(f["banter_line_share"], 0.0, 0.2),
+        },
+    }
+
+    categories = {
+        name: {"score": calculate_category_score(breakdown), "breakdown": breakdown}
+        for name, breakdown in breakdowns.items()
+    }
+    ranked = sorted(
+        ((score, key) for breakdown in breakdowns.values() for key, score in breakdown.items() if key in BREAKDOWN_NOTES),
+        reverse=True,
+    )
+    strengths = [BREAKDOWN_NOTES[key][0] for score, key in ranked if score >= 4.0][:3]
+    improvements = [BREAKDOWN_NOTES[key][1] for score, key in reversed(ranked) if score <= 2.5][:3]
+
+    return {
+        "overall_score": calculate_overall_score(categories),
+        "categories": categories,
+        "strengths": strengths,
+        "improvements": improvements,
+        "feedback": (
+            f"Heuristic score from {f['lines']} lines: {f['hindi_share']:.0%} Hindi words, fillers in "
+            f"{f['filler_line_share']:.0%} of lines, {f['mean_turn_words']:.0f} words per turn, "
+            f"{f['speaker_alternation']:.0%} speaker alternation, {f['repeated_phrase_rate']:.0%} repeated phrases."
+        ),
+        "model_used": LOCAL_SCORER,
+        "source": "local",
+        "script_segments": len(script),
+        "metrics": {key: round(value, 3) for key, value in f.items()},
+    }
+
+
+def score_scripts_batch(scripts: List[list]) -> List[dict]:
+    """Score many scripts locally in one call (e.g. to rank a corpus of past scripts)."""
+    return [score_script_locally(script) for script in scripts]
+
+
+async def evaluate_podcast_script(script: list, api_key: str, local: Optional[dict] = None) -> dict:
     """
     Evaluate a podcast script using Mixtral 8x7B as the critic judge.
     
     Args:
         script: List of dialogue objects with 'speaker' and 'text' keys
         api_key: Groq API key
+        local: The script's score_script_locally result, if already computed
         
     Returns:
         Dictionary with evaluation results including scores and feedback
+        ("cached": True when it was served from the evaluation cache). When
+        the local score is decisive ("critic_skipped": True) or the critic
+        fails ("critic_error"), the local heuristic result is returned instead
+        ("source": "local").
     """
     if not script or len(script) == 0:
         return {
@@ -184,26 +495,28 @@ async def evaluate_podcast_script(script: list, api_key: str) -> dict:
             "error": "Empty script provided"
         }
     
+    cache = get_llm_cache()
+    cache_key = critic_cache_key(script)
+    if cache is not None:
+        cached = await asyncio.to_thread(cache.get, "critic_evaluation", cache_key)
+        if cached is not None:
+            cached["cached"] = True
+            return cached
+
+    if local is None:
+        local = score_script_locally(script)
+    if not CRITIC_SKIP_BELOW <= local["overall_score"] <= CRITIC_SKIP_ABOVE:
+        print(f"⚡ Local score {local['overall_score']} is decisive, skipping the LLM critic")
+        return {**local, "critic_skipped": True}
+
     try:
-        # Create a custom HTTP client that ignores SSL errors
-        http_client = httpx.Client(verify=False)
-        client = Groq(api_key=api_key, http_client=http_client)
-        
         evaluation_prompt = generate_evaluation_prompt(script)
         
-        # System prompt for the judge
-        system_prompt = """You are an expert evaluator for Hinglish podcast conversations. 
-Your task is to critically assess the naturalness and quality of dialogue between two podcast hosts.
-You understand both Hindi and English, and you're familiar with Gen-Z Indian communication patterns.
-Be fair but critical in your evaluation. Give specific, actionable feedback.
-Always respond with valid JSON in the exact format requested."""
-        
-        # Use Qwen3-32B as the critic model - excellent for evaluation and reasoning
-        # This provides diversity from Llama 3.3 used for generation
-        completion = client.chat.completions.create(
-            model="qwen/qwen3-32b",
+        completion = await create_chat_completion(
+            api_key,
+            model=CRITIC_MODEL,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": CRITIC_SYSTEM_PROMPT},
                 {"role": "user", "content": evaluation_prompt}
             ],
             temperature=0.3,  # Lower temperature for more consistent evaluation
@@ -215,21 +528,21 @@ Always respond with valid JSON in the exact format requested."""
         result = parse_evaluation_response(response_content)
         
         # Add metadata
-        result["model_used"] = "qwen/qwen3-32b"
+        result["model_used"] = CRITIC_MODEL
+        result["source"] = "critic"
         result["script_segments"] = len(script)
+
+        # Failed parses are not cached, so the next attempt asks the critic again
+        if "error" in result:
+            return {**local, "critic_error": result["error"]}
+        if cache is not None:
+            await asyncio.to_thread(cache.put, "critic_evaluation", cache_key, result)
         
         return result
         
     except Exception as e:
-        print(f"Error during evaluation: {e}")
-        return {
-            "overall_score": 0,
-            "categories": {},
-            "strengths": [],
-            "improvements": [],
-            "feedback": f"Evaluation failed: {str(e)}",
-            "error": str(e)
-        }
+        print(f"Error during evaluation: {e}, falling back to the local score")
+        return {**local, "critic_error": str(e)}
 
 
 def get_score_label(score: float) -> str:
@@ -21,9 +21,10 @@ function App() {
   const [error, setError] = useState(null);
   const [evaluation, setEvaluation] = useState(null);
   const [improvementPrompt, setImprovementPrompt] = useState(null);
+  const [pendingStages, setPendingStages] = useState(false); // Evaluation / prompt still running after audio is ready
 
-  const pollingRef = useRef(null);
-  const shouldPollRef = useRef(false);
+  const eventsRef = useRef(null); // EventSource for live job updates
+  const shouldListenRef = useRef(false);
   const lastErrorRef = useRef(null); // Store last error to ensure persistence
   const allowErrorClearRef = useRef(false); // Flag to allow error clearing (for user actions)
   const isFailedStateRef = useRef(false); // Track if we're in failed state to prevent clearing
@@ -31,12 +32,14 @@ function App() {
 
   const startGeneration = async (topic) => {
     try {
-      // Stop any existing polling
-      shouldPollRef.current = false;
-      if (pollingRef.current) {
-        clearInterval(pollingRef.current);
-        pollingRef.current = null;
+      // Close any existing update stream
+      shouldListenRef.current = false;
+      if (eventsRef.current) {
+        eventsRef.current.close();
+        eventsRef.current = null;
       }
+      // A shared job can come back with the same id; clearing it makes the stream reopen
+      setJobId(null);
 
       setStatus('processing');
       setMessage('Sending request...');
@@ -59,6 +62,12 @@ function App() {
         body: JSON.stringify({ topic }),
       });
 
+      if (response.status === 429) {
+        const retryAfter = response.headers.get('Retry-After');
+        const busy = new Error(`The studio is busy right now. Please try again in ${retryAfter || 'a few'} seconds.`);
+        busy.isBusy = true;
+        throw busy;
+      }
       if (!response.ok) throw new Error('Failed to start generation');
 
       const data = await response.json();
@@ -66,167 +75,137 @@ function App() {
 
     } catch (err) {
       console.error(err);
-      shouldPollRef.current = false;
-      if (pollingRef.current) {
-        clearInterval(pollingRef.current);
-        pollingRef.current = null;
+      shouldListenRef.current = false;
+      if (eventsRef.current) {
+        eventsRef.current.close();
+        eventsRef.current = null;
       }
-      setError(`Failed to connect to server: ${err.message}. Is backend running?`);
+      setError(err.isBusy ? err.message : `Failed to connect to server: ${err.message}. Is backend running?`);
       setStatus('idle');
     }
   };
 
   useEffect(() => {
-    // CRITICAL: Don't do anything if status is 'failed' - error should persist
-    if (status === 'failed') {
-      // Ensure polling is stopped
-      shouldPollRef.current = false;
-      if (pollingRef.current) {
-        clearInterval(pollingRef.current);
-        pollingRef.current = null;
-      }
-      return; // Exit early - don't interfere with error state
+    // One update stream per job. It stays open across status changes and closes itself
+    // once the job has failed, or completed with no stages pending
+    if (!jobId) {
+      return;
     }
 
-    // Only start polling if we're processing and have a jobId
-    if (status === 'processing' && jobId) {
-      shouldPollRef.current = true;
-
-      // Start polling
-      pollingRef.current = setInterval(async () => {
-        // Check if we should continue polling - stop if status is no longer processing
-        if (!shouldPollRef.current) {
-          if (pollingRef.current) {
-            clearInterval(pollingRef.current);
-            pollingRef.current = null;
-          }
-          return;
-        }
+    shouldListenRef.current = true;
 
-        // CRITICAL: Check status before proceeding - if already failed/completed, stop immediately
-        // This prevents race conditions where status changed but callback is still executing
-        try {
-          const res = await fetch(`${API_BASE_URL}/api/status/${jobId}`);
-          if (!res.ok) {
-            shouldPollRef.current = false;
-            if (pollingRef.current) {
-              clearInterval(pollingRef.current);
-              pollingRef.current = null;
-            }
-            // Store error in ref to ensure persistence
-            const errorMsg = "Failed to check job status. Please refresh and try again.";
-            lastErrorRef.current = errorMsg;
-            // Set status and error atomically - React 18+ batches these automatically
-            setStatus('failed');
-            setError(errorMsg);
-            allowErrorClearRef.current = false; // Prevent accidental clearing
-            return;
-          }
+    // Server-Sent Events: the first message is the full job, later ones only carry changed fields
+    const job = {};
+    const events = new EventSource(`${API_BASE_URL}/api/events/${jobId}`);
+    eventsRef.current = events;
 
-          const data = await res.json();
+    const stopListening = () => {
+      shouldListenRef.current = false;
+      events.close();
+      if (eventsRef.current === events) {
+        eventsRef.current = null;
+      }
+    };
 
-          // CRITICAL: Don't update anything if we're no longer in processing state
-          // This prevents race conditions where status changed but callback executed
-          if (!shouldPollRef.current) {
-            return;
-          }
+    events.onmessage = (event) => {
+      // CRITICAL: Don't update anything if we're no longer listening
+      // This prevents race conditions where status changed but a message was still in flight
+      if (!shouldListenRef.current) {
+        return;
+      }
 
-          // Update message and progress only if still processing
-          setMessage(data.message || '');
-          if (data.progress !== undefined) {
-            setProgress(data.progress);
-          }
+      const changes = JSON.parse(event.data);
+      Object.assign(job, changes);
 
-          // Handle completion - stop polling immediately
-          if (data.status === 'completed') {
-            shouldPollRef.current = false;
-            if (pollingRef.current) {
-              clearInterval(pollingRef.current);
-              pollingRef.current = null;
-            }
-            setStatus('completed');
-            setAudioUrl(`${API_BASE_URL}/api/download/${data.filename}`);
-            // Capture evaluation results from API response
-            if (data.evaluation) {
-              setEvaluation(data.evaluation);
-            }
-            // Capture improvement prompt from API response
-            if (data.improvement_prompt) {
-              setImprovementPrompt(data.improvement_prompt);
-            }
-            return;
-          }
-          // Handle failure - stop polling immediately and set error
-          else if (data.status === 'failed') {
-            // Stop polling FIRST before any state updates
-            shouldPollRef.current = false;
-            if (pollingRef.current) {
-              clearInterval(pollingRef.current);
-              pollingRef.current = null;
-            }
-
-            const errorMessage = data.message || data.error || "Generation failed. Please try again.";
-            console.log('Job failed with message:', errorMessage, 'Full data:', data);
-
-            // Store error in ref FIRST to ensure persistence even if state updates fail
-            lastErrorRef.current = errorMessage;
-
-            // CRITICAL: Set status and error together - React 18+ batches these automatically
-            // But we set them in order: status first, then error, to ensure error card renders
-            isFailedStateRef.current = true; // Mark that we're entering failed state
-            setStatus('failed');
-            setError(errorMessage);
-            setMessage(''); // Clear progress message
-            allowErrorClearRef.current = false; // Prevent accidental clearing
+      if (changes.evaluation) {
+        setEvaluation(changes.evaluation);
+      }
+      if (changes.improvement_prompt) {
+        setImprovementPrompt(changes.improvement_prompt);
+      }
+      if (changes.pending_stages !== undefined) {
+        setPendingStages(changes.pending_stages.length > 0);
+      }
 
-            // Log for debugging
-            console.log('Status set to failed, error set to:', errorMessage);
-            console.log('lastErrorRef.current:', lastErrorRef.current);
-            console.log('isFailedStateRef.current set to true');
+      if (job.status === 'completed') {
+        if (statusRef.current !== 'completed') {
+          setStatus('completed');
+          setAudioUrl(`${API_BASE_URL}/api/download/${job.filename}`);
+        }
+        // Audio is out and evaluation / prompt have arrived: nothing left to wait for
+        if (Array.isArray(job.pending_stages) && job.pending_stages.length === 0) {
+          stopListening();
+        }
+        return;
+      }
 
-            return;
-          }
+      // Handle failure (or cancellation) - stop listening immediately and set error
+      if (job.status === 'failed' || job.status === 'cancelled') {
+        // Stop listening FIRST before any state updates
+        stopListening();
+
+        const errorMessage = job.message || job.error || "Generation failed. Please try again.";
+        console.log('Job failed with message:', errorMessage, 'Full data:', job);
+
+        // Store error in ref FIRST to ensure persistence even if state updates fail
+        lastErrorRef.current = errorMessage;
+
+        // CRITICAL: Set status and error together - React 18+ batches these automatically
+        // But we set them in order: status first, then error, to ensure error card renders
+        isFailedStateRef.current = true; // Mark that we're entering failed state
+        setStatus('failed');
+        setError(errorMessage);
+        setMessage(''); // Clear progress message
+        allowErrorClearRef.current = false; // Prevent accidental clearing
+        return;
+      }
 
-        } catch (err) {
-          console.error("Polling error", err);
-          shouldPollRef.current = false;
-          // If polling fails, set error state and stop polling
-          if (pollingRef.current) {
-            clearInterval(pollingRef.current);
-            pollingRef.current = null;
-          }
-          // Store error in ref to ensure persistence
-          const errorMsg = "Failed to check job status. Please refresh and try again.";
-          lastErrorRef.current = errorMsg;
-          // Set status and error atomically - React 18+ batches these automatically
-          setStatus('failed');
-          setError(errorMsg);
-          allowErrorClearRef.current = false; // Prevent accidental clearing
-        }
-      }, 1000); // Check every 1 second for more responsive updates
-    } else if (status !== 'failed') {
-      // Stop polling if status is not processing (but don't interfere if status is 'failed')
-      // Status 'failed' is handled above with early return
-      shouldPollRef.current = false;
-      if (pollingRef.current) {
-        clearInterval(pollingRef.current);
-        pollingRef.current = null;
+      // Update message and progress only if still processing
+      if (job.status === 'pending' && job.queue_position) {
+        setMessage(`Waiting in queue (#${job.queue_position}, ~${Math.ceil(job.eta_seconds || 0)}s)`);
+      } else if (changes.message !== undefined) {
+        setMessage(changes.message || '');
       }
-    }
+      if (changes.progress !== undefined) {
+        setProgress(changes.progress);
+      }
+    };
+
+    // The server sends "end" once the job has nothing left to report
+    events.addEventListener('end', () => {
+      stopListening();
+      setPendingStages(false);
+    });
+
+    events.onerror = () => {
+      // EventSource reconnects by itself after dropped connections; CLOSED means it gave up
+      if (events.readyState !== EventSource.CLOSED || !shouldListenRef.current) {
+        return;
+      }
+      console.error("Job update stream error");
+      stopListening();
+      if (statusRef.current === 'completed') {
+        setPendingStages(false);
+        return;
+      }
+      // Store error in ref to ensure persistence
+      const errorMsg = "Failed to check job status. Please refresh and try again.";
+      lastErrorRef.current = errorMsg;
+      // Set status and error atomically - React 18+ batches these automatically
+      setStatus('failed');
+      setError(errorMsg);
+      allowErrorClearRef.current = false; // Prevent accidental clearing
+    };
 
-    // Cleanup function - but don't interfere if status is 'failed'
+    // Cleanup runs when the job changes (new generation / reset) or on unmount
     return () => {
-      // Only cleanup polling if status is not 'failed'
-      // If status is 'failed', we want to preserve the error state
-      if (status !== 'failed') {
-        shouldPollRef.current = false;
-        if (pollingRef.current) {
-          clearInterval(pollingRef.current);
-          pollingRef.current = null;
-        }
+      shouldListenRef.current = false;
+      events.close();
+      if (eventsRef.current === events) {
+        eventsRef.current = null;
       }
     };
-  }, [status, jobId]);
+  }, [jobId]);
 
   // Monitor status changes to detect if it's being reset unexpectedly
   const prevStatusRef = useRef(status);
@@ -276,11 +255,11 @@ function App() {
     if (status === 'failed') {
       isFailedStateRef.current = true; // Ensure flag is set
 
-      // Ensure polling is stopped
-      shouldPollRef.current = false;
-      if (pollingRef.current) {
-        clearInterval(pollingRef.current);
-        pollingRef.current = null;
+      // Ensure the update stream is closed
+      shouldListenRef.current = false;
+      if (eventsRef.current) {
+        eventsRef.current.close();
+        eventsRef.current = null;
       }
 
       // If status is 'failed' but error is null/empty, immediately restore from ref
@@ -392,10 +371,10 @@ function App() {
               lastErrorRef.current = null; // Clear error ref
               allowErrorClearRef.current = false;
               setStatus('idle');
-              shouldPollRef.current = false;
-              if (pollingRef.current) {
-                clearInterval(pollingRef.current);
-                pollingRef.current = null;
+              shouldListenRef.current = false;
+              if (eventsRef.current) {
+                eventsRef.current.close();
+                eventsRef.current = null;
               }
             }}
             className="btn-primary"
@@ -444,10 +423,18 @@ function App() {
               setError(null);
               setEvaluation(null); // Clear evaluation on reset
               setImprovementPrompt(null); // Clear improvement prompt on reset
+              setPendingStages(false);
               lastErrorRef.current = null; // Clear error ref
               allowErrorClearRef.current = false;
             }}
           />
+          {/* The critic keeps reviewing after the audio is ready */}
+          {pendingStages && (
+            <div className="review-pending fade-in">
+              <span className="review-spinner" />
+              Review still running...
+            </div>
+          )}
           {/* Show evaluation scorecard after audio player */}
           {evaluation && <EvaluationScoreCard evaluation={evaluation} />}
           {/* Show improvement prompt card after evaluation */}
@@ -561,11 +548,11 @@ function App() {
             </p>
             <button
               onClick={() => {
-                // Stop any polling
-                shouldPollRef.current = false;
-                if (pollingRef.current) {
-                  clearInterval(pollingRef.current);
-                  pollingRef.current = null;
+                // Close the update stream
+                shouldListenRef.current = false;
+                if (eventsRef.current) {
+                  eventsRef.current.close();
+                  eventsRef.current = null;
                 }
                 // Reset all state
                 allowErrorClearRef.current = true; // Allow clearing for user action
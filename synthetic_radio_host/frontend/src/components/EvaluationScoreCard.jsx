@@ -401,7 +401,7 @@ const EvaluationScoreCard = ({ evaluation }) => {
                     fontSize: '0.75rem',
                     color: 'var(--text-muted, rgba(255,255,255,0.4))'
                 }}>
-                    Evaluated by {evaluation.model_used} • {evaluation.script_segments} segments analyzed
+                    Evaluated by {evaluation.model_used}{evaluation.preliminary ? ' (preliminary, critic still running)' : ''} • {evaluation.script_segments} segments analyzed
                 </div>
             )}
 
@@ -0,0 +1,106 @@
+"""
+Job Update Events
+
+This module pushes job changes to listeners instead of having clients
+poll the full job record. Every job update is published to the broker and
+each subscriber receives only the fields that changed since the last
+message it was sent. Bursts of progress updates are coalesced, so a
+subscriber gets at most one message per `min_interval` seconds.
+"""
+
+import os
+import json
+import time
+import asyncio
+from typing import Dict, Optional, Set
+
+
+# Minimum seconds between two messages to the same subscriber
+JOB_EVENTS_MIN_INTERVAL = float(os.getenv("JOB_EVENTS_MIN_INTERVAL", "0.25"))
+# Send a comment line this often so proxies don't drop idle connections
+JOB_EVENTS_KEEPALIVE = float(os.getenv("JOB_EVENTS_KEEPALIVE", "15"))
+
+
+class JobSubscription:
+    """One listener's view of a job: what it has been sent and what changed since."""
+
+    def __init__(self, job_id: str, min_interval: float = JOB_EVENTS_MIN_INTERVAL):
+        self.job_id = job_id
+        self.min_interval = min_interval
+        self.state: dict = {}
+        self._changes: dict = {}
+        self._event = asyncio.Event()
+        self._last_sent = 0.0
+
+    def snapshot(self, job: dict) -> dict:
+        """Record the full job as sent and return it."""
+        self.state = dict(job)
+        self._changes = {k: v for k, v in self._changes.items() if job.get(k) != v}
+        self._last_sent = time.monotonic()
+        return job
+
+    def push(self, fields: dict):
+        """Queue the fields that differ from what this listener already has."""
+        for key, value in fields.items():
+            if self.state.get(key) != value or key in self._changes:
+                self._changes[key] = value
+        if self._changes:
+            self._event.set()
+
+    async def next_changes(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """
+        Wait for the next batch of changed fields.
+
+        Returns:
+            dict of changed fields, or None if nothing changed within `timeout`
+        """
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+        # Throttle: let further updates pile up until the interval has passed
+        delay = self._last_sent + self.min_interval - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        changes = {k: v for k, v in self._changes.items() if self.state.get(k) != v}
+        self._changes = {}
+        self._event.clear()
+        self.state.update(changes)
+        self._last_sent = time.monotonic()
+        return changes
+
+    def is_finished(self) -> bool:
+        """True once the job has nothing left to report."""
+        status = self.state.get("status")
+        return status in ("failed", "cancelled") or (status == "completed" and not self.state.get("pending_stages"))
+
+
+class JobEventBroker:
+    """Fan-out of job updates to the subscribers of each job."""
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[JobSubscription]] = {}
+
+    def subscribe(self, job_id: str) -> JobSubscription:
+        subscription = JobSubscription(job_id)
+        self._subscribers.setdefault(job_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: JobSubscription):
+        subscribers = self._subscribers.get(subscription.job_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.job_id]
+
+    def publish(self, job_id: str, fields: dict):
+        for subscription in self._subscribers.get(job_id, ()):
+            subscription.push(fields)
+
+
+def format_sse(data: dict, event: Optional[str] = None) -> str:
+    """Encode one Server-Sent Events message."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
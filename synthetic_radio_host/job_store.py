@@ -0,0 +1,302 @@
+"""
+Job Store
+
+This module keeps the status records of podcast generation jobs. The
+default backend is SQLite in WAL mode, so job status survives restarts and
+memory use does not grow with uptime. An in-memory backend with the same
+interface is available for development (JOB_STORE=memory).
+
+Finished jobs (completed, failed or cancelled) are evicted once they are older than
+JOB_TTL_SECONDS, and only the newest JOB_MAX_FINISHED of them are kept.
+
+Jobs are also indexed by normalized topic (`topic_key`), so a request for a
+topic that is already being generated, or was finished recently, can be
+answered with the existing job.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+
+# Configuration
+JOB_STORE = os.getenv("JOB_STORE", "sqlite")
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "data/jobs.db")
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", str(24 * 60 * 60)))
+JOB_MAX_FINISHED = int(os.getenv("JOB_MAX_FINISHED", "1000"))
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+ACTIVE_STATUSES = ("pending", "processing")
+_FINISHED_PLACEHOLDERS = ", ".join("?" * len(FINISHED_STATUSES))
+# Completed jobs can still have stages running; those are never evicted
+_NOTHING_PENDING = "(pending_stages IS NULL OR pending_stages = '[]')"
+
+# Job fields and how they are stored: plain SQLite values or JSON-encoded
+JOB_FIELDS = {
+    "status": "text",
+    "topic": "text",
+    "topic_key": "text",
+    "message": "text",
+    "filename": "text",
+    "progress": "integer",
+    "evaluation": "json",
+    "improvement_prompt": "json",
+    "pending_stages": "json",
+}
+
+
+class JobNotFoundError(KeyError):
+    """Raised when updating a job that does not exist."""
+    pass
+
+
+class JobStore(ABC):
+    """Interface shared by all job store backends."""
+
+    @abstractmethod
+    def create(self, job_id: str, job: dict):
+        """Store a new job."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[dict]:
+        """Return a copy of the job, or None if it does not exist."""
+
+    @abstractmethod
+    def update(self, job_id: str, **fields):
+        """Update only the given fields of a job."""
+
+    @abstractmethod
+    def list_ids(self, status: str) -> List[str]:
+        """Ids of all jobs with the given status."""
+
+    @abstractmethod
+    def find_by_topic(self, topic_key: str, completed_since: float) -> Optional[str]:
+        """
+        Find the job a new request for this topic can share.
+
+        Returns:
+            id of the newest job that is still running, or that completed with
+            audio at or after `completed_since`; None if there is none
+        """
+
+    @abstractmethod
+    def evict_finished(self, ttl: int = JOB_TTL_SECONDS, max_finished: int = JOB_MAX_FINISHED) -> int:
+        """
+        Drop expired finished jobs and keep at most `max_finished` of them.
+
+        A completed job whose evaluation or improvement prompt is still
+        running (non-empty `pending_stages`) is never dropped.
+        """
+
+    def mark_interrupted(self) -> int:
+        """Fail jobs left running by a previous process."""
+        count = 0
+        for status in ACTIVE_STATUSES:
+            for job_id in self.list_ids(status):
+                self.update(job_id, status="failed", message="Interrupted by a server restart. Please try again.", pending_stages=[])
+                count += 1
+        # Finished audio stays available, but its remaining stages will never report back
+        for job_id in self.list_ids("completed"):
+            if self.get(job_id)["pending_stages"]:
+                self.update(job_id, pending_stages=[])
+        return count
+
+    def __contains__(self, job_id: str) -> bool:
+        return self.get(job_id) is not None
+
+
+class MemoryJobStore(JobStore):
+    """Process-local job store. Status is lost on restart."""
+
+    def __init__(self):
+        self._jobs: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job_id: str, job: dict):
+        now = time.time()
+        with self._lock:
+            self._jobs[job_id] = {**job, "created_at": now, "updated_at": now, "finished_at": None}
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return json.loads(json.dumps(job)) if job is not None else None
+
+    def update(self, job_id: str, **fields):
+        now = time.time()
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise JobNotFoundError(job_id)
+            if fields.get("status") in FINISHED_STATUSES and job["status"] not in FINISHED_STATUSES:
+                job["finished_at"] = now
+            job.update(fields)
+            job["updated_at"] = now
+
+    def list_ids(self, status: str) -> List[str]:
+        with self._lock:
+            return [job_id for job_id, job in self._jobs.items() if job["status"] == status]
+
+    def find_by_topic(self, topic_key: str, completed_since: float) -> Optional[str]:
+        with self._lock:
+            matches = [
+                (job["created_at"], job_id)
+                for job_id, job in self._jobs.items()
+                if job.get("topic_key") == topic_key and (
+                    job["status"] in ACTIVE_STATUSES
+                    or (job["status"] == "completed" and job["filename"] and job["finished_at"] >= completed_since)
+                )
+            ]
+        return max(matches)[1] if matches else None
+
+    def evict_finished(self, ttl: int = JOB_TTL_SECONDS, max_finished: int = JOB_MAX_FINISHED) -> int:
+        cutoff = time.time() - ttl
+        with self._lock:
+            finished = sorted(
+                (job["finished_at"] or 0, job_id)
+                for job_id, job in self._jobs.items()
+                if job["status"] in FINISHED_STATUSES and not job.get("pending_stages")
+            )
+            expired = [job_id for finished_at, job_id in finished if finished_at < cutoff]
+            kept = [job_id for finished_at, job_id in finished if finished_at >= cutoff]
+            expired += kept[:max(0, len(kept) - max_finished)]
+            for job_id in expired:
+                del self._jobs[job_id]
+        return len(expired)
+
+
+class SqliteJobStore(JobStore):
+    """SQLite (WAL) job store with indexed lookups by id and status."""
+
+    def __init__(self, path: str = JOB_DB_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Progress writes are frequent; WAL + NORMAL keeps each one cheap
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                finished_at REAL
+            )
+        """)
+        self._ensure_columns()
+        self._conn.executescript("""
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+            CREATE INDEX IF NOT EXISTS idx_jobs_finished ON jobs (status, finished_at);
+            CREATE INDEX IF NOT EXISTS idx_jobs_topic ON jobs (topic_key, created_at);
+        """)
+        self._conn.commit()
+
+    def _ensure_columns(self):
+        """Add columns for any job fields a previous schema did not have."""
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for name, kind in JOB_FIELDS.items():
+            if name not in existing:
+                sql_type = "INTEGER" if kind == "integer" else "TEXT"
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {sql_type}")
+
+    @staticmethod
+    def _encode(name: str, value):
+        if JOB_FIELDS[name] == "json":
+            return json.dumps(value) if value is not None else None
+        return value
+
+    def _row_to_job(self, row: sqlite3.Row) -> dict:
+        job = {}
+        for name, kind in JOB_FIELDS.items():
+            value = row[name]
+            job[name] = json.loads(value) if kind == "json" and value is not None else value
+        job["created_at"] = row["created_at"]
+        job["updated_at"] = row["updated_at"]
+        job["finished_at"] = row["finished_at"]
+        return job
+
+    def create(self, job_id: str, job: dict):
+        now = time.time()
+        fields = {name: self._encode(name, job.get(name)) for name in JOB_FIELDS}
+        columns = ", ".join(["job_id", "created_at", "updated_at", *fields])
+        placeholders = ", ".join("?" * (len(fields) + 3))
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO jobs ({columns}) VALUES ({placeholders})",
+                (job_id, now, now, *fields.values()),
+            )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row is not None else None
+
+    def update(self, job_id: str, **fields):
+        unknown = set(fields) - set(JOB_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown job fields: {', '.join(sorted(unknown))}")
+        now = time.time()
+        assignments = [f"{name} = ?" for name in fields] + ["updated_at = ?"]
+        values = [self._encode(name, value) for name, value in fields.items()] + [now]
+        if fields.get("status") in FINISHED_STATUSES:
+            # Only the first transition to a finished status sets finished_at
+            assignments.append("finished_at = COALESCE(finished_at, ?)")
+            values.append(now)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET {', '.join(assignments)} WHERE job_id = ?",
+                (*values, job_id),
+            )
+        if cursor.rowcount == 0:
+            raise JobNotFoundError(job_id)
+
+    def list_ids(self, status: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT job_id FROM jobs WHERE status = ?", (status,)).fetchall()
+        return [row[0] for row in rows]
+
+    def find_by_topic(self, topic_key: str, completed_since: float) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT job_id FROM jobs
+                WHERE topic_key = ? AND (
+                    status IN (?, ?)
+                    OR (status = 'completed' AND filename IS NOT NULL AND finished_at >= ?)
+                )
+                ORDER BY created_at DESC LIMIT 1
+                """,
+                (topic_key, *ACTIVE_STATUSES, completed_since),
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def evict_finished(self, ttl: int = JOB_TTL_SECONDS, max_finished: int = JOB_MAX_FINISHED) -> int:
+        cutoff = time.time() - ttl
+        with self._lock, self._conn:
+            expired = self._conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({_FINISHED_PLACEHOLDERS}) AND {_NOTHING_PENDING} AND finished_at < ?",
+                (*FINISHED_STATUSES, cutoff),
+            ).rowcount
+            over_limit = self._conn.execute(
+                f"""
+                DELETE FROM jobs WHERE job_id IN (
+                    SELECT job_id FROM jobs WHERE status IN ({_FINISHED_PLACEHOLDERS}) AND {_NOTHING_PENDING}
+                    ORDER BY finished_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (*FINISHED_STATUSES, max_finished),
+            ).rowcount
+        return expired + over_limit
+
+
+def create_job_store() -> JobStore:
+    """Create the job store selected by JOB_STORE."""
+    if JOB_STORE == "memory":
+        return MemoryJobStore()
+    return SqliteJobStore(JOB_DB_PATH)
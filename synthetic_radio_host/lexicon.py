@@ -0,0 +1,127 @@
+"""
+Pronunciation Lexicon
+
+This module replaces romanized Hindi words that the TTS voices mispronounce
+(e.g. "tune" read as the English word) with their Devanagari spelling,
+which edge-tts Hindi voices pronounce correctly.
+
+Entries are loaded from a tab-separated file (pronunciations.tsv by default,
+or PRONUNCIATION_LEXICON) and compiled once into a character trie. Text is
+then rewritten in a single left-to-right pass. At every word start the
+longest whole-word entry wins, matched case-insensitively. The cost
+therefore grows with the length of the text, not with the number of
+entries.
+"""
+
+import os
+from typing import Dict, Iterable, Optional, Tuple
+
+
+PRONUNCIATION_LEXICON = os.getenv("PRONUNCIATION_LEXICON") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "pronunciations.tsv"
+)
+
+# Marks a trie node where an entry ends; the value is its replacement
+_END = ""
+
+
+def _is_word_char(ch: str) -> bool:
+    # Same notion of a word character as the regex \b it replaces
+    return ch.isalnum() or ch == "_"
+
+
+class Lexicon:
+    """Whole-word, case-insensitive substitutions compiled into a trie."""
+
+    def __init__(self, entries: Iterable[Tuple[str, str]] = ()):
+        self.root: Dict[str, dict] = {}
+        self.size = 0
+        for word, replacement in entries:
+            self.add(word, replacement)
+
+    def add(self, word: str, replacement: str):
+        """Add one entry; a later entry for the same word replaces the earlier one."""
+        word = word.strip().lower()
+        if not word:
+            return
+        node = self.root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        if _END not in node:
+            self.size += 1
+        node[_END] = replacement
+
+    def _longest_match(self, text: str, start: int) -> Optional[Tuple[int, str]]:
+        """Longest entry starting at `start` that ends on a word boundary, as (end, replacement)."""
+        node = self.root
+        match = None
+        i = start
+        while i < len(text):
+            node = node.get(text[i].lower())
+            if node is None:
+                break
+            i += 1
+            if _END in node and (i == len(text) or not _is_word_char(text[i])):
+                match = (i, node[_END])
+        return match
+
+    def apply(self, text: str) -> str:
+        """Rewrite every lexicon word in `text` in one pass."""
+        if not self.root:
+            return text
+        out = []
+        i = 0
+        length = len(text)
+        while i < length:
+            if _is_word_char(text[i]) and (i == 0 or not _is_word_char(text[i - 1])):
+                match = self._longest_match(text, i)
+                if match:
+                    end, replacement = match
+                    out.append(replacement)
+                    i = end
+                    continue
+            # Copy up to the next word start
+            j = i + 1
+            while j < length and not (_is_word_char(text[j]) and not _is_word_char(text[j - 1])):
+                j += 1
+            out.append(text[i:j])
+            i = j
+        return "".join(out)
+
+    def __len__(self) -> int:
+        return self.size
+
+
+def load_lexicon(path: str) -> Lexicon:
+    """
+    Load a lexicon file: one `word<TAB>replacement` entry per line.
+
+    Blank lines and lines starting with # are ignored. The word may contain
+    spaces (multi-word entries).
+    """
+    lexicon = Lexicon()
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.rstrip("\n")
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            if "\t" not in line:
+                raise ValueError(f"{path}:{number}: expected 'word<TAB>replacement'")
+            word, replacement = line.split("\t", 1)
+            lexicon.add(word, replacement.strip())
+    return lexicon
+
+
+_lexicon: Optional[Lexicon] = None
+
+
+def get_lexicon() -> Lexicon:
+    """Return the process-wide lexicon, compiled on first use (empty if the file is missing)."""
+    global _lexicon
+    if _lexicon is None:
+        if os.path.exists(PRONUNCIATION_LEXICON):
+            _lexicon = load_lexicon(PRONUNCIATION_LEXICON)
+        else:
+            print(f"⚠️ Pronunciation lexicon not found: {PRONUNCIATION_LEXICON}")
+            _lexicon = Lexicon()
+    return _lexicon
@@ -0,0 +1,124 @@
+"""
+Persistent Memo Cache for Critic Evaluations and Improvement Prompts
+
+The critic and the improvement-prompt model are deterministic enough that
+asking them twice about the same input is wasted money and latency. A
+retried job or a re-served episode sends the critic the exact script it has
+already judged, and many evaluations differ only in their prose, not their
+scores. This module stores both results in SQLite:
+
+- Critic evaluations are keyed by a canonical hash of the script (speaker
+  and text with whitespace normalized), the model and the prompt.
+- Improvement prompts are keyed by a fingerprint of the evaluation's
+  category and breakdown scores, so evaluations that score the same share
+  one prompt.
+
+Entries expire after LLM_CACHE_TTL seconds; expired rows are purged at
+startup and every LLM_CACHE_PURGE_EVERY writes. Every lookup is counted in
+the cache metrics. Methods are blocking, so async callers run them through
+asyncio.to_thread.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Optional
+
+from metrics import CACHE_LOOKUPS
+
+
+# Configuration
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "cache/llm.db")
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 60 * 60)))
+LLM_CACHE_PURGE_EVERY = int(os.getenv("LLM_CACHE_PURGE_EVERY", "100"))
+
+
+def canonical_hash(*parts) -> str:
+    """SHA-256 of JSON-serializable parts, independent of dict ordering."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def script_fingerprint(script: list) -> str:
+    """Hash of what the critic sees: each line's speaker and text, whitespace-normalized."""
+    return canonical_hash([
+        [" ".join(str(line.get("speaker", "")).split()), " ".join(str(line.get("text", "")).split())]
+        for line in script
+    ])
+
+
+def evaluation_fingerprint(evaluation: dict) -> str:
+    """Hash of an evaluation's category and breakdown scores (strengths and prose are ignored)."""
+    return canonical_hash({
+        name: {"score": data.get("score"), "breakdown": data.get("breakdown", {})}
+        for name, data in evaluation.get("categories", {}).items()
+    })
+
+
+class LLMCache:
+    """SQLite-backed store of JSON results, namespaced by kind, with TTL expiry."""
+
+    def __init__(self, path: str, ttl: int = LLM_CACHE_TTL, purge_every: int = LLM_CACHE_PURGE_EVERY):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ttl = ttl
+        self.purge_every = max(1, purge_every)
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS results (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (kind, key)
+            );
+            CREATE INDEX IF NOT EXISTS results_created_at ON results (created_at);
+        """)
+        self._conn.commit()
+        self.purge_expired()
+
+    def get(self, kind: str, key: str) -> Optional[dict]:
+        """Return a fresh cached result, or None (counted as a hit or miss for `kind`)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM results WHERE kind = ? AND key = ? AND created_at > ?",
+                (kind, key, time.time() - self.ttl),
+            ).fetchone()
+        CACHE_LOOKUPS.inc(cache=kind, result="misses" if row is None else "hits")
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, kind: str, key: str, value: dict):
+        """Store a result; every `purge_every` writes also drops expired entries."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (kind, key, value, created_at) VALUES (?, ?, ?, ?)",
+                (kind, key, json.dumps(value, ensure_ascii=False), time.time()),
+            )
+            self._writes += 1
+            purge = self._writes % self.purge_every == 0
+        if purge:
+            self.purge_expired()
+
+    def purge_expired(self) -> int:
+        """Delete entries older than the TTL; returns how many were removed."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM results WHERE created_at <= ?", (time.time() - self.ttl,))
+        return cursor.rowcount
+
+
+_llm_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Return the process-wide LLM result cache, or None when disabled."""
+    global _llm_cache
+    if _llm_cache is None and LLM_CACHE_ENABLED:
+        _llm_cache = LLMCache(LLM_CACHE_PATH)
+    return _llm_cache
@@ -0,0 +1,101 @@
+"""
+Shared Async LLM Client
+
+This module provides the one Groq client used by script generation, the
+critic evaluator and the improvement prompt generator. It is async, so a
+long completion only suspends the job waiting on it. It also reuses a
+single keep-alive connection pool instead of building a new HTTP client
+for every call.
+"""
+
+import os
+import weakref
+import asyncio
+import contextvars
+from typing import Dict
+
+import httpx
+from groq import AsyncGroq
+
+from metrics import RETRIES, upstream_call
+
+
+# Per-model request timeouts in seconds - reasoning models need longer
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+MODEL_TIMEOUTS = {
+    "llama-3.3-70b-versatile": 60.0,
+    "qwen/qwen3-32b": 60.0,
+    "openai/gpt-oss-120b": 120.0,
+}
+
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+
+# One client per (event loop, API key): pooled connections can't cross loops.
+# Keyed by the loop object itself, weakly, so a finished loop's clients are
+# dropped with it and never handed to a new loop that reuses its id().
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncGroq]]" = weakref.WeakKeyDictionary()
+
+# HTTP attempts made by the current completion call; the SDK retries internally
+_attempts: contextvars.ContextVar[list] = contextvars.ContextVar("llm_attempts")
+
+
+async def _count_attempt(request: httpx.Request):
+    attempts = _attempts.get(None)
+    if attempts is not None:
+        attempts[0] += 1
+
+
+def get_model_timeout(model: str) -> float:
+    """Return the request timeout for a model."""
+    return MODEL_TIMEOUTS.get(model, LLM_TIMEOUT)
+
+
+def get_llm_client(api_key: str) -> AsyncGroq:
+    """Return the shared async Groq client for this API key."""
+    clients = _clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(api_key)
+    if client is None:
+        # Create a custom HTTP client that ignores SSL errors and keeps connections alive
+        http_client = httpx.AsyncClient(
+            verify=False,
+            event_hooks={"request": [_count_attempt]},
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_CONNECTIONS,
+            ),
+        )
+        client = AsyncGroq(api_key=api_key, http_client=http_client, max_retries=2)
+        clients[api_key] = client
+    return client
+
+
+async def aclose_llm_clients():
+    """Close the running loop's clients; call before the loop shuts down."""
+    for client in _clients.pop(asyncio.get_running_loop(), {}).values():
+        await client.close()
+
+
+async def create_chat_completion(api_key: str, model: str, messages: list, **kwargs):
+    """
+    Run a chat completion on the shared client with the model's timeout.
+
+    Args:
+        api_key: Groq API key
+        model: Model name, also used to pick the timeout
+        messages: Chat messages
+        **kwargs: Passed through to chat.completions.create
+
+    Returns:
+        The Groq chat completion
+    """
+    client = get_llm_client(api_key)
+    kwargs.setdefault("timeout", get_model_timeout(model))
+    attempts = [0]
+    token = _attempts.set(attempts)
+    try:
+        with upstream_call("groq"):
+            return await client.chat.completions.create(model=model, messages=messages, **kwargs)
+    finally:
+        _attempts.reset(token)
+        if attempts[0] > 1:
+            RETRIES.inc(attempts[0] - 1, service="groq")
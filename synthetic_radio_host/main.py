@@ -1,21 +1,31 @@
 import os
+import sys
 import json
 import asyncio
 import argparse
-import requests
 import warnings
-import re
 from urllib3.exceptions import InsecureRequestWarning
-from groq import Groq
-import edge_tts
 from dotenv import load_dotenv
-from evaluator import evaluate_podcast_script, format_evaluation_summary
+from evaluator import evaluate_podcast_script, format_evaluation_summary, score_script_locally
+from tts_cache import SegmentCache, get_segment_cache
+from wikipedia_client import get_wikipedia_client
+from llm_client import aclose_llm_clients, create_chat_completion
+from prompt_generator import generate_improvement_prompt
+from pipeline import StageGraph
+from artifact_store import ARTIFACT_DIR, get_artifact_store, slugify
+from mp3_frames import Mp3Assembler
+from chapters import ChapterIndex, words_from_boundaries
+from metrics import CACHE_LOOKUPS, span
+from lexicon import get_lexicon
+from script_stream import DialogueStreamParser, ScriptFeed
+from source_extract import estimate_tokens, extract_relevant_content
+from batch import BATCH_CONCURRENCY, default_manifest_path, read_topics, run_batch
+import tts_client
 
 # Load environment variables
 load_dotenv()
 
 
-import httpx
 import ssl
 
 # GLOBAL SSL BYPASS (The "Nuclear" Option)
@@ -38,7 +48,9 @@ warnings.simplefilter('ignore', InsecureRequestWarning)
 # Configuration
 VOICE_FEMALE = "hi-IN-SwaraNeural"  # Speaker 1 (Priya)
 VOICE_MALE = "hi-IN-MadhurNeural"   # Speaker 2 (Amit)
-OUTPUT_DIR = "output"
+OUTPUT_DIR = ARTIFACT_DIR  # Published episodes, managed by artifact_store.py
+# Maximum number of edge-tts requests in flight per episode
+TTS_CONCURRENCY = int(os.getenv("TTS_CONCURRENCY", "4"))
 
 
 class WikipediaNotFoundError(Exception):
@@ -46,40 +58,25 @@ class WikipediaNotFoundError(Exception):
     pass
 
 
-def fetch_wikipedia_content(topic, lang='en'):
-    """Fetches the summary and content using raw Wikipedia API (bypassing SSL issues)."""
+async def fetch_wikipedia_content(topic, lang='en'):
+    """Fetches the article content through the shared, cached async Wikipedia client."""
     try:
-        # Fetch summary and intro
-        url = f"https://{lang}.wikipedia.org/w/api.php"
-        params = {
-            "action": "query",
-            "format": "json",
-            "titles": topic,
-            "prop": "extracts",
-            "explaintext": True,
-        }
-        
-        # Verify=False to bypass the SSL certificate issue on this machine
-        headers = {'User-Agent': 'SyntheticRadioHost/1.0 (test@example.com)'}
-        response = requests.get(url, params=params, headers=headers, verify=False)
-        data = response.json()
+        page = await get_wikipedia_client().fetch_page(topic, lang)
         
-        pages = data['query']['pages']
-        page_id = list(pages.keys())[0]
-        
-        if page_id == "-1":
+        if page is None:
             raise WikipediaNotFoundError(f"Topic not found: '{topic}' is not available on Wikipedia. Please try a different topic or check the spelling.")
             
-        page_data = pages[page_id]
-        title = page_data.get('title', topic)
-        text = page_data.get('extract', '')
+        title = page["title"]
+        text = page["extract"]
         
         # Check if extract is empty (page exists but has no content)
         if not text or not text.strip():
             raise WikipediaNotFoundError(f"Topic not found: '{topic}' exists on Wikipedia but has no content. Please try a different topic.")
         
-        # Structure the content
-        content = f"Title: {title}\n\nContent:\n{text[:4000]}"
+        # Structure the content: the most relevant paragraphs within the token budget
+        selected = extract_relevant_content(title, text)
+        print(f"📚 Source: ~{estimate_tokens(selected)} of ~{estimate_tokens(text)} tokens selected")
+        content = f"Title: {title}\n\nContent:\n{selected}"
         return content
         
     except WikipediaNotFoundError:
@@ -90,15 +87,7 @@ def fetch_wikipedia_content(topic, lang='en'):
         raise ValueError(f"Failed to fetch Wikipedia content for '{topic}': {str(e)}")
 
 
-import httpx
-
-def generate_conversation_script(topic_content, api_key):
-    """Generates a Hinglish conversation script using Groq (Llama 3.3)."""
-    # Create a custom HTTP client that ignores SSL errors
-    http_client = httpx.Client(verify=False)
-    client = Groq(api_key=api_key, http_client=http_client)
-    
-    system_prompt = """
+SCRIPT_SYSTEM_PROMPT = """
 You are a scriptwriter for a Hinglish podcast featuring two best friends, [Priya] and [Amit], having a casual chat like they're sitting in a chai tapri or college canteen. Write NATURAL, FLOWING Hindi-English conversation - the way real Indian friends actually talk.
 
 HOSTS:
@@ -156,15 +145,31 @@ Example:
   {"speaker": "Priya", "text": "Kya baat! Kitna bada? Matlab samjha mujhe thoda."}
 ]}
 """
-    
+
+# Ensure script is limited to ~20 segments max for < 2-minute duration
+# Average segment is ~5-6 seconds, so 20 segments ≈ 1.5 - 2 minutes
+MAX_SCRIPT_SEGMENTS = 20
+
+# Stream the script and start synthesis on its first line (see script_stream.py)
+SCRIPT_STREAMING = os.getenv("SCRIPT_STREAMING", "1").lower() in ("1", "true", "yes")
+
+SCRIPT_MODEL = "llama-3.3-70b-versatile"
+
+
+def script_messages(topic_content):
     user_prompt = f"Topic Content:\\n{topic_content}\\n\\nGenerate the Gen-Z Hinglish podcast script now."
+    return [
+        {"role": "system", "content": SCRIPT_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
 
-    completion = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ],
+async def generate_conversation_script(topic_content, api_key):
+    """Generates a Hinglish conversation script using Groq (Llama 3.3)."""
+    completion = await create_chat_completion(
+        api_key,
+        model=SCRIPT_MODEL,
+        messages=script_messages(topic_content),
         temperature=0.8, # Increased temperature for more creativity/slang
         max_tokens=2500,
         response_format={"type": "json_object"}
@@ -184,127 +189,287 @@ Example:
         else:
             script = script_data
         
-        # Ensure script is limited to ~20 segments max for < 2-minute duration
-        # Average segment is ~5-6 seconds, so 20 segments ≈ 1.5 - 2 minutes
-        if len(script) > 20:
-            print(f"⚠️ Script has {len(script)} segments, trimming to 20 for 2-minute limit")
-            script = script[:20]
+        if len(script) > MAX_SCRIPT_SEGMENTS:
+            print(f"⚠️ Script has {len(script)} segments, trimming to {MAX_SCRIPT_SEGMENTS} for 2-minute limit")
+            script = script[:MAX_SCRIPT_SEGMENTS]
         
         return script
     except Exception as e:
         print(f"Error parsing LLM response: {e}")
         return []
 
+
+def remove_consecutive_duplicates(script):
+    """Drop lines that repeat the text of the line right before them."""
+    filtered_script = []
+    for line in script:
+        if not filtered_script or line.get("text") != filtered_script[-1].get("text"):
+            filtered_script.append(line)
+    return filtered_script
+
+
+async def stream_conversation_script(topic_content, api_key):
+    """
+    Stream the script, yielding each dialogue line as soon as the LLM has written it.
+
+    JSON mode can't be combined with streaming, so the completion is parsed
+    incrementally (script_stream.DialogueStreamParser) and prose around the
+    JSON is ignored. Consecutive duplicate lines are dropped and at most
+    MAX_SCRIPT_SEGMENTS lines are yielded.
+    """
+    stream = await create_chat_completion(
+        api_key,
+        model=SCRIPT_MODEL,
+        messages=script_messages(topic_content),
+        temperature=0.8, # Increased temperature for more creativity/slang
+        max_tokens=2500,
+        stream=True,
+    )
+    parser = DialogueStreamParser()
+    count = 0
+    previous_text = None
+    try:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            for line in parser.feed(chunk.choices[0].delta.content or ""):
+                if line.get("text") == previous_text:
+                    continue
+                previous_text = line.get("text")
+                yield line
+                count += 1
+                if count >= MAX_SCRIPT_SEGMENTS:
+                    print(f"⚠️ Script reached {MAX_SCRIPT_SEGMENTS} segments, stopping for 2-minute limit")
+                    return
+            if parser.done:
+                return
+    finally:
+        await stream.close()
+
 import random
 
-def preprocess_text_for_tts(text):
-    """Preprocess text to make TTS sound more natural and Gen-Z."""
-    # The 'Haina' Rule: Replace question marks with 'haina?' occasionally if fitting (handled mostly by LLM prompt but reinforced here)
-    if text.endswith("?") and random.random() < 0.3:
-        text = text[:-1] + " haina?"
+# The filler, "haina" and prosody choices for a line are derived from this seed
+# and the line's text, so the same line always comes out the same (reproducible
+# episodes, and repeated lines hit the TTS segment cache). "random" draws them
+# afresh every time instead.
+TTS_SEED = os.getenv("TTS_SEED", "")
+
+# HINGLISH FILLER WORDS - When to use:
+# - "Arre/Arrey": Surprise, emphasis, or getting attention (casual)
+# - "Yaar": Friendly address, seeking agreement (very common, use sparingly)
+# - "Bhai/Bro": Casual address, especially for guys
+# - "Matlab": Explaining or clarifying ("I mean")
+# - "Basically": Simplifying or summarizing
+# - "Sunn": Getting attention ("listen")
+# - "Accha/Achha": Realization or agreement ("oh, I see")
+# - "Toh": Emphasis or transition ("so/then")
+# - "Haina": Seeking confirmation ("right?")
+# - "Na": Seeking agreement or emphasis
+# - "Chalo": Encouraging action ("come on/let's")
+# - "You know": Assuming shared knowledge
+# - "I mean": Clarifying or emphasizing
+# - "Well": Thinking pause or transition
+# - "Like": Approximation or thinking pause
+# - "Dekho": Getting attention ("look/see")
+# - "Samjhe": Checking understanding ("understand?")
+# - "Wahi toh": Emphasizing agreement ("that's exactly it")
+# - "Ek minute": Pausing to think ("one minute")
+# - "Arey yaar": Expressing frustration or surprise
+# - "Bhai yaar": Casual emphasis
+# - "Seriously": Expressing disbelief or emphasis
+# - "Legit": Emphasizing truth ("legitimately")
+# - "Actually": Correcting or clarifying
+# - "Like that only": Emphasizing something is exactly as stated
+
+# Expanded filler list with 25+ options to reduce repetition
+FILLERS = [
+    # Common Hinglish (use frequently but vary)
+    "Yaar, ",
+    "Bhai, ",
+    "Bro, ",
+    "Matlab, ",
+    "Basically, ",
+    "Toh, ",
+
+    # Attention-getters
+    "Sunn, ",
+    "Dekho, ",
+    "Arre, ",
+    "Arrey, ",
+
+    # Realization/Agreement
+    "Accha, ",
+    "Achha, ",
+    "Haina, ",
+    "Na, ",
+
+    # English fillers (common in Hinglish)
+    "You know, ",
+    "I mean, ",
+    "Well, ",
+    "Like, ",
+    "Actually, ",
+    "Seriously, ",
+
+    # Action/Encouragement
+    "Chalo, ",
+
+    # Emphasis phrases
+    "Wahi toh, ",
+    "Arey yaar, ",
+    "Bhai yaar, ",
+    "Like that only, ",
+
+    # Thinking pauses
+    "Ek minute, ",
+    "Samjhe, ",
+]
+
+def line_rng(text, seed=None):
+    """Random source for one line: seeded from (seed, text), or the global one when seed is "random"."""
+    seed = TTS_SEED if seed is None else seed
+    if seed == "random":
+        return random
+    return random.Random(f"{seed}:{text}")
+
+def preprocess_text_for_tts(text, rng=None):
+    """
+    Preprocess text to make TTS sound more natural and Gen-Z.
 
-    # Fix "tune" pronunciation - replace Hindi pronoun "tune" with Devanagari "तूने"
-    # Edge-TTS Hindi voices will correctly pronounce Devanagari script
-    # Use regex to replace "tune" or "Tune" as whole words
-    text = re.sub(r'\b([Tt])une\b', 'तूने', text, flags=re.IGNORECASE)
+    Args:
+        text: Dialogue line
+        rng: Random source for the filler and "haina" rules (defaults to line_rng(text))
+    """
+    rng = rng or line_rng(text)
 
-    # Fix "cheeze/cheezein" pronunciation - replace with "चीज़ / चीजें"
-    text = re.sub(r'\b([Cc])heezein\b', 'चीज़ें', text, flags=re.IGNORECASE)
-    text = re.sub(r'\b([Cc])heeze\b', 'चीज़ें', text, flags=re.IGNORECASE)
-    text = re.sub(r'\b([Cc])heez\b', 'चीज़', text, flags=re.IGNORECASE)
+    # The 'Haina' Rule: Replace question marks with 'haina?' occasionally if fitting (handled mostly by LLM prompt but reinforced here)
+    if text.endswith("?") and rng.random() < 0.3:
+        text = text[:-1] + " haina?"
 
+    # Pronunciation fixes (e.g. "tune" -> "तूने", "cheezein" -> "चीज़ें"): Edge-TTS Hindi
+    # voices correctly pronounce Devanagari. All lexicon entries are applied in one pass
+    text = get_lexicon().apply(text)
 
-    
     # Filler Injection (Randomly add start fillers)
-    # Expanded variety to avoid repetition - organized by context/usage
-    
-    # HINGLISH FILLER WORDS - When to use:
-    # - "Arre/Arrey": Surprise, emphasis, or getting attention (casual)
-    # - "Yaar": Friendly address, seeking agreement (very common, use sparingly)
-    # - "Bhai/Bro": Casual address, especially for guys
-    # - "Matlab": Explaining or clarifying ("I mean")
-    # - "Basically": Simplifying or summarizing
-    # - "Sunn": Getting attention ("listen")
-    # - "Accha/Achha": Realization or agreement ("oh, I see")
-    # - "Toh": Emphasis or transition ("so/then")
-    # - "Haina": Seeking confirmation ("right?")
-    # - "Na": Seeking agreement or emphasis
-    # - "Chalo": Encouraging action ("come on/let's")
-    # - "You know": Assuming shared knowledge
-    # - "I mean": Clarifying or emphasizing
-    # - "Well": Thinking pause or transition
-    # - "Like": Approximation or thinking pause
-    # - "Dekho": Getting attention ("look/see")
-    # - "Samjhe": Checking understanding ("understand?")
-    # - "Wahi toh": Emphasizing agreement ("that's exactly it")
-    # - "Ek minute": Pausing to think ("one minute")
-    # - "Arey yaar": Expressing frustration or surprise
-    # - "Bhai yaar": Casual emphasis
-    # - "Seriously": Expressing disbelief or emphasis
-    # - "Legit": Emphasizing truth ("legitimately")
-    # - "Actually": Correcting or clarifying
-    # - "Like that only": Emphasizing something is exactly as stated
-    
-    if random.random() < 0.4:
-        # Expanded filler list with 25+ options to reduce repetition
-        fillers = [
-            # Common Hinglish (use frequently but vary)
-            "Yaar, ",
-            "Bhai, ",
-            "Bro, ",
-            "Matlab, ",
-            "Basically, ",
-            "Toh, ",
-            
-            # Attention-getters
-            "Sunn, ",
-            "Dekho, ",
-            "Arre, ",
-            "Arrey, ",
-            
-            # Realization/Agreement
-            "Accha, ",
-            "Achha, ",
-            "Haina, ",
-            "Na, ",
-            
-            # English fillers (common in Hinglish)
-            "You know, ",
-            "I mean, ",
-            "Well, ",
-            "Like, ",
-            "Actually, ",
-            "Seriously, ",
-            
-            # Action/Encouragement
-            "Chalo, ",
-            
-            # Emphasis phrases
-            "Wahi toh, ",
-            "Arey yaar, ",
-            "Bhai yaar, ",
-            "Like that only, ",
-            
-            # Thinking pauses
-            "Ek minute, ",
-            "Samjhe, ",
-        ]
-        text = random.choice(fillers) + text
+    if rng.random() < 0.4:
+        text = rng.choice(FILLERS) + text
 
     # Speed overrides handled in prosody settings
     return text
 
+async def synthesize_segment_audio(text, voice, rate="+0%", pitch="+0Hz"):
+    """
+    Synthesize one segment straight into memory.
+
+    Returns:
+        tuple: (MP3 bytes, [start, duration, word] timings or None if unknown)
+    """
+    # Identical (text, voice, rate, pitch) requests are served from the segment cache
+    cache = get_segment_cache()
+    cache_key = SegmentCache.make_key(text, voice, rate, pitch)
+    if cache:
+        # Disk reads and writes run in a worker thread so the event loop keeps streaming
+        data = await asyncio.to_thread(cache.get, cache_key)
+        CACHE_LOOKUPS.inc(cache="tts_segment", result="misses" if data is None else "hits")
+        if data is not None:
+            return data, await asyncio.to_thread(cache.get_words, cache_key)
+
+    # Deadlines, retries and hedging are handled by tts_client
+    with span("tts_segment"):
+        data, boundaries = await tts_client.synthesize(text, voice, rate=rate, pitch=pitch)
+    words = words_from_boundaries(boundaries)
+
+    if cache:
+        await asyncio.to_thread(cache.put, cache_key, data, words=words)
+    return data, words
+
+async def synthesize_segment_bytes(text, voice, rate="+0%", pitch="+0Hz"):
+    """Synthesize one segment straight into memory and return its MP3 bytes."""
+    data, _ = await synthesize_segment_audio(text, voice, rate=rate, pitch=pitch)
+    return data
+
 async def generate_audio_segment(text, voice, filename, rate="+0%", pitch="+0Hz"):
     """Generate audio with prosody control for more natural speech."""
-    communicate = edge_tts.Communicate(text, voice, rate=rate, pitch=pitch)
-    await communicate.save(filename)
+    data = await synthesize_segment_bytes(text, voice, rate=rate, pitch=pitch)
+    with open(filename, 'wb') as f:
+        f.write(data)
+
+def prepare_segment(line):
+    """Pick the spoken text, voice and prosody for one dialogue line."""
+    speaker = line.get("speaker", "").lower()
+    text = line.get("text", "")
+
+    # Preprocess text for natural TTS
+    rng = line_rng(text)
+    spoken_text = preprocess_text_for_tts(text, rng)
+
+    # Gen-Z Prosody Settings: Faster, more dynamic
+    # Base speed increased (~1.15x equivalent via rate percentage)
+    rate_variation = rng.randint(-2, 5) # Skew towards faster
+    pitch_variation = rng.randint(-2, 4)
+
+    # Short energetic reactions should be even faster
+    is_short_reaction = len(text.split()) < 5
+
+    # Determine speaker and create engaging message
+    if "priya" in speaker:
+        voice = VOICE_FEMALE
+        # Priya: Gen-Z energetic girl
+        # Rate boosted to ~+20-25% for that fast pitter-patter style
+        base_rate = 20 + rate_variation
+        if is_short_reaction: base_rate += 10
+
+        base_pitch = 4 + pitch_variation
+        speaker_name = "Priya"
+    else:
+        voice = VOICE_MALE
+        # Amit: Fast-paced guy
+        # Rate boosted to ~+15-20%
+        base_rate = 15 + rate_variation
+        if is_short_reaction: base_rate += 10
+
+        base_pitch = -2 + pitch_variation
+        speaker_name = "Amit"
+
+    return {
+        "text": text,
+        "spoken_text": spoken_text,
+        "voice": voice,
+        "rate": f"+{base_rate}%",
+        "pitch": f"+{base_pitch}Hz" if base_pitch >= 0 else f"{base_pitch}Hz",
+        "speaker_name": speaker_name,
+    }
 
-async def synthesize_podcast(script, output_file, progress_callback=None):
+async def synthesize_podcast(script, output_file, progress_callback=None, concurrency=None, audio_stream=None):
+    """
+    Synthesize every dialogue line and assemble the episode in script order.
+
+    Segments are fanned out to edge-tts concurrently, with at most
+    `concurrency` requests in flight (defaults to TTS_CONCURRENCY; 1 gives
+    the old one-after-another behaviour). Audio stays in a per-job buffer and
+    is appended to `output_file` as soon as all earlier segments are in, so
+    no temporary segment files are written. Segments are joined frame by
+    frame: their ID3/Xing headers are dropped and the file gets a single
+    Xing header with the frame count and seek table. The same audio is published to
+    `audio_stream` (an EpisodeStream), if given, so listeners can start
+    playing before the episode is finished. Progress is reported as segments
+    finish, whatever order that happens in.
+
+    `script` is either the finished list of lines or, while the script is
+    still being streamed, an async iterable of lines (a ScriptFeed); each
+    line is then sent to edge-tts as soon as it arrives.
+
+    Returns:
+        dict: chapter manifest with the start time, duration, byte offset
+        and speaker of every line in `output_file` (see chapters.py)
+    """
     os.makedirs(OUTPUT_DIR, exist_ok=True)
-    temp_files = []
-    total_segments = len(script)
+    streaming = not isinstance(script, list)
+    # While the script is streaming its length is unknown; progress assumes the maximum until it ends
+    total_segments = MAX_SCRIPT_SEGMENTS if streaming else len(script)
+    concurrency = max(1, concurrency or TTS_CONCURRENCY)
     
-    print("\nSynthesizing audio segments (Gen-Z Mode 🚀)...")
+    print(f"\nSynthesizing audio segments (Gen-Z Mode 🚀, {concurrency} at a time)...")
     
     # Audio synthesis represents 30-100% of overall progress (script generation is 0-30%)
     # Adjusted to move faster - audio typically completes around 73%, so we'll accelerate progress
@@ -316,93 +481,115 @@ async def synthesize_podcast(script, output_file, progress_callback=None):
     if progress_callback:
         progress_callback(PROGRESS_START, 100, "Setting up audio synthesis...")
         await asyncio.sleep(0.1)
-    
-    # We will simply concatenate MP3 files using binary mode since pydub needs ffmpeg
+
+    # Prosody is picked as lines come in, in script order, so the random
+    # variations don't depend on which segment happens to finish first
+    segments = []
+
+    # Finished segments wait here (per job, in memory) until every earlier
+    # segment has been written, so the episode is assembled in script order
+    pending_audio = {}
+    next_to_write = 0
+
+    semaphore = asyncio.Semaphore(concurrency)
+    completed = 0
+    chapters = ChapterIndex()
+
+    async def synthesize_segment(i, segment, assembler):
+        nonlocal completed, next_to_write
+        async with semaphore:
+            print(f"{segment['speaker_name'] + ':':<6} {segment['text'][:40]}...")
+            pending_audio[i] = await synthesize_segment_audio(
+                segment["spoken_text"], segment["voice"],
+                rate=segment["rate"], pitch=segment["pitch"]
+            )
+        completed += 1
+
+        # Append the contiguous prefix, frame by frame, without per-segment headers
+        while next_to_write in pending_audio:
+            audio, words = pending_audio.pop(next_to_write)
+            samples_before = assembler.total_samples
+            data = assembler.append(audio)
+            assembler.file.flush()
+            written = segments[next_to_write]
+            chapters.add_line(next_to_write, written["speaker_name"], written["text"],
+                              assembler, len(data), samples_before, words)
+            if audio_stream:
+                audio_stream.append(data)
+            next_to_write += 1
+
+        # Update progress as segments actually finish
+        if progress_callback:
+            # Accelerate progress - use a curve that moves faster initially
+            progress_ratio = completed / total_segments
+            accelerated_ratio = min(1.0, progress_ratio * PROGRESS_ACCELERATION)
+            overall_progress = PROGRESS_START + int(accelerated_ratio * (PROGRESS_END - PROGRESS_START))
+            # Keep 98-100% for the final mixing messages
+            overall_progress = min(overall_progress, 97)
+            speaker_name = segment["speaker_name"]
+            # Create dynamic, engaging messages
+            messages = [
+                f"🎙️ Recorded {speaker_name}'s voice ({completed}/{total_segments})",
+                f"🎵 Synthesized audio for {speaker_name} ({completed}/{total_segments})",
+                f"🎬 Brought {speaker_name}'s words to life ({completed}/{total_segments})",
+                f"✅ {speaker_name}'s segment is ready! ({completed}/{total_segments})",
+            ]
+            progress_callback(overall_progress, 100, messages[completed % len(messages)])
+
+    # MP3 frames are joined directly since pydub needs ffmpeg
+    async def script_lines():
+        if streaming:
+            async for line in script:
+                yield line
+        else:
+            for line in script:
+                yield line
+
     with open(output_file, 'wb') as final_mp3:
-        for i, line in enumerate(script):
-            speaker = line.get("speaker", "").lower()
-            text = line.get("text", "")
-            
-            # Preprocess text for natural TTS
-            spoken_text = preprocess_text_for_tts(text)
-            
-            # Gen-Z Prosody Settings: Faster, more dynamic
-            # Base speed increased (~1.15x equivalent via rate percentage)
-            rate_variation = random.randint(-2, 5) # Skew towards faster
-            pitch_variation = random.randint(-2, 4)
-            
-            # Short energetic reactions should be even faster
-            is_short_reaction = len(text.split()) < 5
-            
-            # Determine speaker and create engaging message
-            if "priya" in speaker:
-                voice = VOICE_FEMALE
-                # Priya: Gen-Z energetic girl
-                # Rate boosted to ~+20-25% for that fast pitter-patter style
-                base_rate = 20 + rate_variation
-                if is_short_reaction: base_rate += 10
-                
-                base_pitch = 4 + pitch_variation
-                
-                rate = f"+{base_rate}%"
-                pitch = f"+{base_pitch}Hz" if base_pitch >= 0 else f"{base_pitch}Hz"
-                speaker_name = "Priya"
-                print(f"Priya: {text[:40]}...")
+        assembler = Mp3Assembler(final_mp3)
+        tasks = []
+        # Set by the first segment that fails, so the episode stops right away
+        # instead of after the rest of a streaming script has been written
+        failure = asyncio.get_running_loop().create_future()
+
+        def on_segment_done(task):
+            if not task.cancelled() and task.exception() is not None and not failure.done():
+                failure.set_exception(task.exception())
+
+        async def queue_segments():
+            async for line in script_lines():
+                segment = prepare_segment(line)
+                segments.append(segment)
+                task = asyncio.create_task(synthesize_segment(len(segments) - 1, segment, assembler))
+                task.add_done_callback(on_segment_done)
+                tasks.append(task)
+
+        feeder = asyncio.create_task(queue_segments())
+        try:
+            await asyncio.wait({feeder, failure}, return_when=asyncio.FIRST_COMPLETED)
+            if failure.done():
+                raise failure.exception()
+            feeder.result()
+            total_segments = len(segments)
+            await asyncio.gather(*tasks)
+        except BaseException as e:
+            if audio_stream:
+                audio_stream.close(error=str(e) or type(e).__name__)
+            raise
+        finally:
+            # Don't leave the feed or other segments running if one of them failed
+            feeder.cancel()
+            for task in tasks:
+                task.cancel()
+            if failure.done():
+                failure.exception()  # retrieved, even when gather raised it first
             else:
-                voice = VOICE_MALE
-                # Amit: Fast-paced guy
-                # Rate boosted to ~+15-20%
-                base_rate = 15 + rate_variation
-                if is_short_reaction: base_rate += 10
-                
-                base_pitch = -2 + pitch_variation
-                
-                rate = f"+{base_rate}%"
-                pitch = f"+{base_pitch}Hz" if base_pitch >= 0 else f"{base_pitch}Hz"
-                speaker_name = "Amit"
-                print(f"Amit:  {text[:40]}...")
-            
-            # Update progress before generating segment
-            if progress_callback:
-                segment_progress = i + 1
-                # Accelerate progress - use a curve that moves faster initially
-                progress_ratio = segment_progress / total_segments
-                # Apply acceleration curve: faster progress early on
-                accelerated_ratio = min(1.0, progress_ratio * PROGRESS_ACCELERATION)
-                overall_progress = PROGRESS_START + int(accelerated_ratio * (PROGRESS_END - PROGRESS_START))
-                # Ensure we don't exceed 100%
-                overall_progress = min(overall_progress, 100)
-                # Create dynamic, engaging messages
-                messages = [
-                    f"🎙️ Recording {speaker_name}'s voice...",
-                    f"🎵 Synthesizing audio for {speaker_name}...",
-                    f"🎬 Bringing {speaker_name}'s words to life...",
-                    f"🎧 Crafting {speaker_name}'s dialogue...",
-                ]
-                message = messages[i % len(messages)]
-                progress_callback(overall_progress, 100, message)
-                await asyncio.sleep(0.02)  # Reduced delay for faster updates
-            
-            filename = f"{OUTPUT_DIR}/seg_{i}.mp3"
-            await generate_audio_segment(spoken_text, voice, filename, rate=rate, pitch=pitch)
-            temp_files.append(filename)
-            
-            # Simple binary concatenation for MP3
-            with open(filename, 'rb') as segment_file:
-                final_mp3.write(segment_file.read())
-            
-            # Update progress after segment is written
-            if progress_callback:
-                segment_progress = i + 1
-                # Use same acceleration curve
-                progress_ratio = segment_progress / total_segments
-                accelerated_ratio = min(1.0, progress_ratio * PROGRESS_ACCELERATION)
-                overall_progress = PROGRESS_START + int(accelerated_ratio * (PROGRESS_END - PROGRESS_START))
-                overall_progress = min(overall_progress, 100)
-                if segment_progress < total_segments:
-                    progress_callback(overall_progress, 100, f"✅ {speaker_name}'s segment is ready!")
-                    await asyncio.sleep(0.02)  # Reduced delay for faster updates
-        
+                failure.cancel()
+        assembler.finish()
+
+    if audio_stream:
+        audio_stream.close()
+
     if progress_callback:
         progress_callback(98, 100, "🎚️ Mixing final audio...")
         await asyncio.sleep(0.1)
@@ -414,27 +601,36 @@ async def synthesize_podcast(script, output_file, progress_callback=None):
     if progress_callback:
         progress_callback(100, 100, "🎉 Podcast ready!")
     
-    print(f"\n✅ Podcast saved to {output_file}")
-    
-    # Cleanup
-    for f in temp_files:
-        if os.path.exists(f):
-            os.remove(f)
+    print(f"\n✅ Podcast audio assembled: {assembler.frame_count} frames, {assembler.duration:.1f}s")
+    return chapters.manifest(assembler)
 
 
-async def run_podcast_generation(topic: str, progress_callback=None) -> dict:
+async def run_podcast_generation(topic: str, progress_callback=None, audio_stream=None,
+                                 stage_callback=None, include_improvement_prompt=False,
+                                 stream_script=None) -> dict:
     """
     Programmatic entry point for podcast generation.
     Returns a dictionary with output file path and evaluation results.
+
+    The pipeline runs as a stage graph: content -> script -> {audio, evaluation},
+    and evaluation -> improvement_prompt. Critic evaluation (and the improvement
+    prompt) never hold back the audio. When the script is streamed, audio
+    starts on its first line instead of waiting for the script stage.
     
     Args:
         topic: Wikipedia topic to generate podcast about
         progress_callback: Optional callback function(current, total, message) for progress updates
+        audio_stream: Optional EpisodeStream that receives audio segments as they are synthesized
+        stage_callback: Optional callback function(stage, result) called as each stage completes
+        include_improvement_prompt: Also generate an improvement prompt from the evaluation
+        stream_script: Stream the script into synthesis (defaults to SCRIPT_STREAMING)
     
     Returns:
         dict: {
             "output_file": str - path to generated MP3,
-            "evaluation": dict - LLM critic evaluation results
+            "evaluation": dict - LLM critic evaluation results,
+            "improvement_prompt": dict | None - improvement prompt, if requested,
+            "timings": dict - seconds spent in each stage
         }
     """
     
@@ -447,76 +643,170 @@ async def run_podcast_generation(topic: str, progress_callback=None) -> dict:
     if progress_callback:
         progress_callback(0, 100, "Initializing podcast generation...")
         await asyncio.sleep(0.1)  # Small delay to ensure update is visible
-    
-    if progress_callback:
-        progress_callback(2, 100, "Researching topic on Wikipedia...")
-    
-    content = fetch_wikipedia_content(topic)
-    
-    if progress_callback:
-        progress_callback(8, 100, "Analyzing Wikipedia content...")
-        await asyncio.sleep(0.1)
+
+    if stream_script is None:
+        stream_script = SCRIPT_STREAMING
+    # Lines handed from the streaming script stage to the audio stage as they are written
+    feed = ScriptFeed() if stream_script else None
+
+    async def content_stage(results):
+        if progress_callback:
+            progress_callback(2, 100, "Researching topic on Wikipedia...")
         
-    if progress_callback:
-        progress_callback(12, 100, "Preparing script generation...")
-        await asyncio.sleep(0.1)
+        content = await fetch_wikipedia_content(topic)
         
-    if progress_callback:
-        progress_callback(15, 100, "Crafting Gen-Z Hinglish dialogue with AI...")
-    
-    print("📝 Generating script with Llama 3.3...")
-    script = generate_conversation_script(content, api_key)
-    
-    if not script:
-        raise ValueError("Failed to generate script from LLM.")
+        if progress_callback:
+            progress_callback(8, 100, "Analyzing Wikipedia content...")
+            await asyncio.sleep(0.1)
+        return content
 
-    # Post-processing: Deduplicate and trim
-    # Remove consecutive duplicate lines if any
-    filtered_script = []
-    if len(script) > 0:
-        filtered_script.append(script[0])
-        for i in range(1, len(script)):
-            if script[i].get("text") != script[i-1].get("text"):
-                filtered_script.append(script[i])
-    script = filtered_script
+    async def script_stage(results):
+        if progress_callback:
+            progress_callback(12, 100, "Preparing script generation...")
+            await asyncio.sleep(0.1)
+            
+        if progress_callback:
+            progress_callback(15, 100, "Crafting Gen-Z Hinglish dialogue with AI...")
+        
+        print("📝 Generating script with Llama 3.3...")
+        if feed is not None:
+            return await streamed_script(results["content"])
 
-    if progress_callback:
-        progress_callback(25, 100, f"Script ready! Generated {len(script)} dialogue segments.")
-        await asyncio.sleep(0.1)
+        script = await generate_conversation_script(results["content"], api_key)
+        
+        if not script:
+            raise ValueError("Failed to generate script from LLM.")
 
-    # Evaluate the script using LLM critic (Mixtral 8x7B)
-    if progress_callback:
-        progress_callback(27, 100, "🎯 Evaluating script quality with LLM critic...")
-    
-    print("🎯 Evaluating script with Qwen3-32B critic...")
-    evaluation = await evaluate_podcast_script(script, api_key)
-    
-    if evaluation and "error" not in evaluation:
-        print(format_evaluation_summary(evaluation))
-    else:
-        print("⚠️ Evaluation completed with warnings")
-    
-    if progress_callback:
-        progress_callback(30, 100, "Starting audio synthesis...")
-        await asyncio.sleep(0.2)
+        # Post-processing: Deduplicate and trim
+        script = remove_consecutive_duplicates(script)
+
+        if progress_callback:
+            progress_callback(25, 100, f"Script ready! Generated {len(script)} dialogue segments.")
+            await asyncio.sleep(0.1)
+        return script
 
-    output_file = f"{OUTPUT_DIR}/{topic.replace(' ', '_').lower()}.mp3"
-    await synthesize_podcast(script, output_file, progress_callback=progress_callback)
+    async def streamed_script(content):
+        try:
+            async for line in stream_conversation_script(content, api_key):
+                if not feed.lines and progress_callback:
+                    progress_callback(25, 100, "First lines are in! Recording while the script is written...")
+                feed.put(line)
+            if not feed.lines:
+                # Nothing parseable came through the stream: ask again in JSON mode
+                print("⚠️ Streamed script had no dialogue lines, retrying without streaming")
+                for line in remove_consecutive_duplicates(await generate_conversation_script(content, api_key)):
+                    feed.put(line)
+            if not feed.lines:
+                raise ValueError("Failed to generate script from LLM.")
+        except Exception as e:
+            feed.close(error=e)
+            raise
+        feed.close()
+        print(f"📝 Script streamed: {len(feed.lines)} dialogue segments")
+        return feed.lines
+
+    async def local_score_stage(results):
+        # Computed once: shown as the preliminary score and reused by the critic gate
+        return score_script_locally(results["script"])
+
+    async def evaluation_stage(results):
+        # Runs alongside audio synthesis, so it reports through logs only
+        print("🎯 Evaluating script with Qwen3-32B critic...")
+        local = results["local_score"]
+        evaluation = await evaluate_podcast_script(results["script"], api_key, local=None if "error" in local else local)
+        
+        if evaluation and "error" not in evaluation:
+            print(format_evaluation_summary(evaluation))
+        else:
+            print("⚠️ Evaluation completed with warnings")
+        return evaluation
+
+    async def audio_stage(results):
+        if feed is not None:
+            # Synthesis starts on the first streamed line, not the finished script
+            await feed.wait_started()
+        if progress_callback:
+            progress_callback(30, 100, "Starting audio synthesis...")
+            await asyncio.sleep(0.2)
+
+        # Written to a private temp file, then published under a content-addressed name
+        store = get_artifact_store()
+        tmp_path = store.create_temp()
+        try:
+            manifest = await synthesize_podcast(feed if feed is not None else results["script"], tmp_path, progress_callback=progress_callback, audio_stream=audio_stream)
+            with span("publish"):
+                artifact = await asyncio.to_thread(store.publish, tmp_path, slugify(topic), topic=topic)
+                manifest["audio"] = artifact["name"]
+                store.attach_json(artifact["name"], "chapters", manifest)
+        except BaseException:
+            store.discard(tmp_path)
+            raise
+        print(f"📦 Published {artifact['name']}")
+        return store.path(artifact["name"])
+
+    async def improvement_prompt_stage(results):
+        evaluation = results["evaluation"]
+        if not evaluation or evaluation.get("error") or evaluation.get("source") == "local":
+            return None
+        print("🚀 Generating improvement prompt with GPT-OSS 120B...")
+        return await generate_improvement_prompt(evaluation, api_key)
+
+    graph = StageGraph()
+    graph.add("content", content_stage)
+    graph.add("script", script_stage, deps=["content"])
+    # The critic side is optional: a failure there becomes an error result, never a lost episode
+    graph.add("local_score", local_score_stage, deps=["script"], optional=True)
+    graph.add("evaluation", evaluation_stage, deps=["local_score"], optional=True)
+    graph.add("audio", audio_stage, deps=["content"] if feed is not None else ["script"])
+    if include_improvement_prompt:
+        graph.add("improvement_prompt", improvement_prompt_stage, deps=["evaluation"], optional=True)
+
+    with span("pipeline"):
+        results = await graph.run(on_stage_complete=stage_callback)
     
     return {
-        "output_file": output_file,
-        "evaluation": evaluation
+        "output_file": results["audio"],
+        "evaluation": results["evaluation"],
+        "improvement_prompt": results.get("improvement_prompt"),
+        "timings": graph.timings
     }
 
 async def main():
     parser = argparse.ArgumentParser(description="Generate a synthetic Hinglish radio podcast")
-    parser.add_argument("topic", help="Wikipedia topic to generate podcast about")
+    parser.add_argument("topic", nargs="?", help="Wikipedia topic to generate podcast about")
+    parser.add_argument("--batch", metavar="FILE", help="Generate every topic in FILE (one per line, '-' for stdin)")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="Topics generated at the same time in batch mode")
+    parser.add_argument("--manifest", help="Batch manifest/checkpoint (default: FILE.manifest.jsonl)")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start a new manifest")
+    parser.add_argument("--improvement-prompt", action="store_true", help="Also generate improvement prompts in batch mode")
+    parser.add_argument("--quiet", action="store_true", help="Only print one line per topic in batch mode")
     args = parser.parse_args()
 
-    result = await run_podcast_generation(args.topic)
-    if not result:
-        sys.exit(1)
+    try:
+        if args.batch:
+            summary = await run_batch(
+                read_topics(args.batch),
+                run_podcast_generation,
+                args.manifest or default_manifest_path(args.batch),
+                concurrency=args.concurrency,
+                resume=not args.restart,
+                include_improvement_prompt=args.improvement_prompt,
+                quiet=args.quiet,
+            )
+            if summary["failed"]:
+                sys.exit(1)
+            return
+
+        if not args.topic:
+            parser.error("a topic or --batch FILE is required")
+
+        result = await run_podcast_generation(args.topic)
+        if not result:
+            sys.exit(1)
+    finally:
+        # Pooled connections have to be closed while their event loop still runs
+        await aclose_llm_clients()
+        await get_wikipedia_client().aclose()
 
 if __name__ == "__main__":
-    import sys
     asyncio.run(main())
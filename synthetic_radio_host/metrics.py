@@ -0,0 +1,213 @@
+"""
+Pipeline Metrics
+
+This module is a small Prometheus-compatible metrics registry. It provides
+counters, gauges and histograms with labels, rendered in the text
+exposition format served by `/metrics`. Stages are measured with `span()`,
+which records latency, in-flight count and errors in one place. That shows
+which stage (Wikipedia fetch, script LLM call, critic call, each TTS
+segment, publishing, improvement prompt) is driving tail latency.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+
+# Seconds; covers a cached segment (ms) up to a slow reasoning model (minutes)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    """Base class: a named family of time series keyed by label values."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for key, value in sorted(self._series.items()):
+                lines.extend(self._render_series(key, value))
+        return lines
+
+    def _render_series(self, key, value) -> List[str]:
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._series.get(self._key(labels), 0)
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._series.get(self._key(labels), 0)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][index] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+
+    def _render_series(self, key, series) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, series["counts"]):
+            cumulative += count
+            labels = _format_labels(self.label_names, key, f'le="{_format_value(bound)}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.label_names, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(series['sum'])}")
+        lines.append(f"{self.name}_count{labels} {series['count']}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_DURATION = REGISTRY.register(Histogram(
+    "srh_stage_duration_seconds", "Wall time of pipeline stages.", ["stage"]))
+STAGE_IN_FLIGHT = REGISTRY.register(Gauge(
+    "srh_stage_in_flight", "Stage executions currently running.", ["stage"]))
+STAGE_ERRORS = REGISTRY.register(Counter(
+    "srh_stage_errors_total", "Stage executions that raised, by exception type.", ["stage", "error"]))
+
+UPSTREAM_REQUESTS = REGISTRY.register(Counter(
+    "srh_upstream_requests_total", "Calls to upstream services by outcome (ok or error).", ["service", "outcome"]))
+UPSTREAM_DURATION = REGISTRY.register(Histogram(
+    "srh_upstream_request_duration_seconds", "Latency of upstream calls, including client retries.", ["service"]))
+RETRIES = REGISTRY.register(Counter(
+    "srh_retries_total", "Upstream requests that were retried.", ["service"]))
+HEDGES = REGISTRY.register(Counter(
+    "srh_hedged_requests_total", "Duplicate requests sent because the first was slow.", ["service"]))
+
+CACHE_LOOKUPS = REGISTRY.register(Counter(
+    "srh_cache_lookups_total", "Cache lookups by cache and result.", ["cache", "result"]))
+
+JOBS = REGISTRY.register(Gauge(
+    "srh_jobs", "Jobs currently queued or running.", ["state"]))
+JOBS_FINISHED = REGISTRY.register(Counter(
+    "srh_jobs_finished_total", "Jobs by final status.", ["status"]))
+JOBS_REJECTED = REGISTRY.register(Counter(
+    "srh_jobs_rejected_total", "Generate requests rejected because the queue was full."))
+
+
+@contextmanager
+def span(stage: str):
+    """Time a block as `stage`: latency histogram, in-flight gauge and error counter."""
+    STAGE_IN_FLIGHT.inc(stage=stage)
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        STAGE_ERRORS.inc(stage=stage, error=type(e).__name__)
+        raise
+    finally:
+        STAGE_DURATION.observe(time.perf_counter() - started, stage=stage)
+        STAGE_IN_FLIGHT.dec(stage=stage)
+
+
+@contextmanager
+def upstream_call(service: str):
+    """Time one upstream call and count it as ok or error (cancelled calls are not counted)."""
+    started = time.perf_counter()
+    outcome = None
+    try:
+        yield
+        outcome = "ok"
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        if outcome:
+            UPSTREAM_REQUESTS.inc(service=service, outcome=outcome)
+            UPSTREAM_DURATION.observe(time.perf_counter() - started, service=service)
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    return REGISTRY.render()
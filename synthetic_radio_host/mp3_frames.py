@@ -0,0 +1,262 @@
+"""
+MP3 Frame Parser and Episode Assembler
+
+This module walks MPEG audio frame headers without decoding audio. Every
+edge-tts segment is a complete MP3 file, and it may start with an ID3 tag
+or a Xing/Info/VBRI frame. Concatenating the raw files leaves that
+metadata in the middle of the episode, and players then misreport
+duration and scan the file to seek.
+
+`Mp3Assembler` keeps only the audio frames of each segment. It writes a
+single Xing header at the start of the episode, carrying the total frame
+count, byte count and a 100-entry seek table. The resulting frame index
+(offset, length and sample count of every frame) is kept for reuse.
+"""
+
+import struct
+from typing import BinaryIO, List, NamedTuple, Optional
+
+
+# Layer III bitrates in kbps, by bitrate index
+BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+
+# Sample rates in Hz, by MPEG version bits (00 = 2.5, 10 = 2, 11 = 1)
+SAMPLE_RATES = {
+    0b00: (11025, 12000, 8000),
+    0b10: (22050, 24000, 16000),
+    0b11: (44100, 48000, 32000),
+}
+
+CHANNEL_MODE_MONO = 0b11
+
+XING_FLAGS = 0x0001 | 0x0002 | 0x0004  # frames, bytes, TOC
+TOC_ENTRIES = 100
+
+
+class FrameHeader(NamedTuple):
+    """Decoded 4-byte MPEG-1/2/2.5 Layer III frame header."""
+    raw: int
+    mpeg1: bool
+    bitrate: int       # kbps
+    sample_rate: int   # Hz
+    padding: int
+    mono: bool
+    frame_length: int  # bytes, including the header
+    samples: int       # samples per frame
+
+    @property
+    def side_info_size(self) -> int:
+        if self.mpeg1:
+            return 17 if self.mono else 32
+        return 9 if self.mono else 17
+
+
+class Frame(NamedTuple):
+    """One audio frame in a byte buffer."""
+    offset: int
+    length: int
+    samples: int
+
+
+def parse_frame_header(data: bytes, offset: int = 0) -> Optional[FrameHeader]:
+    """Decode the Layer III frame header at `offset`, or return None if there isn't one."""
+    if offset + 4 > len(data):
+        return None
+    raw = struct.unpack_from(">I", data, offset)[0]
+    if raw >> 21 != 0x7FF:
+        return None
+    version = (raw >> 19) & 0b11
+    layer = (raw >> 17) & 0b11
+    bitrate_index = (raw >> 12) & 0b1111
+    rate_index = (raw >> 10) & 0b11
+    # Reserved version, non-Layer III, free-format/bad bitrate, reserved sample rate
+    if version == 0b01 or layer != 0b01 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == 0b11
+    bitrate = (BITRATES_V1 if mpeg1 else BITRATES_V2)[bitrate_index]
+    sample_rate = SAMPLE_RATES[version][rate_index]
+    padding = (raw >> 9) & 1
+    coefficient = 144 if mpeg1 else 72
+    return FrameHeader(
+        raw=raw,
+        mpeg1=mpeg1,
+        bitrate=bitrate,
+        sample_rate=sample_rate,
+        padding=padding,
+        mono=((raw >> 6) & 0b11) == CHANNEL_MODE_MONO,
+        frame_length=coefficient * bitrate * 1000 // sample_rate + padding,
+        samples=1152 if mpeg1 else 576,
+    )
+
+
+def id3v2_size(data: bytes, offset: int = 0) -> int:
+    """Size of the ID3v2 tag at `offset` (0 if there is none)."""
+    if data[offset:offset + 3] != b"ID3" or offset + 10 > len(data):
+        return 0
+    size_bytes = data[offset + 6:offset + 10]
+    # Sync-safe integer: 7 bits per byte
+    size = 0
+    for byte in size_bytes:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if data[offset + 5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def is_info_frame(data: bytes, offset: int, header: FrameHeader) -> bool:
+    """True if the frame at `offset` carries a Xing/Info or VBRI header instead of audio."""
+    tag_offset = offset + 4 + header.side_info_size
+    if data[tag_offset:tag_offset + 4] in (b"Xing", b"Info"):
+        return True
+    return data[offset + 36:offset + 40] == b"VBRI"
+
+
+def index_frames(data: bytes) -> List[Frame]:
+    """
+    Find the audio frames in one MP3 file.
+
+    ID3v2 tags, Xing/Info/VBRI frames, a trailing ID3v1 tag and any bytes
+    that don't belong to a frame are skipped.
+
+    Returns:
+        Audio frames in stream order
+    """
+    end = len(data)
+    if end >= 128 and data[end - 128:end - 125] == b"TAG":
+        end -= 128
+
+    frames: List[Frame] = []
+    offset = 0
+    while offset < end:
+        tag_size = id3v2_size(data, offset)
+        if tag_size:
+            offset += tag_size
+            continue
+
+        header = parse_frame_header(data, offset)
+        if header is None or offset + header.frame_length > end:
+            # Lost sync: move on to the next possible frame start
+            offset = data.find(b"\xff", offset + 1, end)
+            if offset < 0:
+                break
+            continue
+
+        if not is_info_frame(data, offset, header):
+            frames.append(Frame(offset, header.frame_length, header.samples))
+        offset += header.frame_length
+    return frames
+
+
+def build_toc(frame_offsets: List[int], total_bytes: int) -> bytes:
+    """
+    Build the 100-entry Xing seek table.
+
+    Entry i is the byte position of i% of the playing time, scaled to 0-255
+    of the file size. Frames are of equal duration, so i% of the time is
+    i% of the frames.
+    """
+    if not frame_offsets or not total_bytes:
+        return bytes(TOC_ENTRIES)
+    toc = bytearray()
+    for i in range(TOC_ENTRIES):
+        frame = min(len(frame_offsets) - 1, i * len(frame_offsets) // TOC_ENTRIES)
+        toc.append(min(255, frame_offsets[frame] * 256 // total_bytes))
+    return bytes(toc)
+
+
+def build_xing_frame(template: FrameHeader, frame_count: int, byte_count: int, toc: bytes) -> bytes:
+    """
+    Build a silent frame carrying a Xing header, in the same format as `template`.
+
+    The bitrate is raised if the template's frame is too small to hold the
+    header; padding is always off so the frame size stays fixed.
+    """
+    xing_offset = 4 + template.side_info_size
+    needed = xing_offset + 4 + 4 + 4 + 4 + TOC_ENTRIES
+    bitrates = BITRATES_V1 if template.mpeg1 else BITRATES_V2
+
+    raw = template.raw & ~(1 << 9)  # no padding
+    header = None
+    for bitrate_index in range(1, 15):
+        if bitrates[bitrate_index] < template.bitrate:
+            continue
+        candidate = parse_frame_header(struct.pack(">I", (raw & ~(0b1111 << 12)) | (bitrate_index << 12)))
+        if candidate.frame_length >= needed:
+            header = candidate
+            break
+    if header is None:
+        raise ValueError("No bitrate is large enough for a Xing header")
+
+    frame = bytearray(header.frame_length)
+    struct.pack_into(">I", frame, 0, header.raw)
+    frame[xing_offset:xing_offset + 4] = b"Xing"
+    struct.pack_into(">III", frame, xing_offset + 4, XING_FLAGS, frame_count, byte_count)
+    frame[xing_offset + 16:xing_offset + 16 + TOC_ENTRIES] = toc
+    return bytes(frame)
+
+
+class Mp3Assembler:
+    """
+    Writes segment MP3s into one file as a single clean frame stream.
+
+    Call `append` for each segment in order, then `finish` to fill in the
+    Xing header reserved at the start of the file. The output file must be
+    seekable.
+    """
+
+    def __init__(self, file: BinaryIO):
+        self.file = file
+        self.template: Optional[FrameHeader] = None
+        self.header_size = 0
+        # Absolute file offset of every audio frame
+        self.frame_offsets: List[int] = []
+        self.total_samples = 0
+        self.size = 0
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.frame_offsets)
+
+    @property
+    def duration(self) -> float:
+        """Playing time in seconds."""
+        return self.total_samples / self.template.sample_rate if self.template else 0.0
+
+    def append(self, segment: bytes) -> bytes:
+        """
+        Append one segment's audio frames.
+
+        Returns:
+            The bytes written for this segment, without its metadata
+        """
+        frames = index_frames(segment)
+        if not frames:
+            return b""
+
+        if self.template is None:
+            # Reserve room for the Xing header; its contents are known only at the end
+            self.template = parse_frame_header(segment, frames[0].offset)
+            placeholder = build_xing_frame(self.template, 0, 0, bytes(TOC_ENTRIES))
+            self.file.write(placeholder)
+            self.header_size = self.size = len(placeholder)
+
+        audio = bytearray()
+        for frame in frames:
+            self.frame_offsets.append(self.size + len(audio))
+            audio += segment[frame.offset:frame.offset + frame.length]
+            self.total_samples += frame.samples
+        self.file.write(audio)
+        self.size += len(audio)
+        return bytes(audio)
+
+    def finish(self):
+        """Write the final Xing header over the placeholder."""
+        if self.template is None:
+            return
+        toc = build_toc(self.frame_offsets, self.size)
+        header = build_xing_frame(self.template, self.frame_count, self.size, toc)
+        position = self.file.tell()
+        self.file.seek(0)
+        self.file.write(header)
+        self.file.seek(position)
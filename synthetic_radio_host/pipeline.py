@@ -0,0 +1,88 @@
+"""
+Pipelined Stage Scheduler
+
+This module runs the podcast pipeline as a small dependency graph instead
+of a fixed sequence. Each stage starts as soon as the stages it depends on
+have finished, so independent stages (e.g. critic evaluation and audio
+synthesis, which both only need the script) run at the same time. Every
+stage's result is handed to a callback the moment it completes, and every
+stage is recorded as a metrics span under its name. Optional stages (the
+critic side) can fail without taking the rest of the pipeline down.
+"""
+
+import time
+import asyncio
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Set
+
+from metrics import span
+
+
+class StageGraph:
+    """A set of async stages wired together by their dependencies."""
+
+    def __init__(self):
+        # name -> (func, deps); insertion order must already be topological
+        self.stages: Dict[str, tuple] = {}
+        self.optional: Set[str] = set()
+        self.results: Dict[str, object] = {}
+        self.timings: Dict[str, float] = {}
+
+    def add(self, name: str, func: Callable[[dict], Awaitable], deps: Iterable[str] = (), optional: bool = False):
+        """
+        Register a stage.
+
+        Args:
+            name: Unique stage name, also the key of its result
+            func: Coroutine function called with the results of all finished stages
+            deps: Names of stages that must finish first (must already be added)
+            optional: If the stage raises, its result becomes {"error": ...}
+                instead of failing the whole run
+        """
+        deps = tuple(deps)
+        for dep in deps:
+            if dep not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+        self.stages[name] = (func, deps)
+        if optional:
+            self.optional.add(name)
+
+    async def run(self, on_stage_complete: Optional[Callable[[str, object], None]] = None) -> dict:
+        """
+        Run every stage, each as soon as its dependencies are done.
+
+        If a required stage raises, the stages still running are cancelled and
+        the exception propagates. An optional stage that raises is recorded
+        (and reported) as {"error": message}; stages depending on it still run.
+
+        Returns:
+            dict mapping stage name to its result
+        """
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_stage(name, func, deps):
+            if deps:
+                await asyncio.gather(*(tasks[dep] for dep in deps))
+            started = time.perf_counter()
+            try:
+                with span(name):
+                    result = await func(self.results)
+            except Exception as e:
+                if name not in self.optional:
+                    raise
+                print(f"⚠️ Stage '{name}' failed, continuing without it: {e}")
+                result = {"error": str(e)}
+            self.timings[name] = round(time.perf_counter() - started, 3)
+            self.results[name] = result
+            if on_stage_complete:
+                on_stage_complete(name, result)
+            return result
+
+        for name, (func, deps) in self.stages.items():
+            tasks[name] = asyncio.create_task(run_stage(name, func, deps), name=f"stage:{name}")
+
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        return self.results
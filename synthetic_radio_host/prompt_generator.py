@@ -4,11 +4,15 @@ Improvement Prompt Generator for Hinglish Podcast
 This module generates AI-assistant-style improvement prompts using XML structure.
 The prompts are designed to be used with any AI assistant (ChatGPT, Claude, Gemini, etc.)
 rather than being code-specific. Uses GPT-OSS 120B for prompt generation.
+Prompts are memoized by a fingerprint of the evaluation's scores (see
+llm_cache.py) together with the model and prompts (see prompt_cache_key), so
+evaluations that score the same reuse one prompt.
 """
 
 import json
-import httpx
-from groq import Groq
+import asyncio
+from llm_client import create_chat_completion
+from llm_cache import canonical_hash, evaluation_fingerprint, get_llm_cache
 
 
 # Project context - conceptual description (no specific file/function names)
@@ -116,6 +120,35 @@ IMPORTANT GUIDELINES:
 """
 
 
+PROMPT_MODEL = "openai/gpt-oss-120b"
+
+PROMPT_SYSTEM_PROMPT = """You are an expert prompt engineer specializing in natural language and conversational AI. Your task is to generate a well-structured, AI-assistant-compatible prompt for improving a Hinglish podcast generation system.
+
+CRITICAL RULES:
+1. DO NOT include any file names (like main.py, server.py, etc.)
+2. DO NOT include any function names (like generate_script(), preprocess(), etc.)
+3. DO NOT include any code snippets or implementation details
+4. Focus ONLY on conceptual improvements and desired outcomes
+
+Your output should be a SINGLE XML-structured prompt that:
+1. Uses clear XML tags to organize sections (<objective>, <context>, <improvements>, <constraints>, <examples>)
+2. Describes improvements in natural language that any AI assistant can understand
+3. Includes specific examples of desired Hinglish dialogue patterns
+4. Prioritizes improvements based on evaluation scores
+5. Preserves what's working well (listed strengths)
+
+The generated prompt should be suitable for pasting directly into ChatGPT, Claude, Gemini, or any AI coding assistant.
+
+IMPORTANT: Output ONLY the improvement prompt itself in XML format. No thinking process, no meta-commentary, no code references."""
+
+
+def prompt_cache_key(evaluation: dict) -> str:
+    """Cache key for an evaluation's prompt; the model and prompts are included so editing them invalidates it."""
+    return canonical_hash(
+        PROMPT_MODEL, PROMPT_SYSTEM_PROMPT, generate_improvement_prompt_template({}), evaluation_fingerprint(evaluation)
+    )
+
+
 async def generate_improvement_prompt(evaluation: dict, api_key: str) -> dict:
     """
     Generate a detailed improvement prompt using GPT-OSS 120B.
@@ -126,6 +159,7 @@ async def generate_improvement_prompt(evaluation: dict, api_key: str) -> dict:
         
     Returns:
         Dictionary with the generated prompt and metadata
+        ("cached": True when it was served from the prompt cache)
     """
     if not evaluation or evaluation.get("error"):
         return {
@@ -133,38 +167,31 @@ async def generate_improvement_prompt(evaluation: dict, api_key: str) -> dict:
             "error": "Missing evaluation data",
             "model_used": None
         }
+    if evaluation.get("source") == "local":
+        # Heuristic scores (information_accuracy is a fixed 3) aren't worth a 120B call or a cache entry
+        return {
+            "prompt": "Unable to generate improvement prompt: the script was only scored by the local heuristic.",
+            "error": "Local heuristic evaluation",
+            "model_used": None
+        }
     
+    cache = get_llm_cache()
+    cache_key = prompt_cache_key(evaluation)
+    if cache is not None:
+        cached = await asyncio.to_thread(cache.get, "improvement_prompt", cache_key)
+        if cached is not None:
+            cached["cached"] = True
+            return cached
+
     try:
-        # Create a custom HTTP client that ignores SSL errors
-        http_client = httpx.Client(verify=False)
-        client = Groq(api_key=api_key, http_client=http_client)
-        
         user_prompt = generate_improvement_prompt_template(evaluation)
         
-        system_prompt = """You are an expert prompt engineer specializing in natural language and conversational AI. Your task is to generate a well-structured, AI-assistant-compatible prompt for improving a Hinglish podcast generation system.
-
-CRITICAL RULES:
-1. DO NOT include any file names (like main.py, server.py, etc.)
-2. DO NOT include any function names (like generate_script(), preprocess(), etc.)
-3. DO NOT include any code snippets or implementation details
-4. Focus ONLY on conceptual improvements and desired outcomes
-
-Your output should be a SINGLE XML-structured prompt that:
-1. Uses clear XML tags to organize sections (<objective>, <context>, <improvements>, <constraints>, <examples>)
-2. Describes improvements in natural language that any AI assistant can understand
-3. Includes specific examples of desired Hinglish dialogue patterns
-4. Prioritizes improvements based on evaluation scores
-5. Preserves what's working well (listed strengths)
-
-The generated prompt should be suitable for pasting directly into ChatGPT, Claude, Gemini, or any AI coding assistant.
-
-IMPORTANT: Output ONLY the improvement prompt itself in XML format. No thinking process, no meta-commentary, no code references."""
-        
         # Use GPT-OSS 120B - OpenAI's flagship open-weight model, different from Llama 3.3 and Qwen3
-        completion = client.chat.completions.create(
-            model="openai/gpt-oss-120b",
+        completion = await create_chat_completion(
+            api_key,
+            model=PROMPT_MODEL,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": PROMPT_SYSTEM_PROMPT},
                 {"role": "user", "content": user_prompt}
             ],
             temperature=0.6,  # Balanced creativity and consistency
@@ -180,12 +207,15 @@ IMPORTANT: Output ONLY the improvement prompt itself in XML format. No thinking
             prompt_content = re.sub(r'<think>.*?</think>', '', prompt_content, flags=re.DOTALL)
             prompt_content = prompt_content.strip()
         
-        return {
+        result = {
             "prompt": prompt_content,
-            "model_used": "openai/gpt-oss-120b",
+            "model_used": PROMPT_MODEL,
             "based_on_score": evaluation.get("overall_score", 0),
             "error": None
         }
+        if cache is not None and prompt_content:
+            await asyncio.to_thread(cache.put, "improvement_prompt", cache_key, result)
+        return result
         
     except Exception as e:
         print(f"Error generating improvement prompt: {e}")
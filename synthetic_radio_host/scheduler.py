@@ -0,0 +1,176 @@
+"""
+Admission-Controlled Job Scheduler
+
+This module runs generation jobs on a fixed pool of workers instead of
+starting a new pipeline for every request. Jobs wait in a bounded priority
+queue. Once it is full, new submissions are rejected with a Retry-After
+hint instead of slowing every running job down. Queued jobs report their
+position and an ETA, and both queued and running jobs can be cancelled.
+Cancelling a running job cancels its task, which aborts the in-flight LLM
+and TTS requests and frees the worker slot.
+"""
+
+import os
+import math
+import time
+import heapq
+import asyncio
+import itertools
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+# Configuration
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "20"))
+# Starting guess for how long a job takes, until real durations are measured
+JOB_DURATION_ESTIMATE = float(os.getenv("JOB_DURATION_ESTIMATE", "60"))
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no room for another submission."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class JobScheduler:
+    """Fixed pool of workers fed from a bounded priority queue."""
+
+    def __init__(self, workers: int = JOB_WORKERS, max_queue: int = JOB_QUEUE_SIZE,
+                 on_queue_change: Optional[Callable[[], None]] = None):
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self.on_queue_change = on_queue_change
+        self.avg_duration = JOB_DURATION_ESTIMATE
+        # Heap of (-priority, sequence, job_id): higher priority first, FIFO within a priority
+        self._queue: List[tuple] = []
+        self._factories: Dict[str, Callable[[], Awaitable]] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._counter = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker_tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        """Start the worker pool on the running event loop."""
+        self._wakeup = asyncio.Event()
+        if self._queue:
+            self._wakeup.set()
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self):
+        """Stop the workers and cancel every running job."""
+        for task in self._worker_tasks + list(self._running.values()):
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, *self._running.values(), return_exceptions=True)
+        self._worker_tasks = []
+
+    def is_full(self) -> bool:
+        return len(self._queue) >= self.max_queue
+
+    def retry_after(self) -> int:
+        """Seconds until a worker is likely to free up a queue slot."""
+        return max(1, math.ceil(self.avg_duration / self.workers))
+
+    def submit(self, job_id: str, factory: Callable[[], Awaitable], priority: int = 0) -> int:
+        """
+        Queue a job.
+
+        Args:
+            job_id: Job identifier
+            factory: Called with no arguments to create the job's coroutine when a worker picks it up
+            priority: Higher runs first
+
+        Returns:
+            The job's 1-based queue position
+
+        Raises:
+            QueueFullError: if the queue is at capacity
+        """
+        if self.is_full():
+            raise QueueFullError(self.retry_after())
+        heapq.heappush(self._queue, (-priority, next(self._counter), job_id))
+        self._factories[job_id] = factory
+        if self._wakeup:
+            self._wakeup.set()
+        self._notify()
+        return self.position(job_id)
+
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based position in the queue, or None if the job isn't queued."""
+        for index, (_, _, queued_id) in enumerate(sorted(self._queue)):
+            if queued_id == job_id:
+                return index + 1
+        return None
+
+    def eta(self, job_id: str) -> Optional[float]:
+        """Estimated seconds until a queued job starts running."""
+        position = self.position(job_id)
+        if position is None:
+            return None
+        return round(math.ceil(position / self.workers) * self.avg_duration, 1)
+
+    def queue_info(self, job_id: str) -> dict:
+        return {"queue_position": self.position(job_id), "eta_seconds": self.eta(job_id)}
+
+    def queued_ids(self) -> List[str]:
+        return [job_id for _, _, job_id in sorted(self._queue)]
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """
+        Cancel a queued or running job.
+
+        Returns:
+            "queued" or "running" depending on where the job was, or None if unknown
+        """
+        for entry in self._queue:
+            if entry[2] == job_id:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._factories.pop(job_id, None)
+                self._notify()
+                return "queued"
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+            return "running"
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "running": len(self._running),
+            "queued": len(self._queue),
+            "max_queue": self.max_queue,
+            "avg_duration": round(self.avg_duration, 1),
+        }
+
+    def _notify(self):
+        if self.on_queue_change:
+            self.on_queue_change()
+
+    async def _worker(self):
+        while True:
+            while not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            _, _, job_id = heapq.heappop(self._queue)
+            factory = self._factories.pop(job_id)
+            self._notify()
+
+            started = time.monotonic()
+            task = asyncio.create_task(factory(), name=f"job:{job_id}")
+            self._running[job_id] = task
+            try:
+                # wait() rather than await: a cancelled job must not take the worker down with it
+                await asyncio.wait([task])
+            finally:
+                self._running.pop(job_id, None)
+
+            if not task.cancelled():
+                # Exponentially weighted moving average of job duration for ETAs
+                self.avg_duration = 0.8 * self.avg_duration + 0.2 * (time.monotonic() - started)
@@ -0,0 +1,177 @@
+"""
+Streaming Script Parsing
+
+This module lets audio synthesis start on the first dialogue line instead of
+waiting for the whole script completion:
+
+- `DialogueStreamParser` is an incremental JSON scanner. The script LLM's
+  output is fed to it token by token, and it hands back each dialogue object
+  (an element of the first array in the document) as soon as its closing
+  brace arrives.
+- `ScriptFeed` connects the script stage to the audio stage. Lines are
+  pushed in as they are parsed, and the audio stage iterates over them
+  while the rest of the script is still being written.
+"""
+
+import json
+import asyncio
+from typing import List, Optional
+
+
+class DialogueStreamParser:
+    """
+    Incremental parser for `{"conversation": [{...}, {...}]}` (or a bare `[{...}]`).
+
+    It tracks nesting and string state character by character, so braces
+    inside dialogue text don't confuse it. It only keeps the text of the
+    object currently being read. The dialogue array is the one under the
+    top-level "conversation" key; other arrays (e.g. "tags") are skipped.
+    A bare top-level array is accepted if its first element is an object.
+
+    Outside JSON, quotes are ignored, and a `{` or `[` only starts a document
+    if the next character fits (a key or `}` for an object, `{` for an
+    array). So prose the model writes around the JSON ("[laughs]",
+    "{topic}", an unmatched quote) doesn't derail it.
+    """
+
+    DIALOGUE_KEY = "conversation"
+
+    def __init__(self):
+        self.stack: List[str] = []
+        self.in_string = False
+        self.escaped = False
+        # A document was just opened from prose; its next character decides if it is JSON
+        self.checking = False
+        # Top-level object keys: whether a key comes next, the key being read, the last key read
+        self.expect_key = False
+        self.key_chars: Optional[List[str]] = None
+        self.key: Optional[str] = None
+        # Depth of the dialogue array once found
+        self.array_depth: Optional[int] = None
+        self.done = False
+        self.buffer: List[str] = []
+        self.capturing = False
+
+    def _open_document(self, ch: str):
+        self.stack = [ch]
+        self.checking = True
+        self.expect_key = ch == "{"
+        self.key = None
+        self.array_depth = 1 if ch == "[" else None
+
+    def feed(self, text: str) -> List[dict]:
+        """Consume the next piece of the completion; return the objects it completed."""
+        completed = []
+        for ch in text:
+            if self.done:
+                break
+
+            if not self.stack:
+                # Prose: only an opening bracket can start the document
+                if ch in "[{":
+                    self._open_document(ch)
+                continue
+
+            if self.checking and not ch.isspace():
+                self.checking = False
+                if ch not in ('"}' if self.stack[0] == "{" else "{"):
+                    # Not JSON after all; this character may open the real document
+                    self.stack = []
+                    self.array_depth = None
+                    if ch in "[{":
+                        self._open_document(ch)
+                    continue
+
+            if self.capturing:
+                self.buffer.append(ch)
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+                    if self.key_chars is not None:
+                        self.key = "".join(self.key_chars)
+                        self.key_chars = None
+                        self.expect_key = False
+                    continue
+                if self.key_chars is not None:
+                    self.key_chars.append(ch)
+                continue
+
+            top_level_object = len(self.stack) == 1 and self.stack[0] == "{"
+            if ch == '"':
+                self.in_string = True
+                if top_level_object and self.expect_key:
+                    self.key_chars = []
+            elif ch == "," and top_level_object:
+                self.expect_key = True
+                self.key = None
+            elif ch in "[{":
+                if ch == "[" and self.array_depth is None and top_level_object and self.key == self.DIALOGUE_KEY:
+                    self.array_depth = len(self.stack) + 1
+                self.stack.append(ch)
+                if ch == "{" and self.array_depth is not None and len(self.stack) == self.array_depth + 1:
+                    self.capturing = True
+                    self.buffer = ["{"]
+            elif ch in "]}":
+                self.stack.pop()
+                if self.capturing and ch == "}" and len(self.stack) == self.array_depth:
+                    self.capturing = False
+                    item = self._decode("".join(self.buffer))
+                    if item is not None:
+                        completed.append(item)
+                elif ch == "]" and self.array_depth is not None and len(self.stack) == self.array_depth - 1:
+                    # End of the dialogue array: the rest of the document is irrelevant
+                    self.done = True
+                elif not self.stack:
+                    # A document without dialogue ended; keep looking
+                    self.array_depth = None
+        return completed
+
+    @staticmethod
+    def _decode(raw: str) -> Optional[dict]:
+        try:
+            item = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+        return item if isinstance(item, dict) else None
+
+
+class ScriptFeed:
+    """Dialogue lines handed from the streaming script stage to the audio stage."""
+
+    def __init__(self):
+        self.lines: List[dict] = []
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._started = asyncio.Event()
+        self.error: Optional[BaseException] = None
+
+    def put(self, line: dict):
+        self.lines.append(line)
+        self._queue.put_nowait(line)
+        self._started.set()
+
+    def close(self, error: Optional[BaseException] = None):
+        """No more lines; with `error`, the consumer raises it instead of finishing."""
+        self.error = error
+        self._queue.put_nowait(None)
+        self._started.set()
+
+    async def wait_started(self):
+        """Wait for the first line (or the end of the script)."""
+        await self._started.wait()
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        while True:
+            line = await self._queue.get()
+            if line is None:
+                if self.error is not None:
+                    raise self.error
+                return
+            yield line
@@ -1,11 +1,14 @@
 import asyncio
+import time
 import uuid
 import os
+import hmac
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, BackgroundTasks, HTTPException
-from fastapi.responses import FileResponse, JSONResponse
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-import requests
+import httpx
 from pydantic import BaseModel
 from typing import Dict, Optional
 
@@ -13,21 +16,109 @@ from typing import Dict, Optional
 # We need to ensure main.py code is accessible. 
 # Since they are in the same directory, this import works.
 from main import run_podcast_generation, OUTPUT_DIR, WikipediaNotFoundError
-from prompt_generator import generate_improvement_prompt
+from audio_stream import EpisodeStream
+from llm_client import aclose_llm_clients
+from wikipedia_client import get_wikipedia_client, normalize_title
+from artifact_store import ARTIFACT_GC_INTERVAL, get_artifact_store
+from job_store import JobStore, JobNotFoundError, create_job_store
+from job_events import JobEventBroker, JOB_EVENTS_KEEPALIVE, format_sse
+from scheduler import JobScheduler
+from metrics import CACHE_LOOKUPS, JOBS as JOBS_GAUGE, JOBS_FINISHED, JOBS_REJECTED, render_metrics
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
 # --- Job Management ---
-# In-memory storage for job status
-# Structure: { job_id: { "status": "processing" | "completed" | "failed", "filename": str | None, "message": str } }
-JOBS: Dict[str, Dict] = {}
+# Persistent, bounded job status storage (SQLite by default, see job_store.py)
+# Job fields: status ("pending" | "processing" | "completed" | "failed" | "cancelled"), topic, topic_key,
+# message, filename, progress, evaluation, improvement_prompt, pending_stages
+JOBS: JobStore = create_job_store()
+
+# How often finished jobs past their retention are evicted
+JOB_EVICT_INTERVAL = int(os.getenv("JOB_EVICT_INTERVAL", "300"))
+
+# How long a finished episode is served again for the same topic (0 disables reuse)
+EPISODE_CACHE_TTL = int(os.getenv("EPISODE_CACHE_TTL", str(6 * 60 * 60)))
+
+# When set (e.g. "/protected-episodes/"), downloads are handed to the reverse proxy
+# with X-Accel-Redirect so it can sendfile() them; otherwise the ASGI server sends the file
+DOWNLOAD_ACCEL_PREFIX = os.getenv("DOWNLOAD_ACCEL_PREFIX", "")
+
+# Audio of jobs that are still running, for progressive playback via /api/stream
+STREAMS: Dict[str, EpisodeStream] = {}
+
+# Live job updates for /api/events subscribers
+EVENTS = JobEventBroker()
+
+# Progress ticks are published to listeners right away but merged per job and
+# written to the store at most every JOB_PROGRESS_FLUSH seconds
+JOB_PROGRESS_FLUSH = float(os.getenv("JOB_PROGRESS_FLUSH", "1.0"))
+PROGRESS_FIELDS = frozenset({"progress", "message"})
+PENDING_PROGRESS: Dict[str, dict] = {}
+
+# Generate requests attached to each queued or running job (the one that started it
+# plus every deduplicated one); cancelling only stops the job when the last one leaves
+ATTACHED: Dict[str, int] = {}
+
+def publish_queue_positions():
+    """Tell listeners of every queued job where it now stands in line."""
+    for job_id in SCHEDULER.queued_ids():
+        EVENTS.publish(job_id, SCHEDULER.queue_info(job_id))
+
+# Fixed worker pool with a bounded priority queue (see scheduler.py)
+SCHEDULER = JobScheduler(on_queue_change=publish_queue_positions)
+
+# Queue priority is decided by the server, never taken from the request body.
+# Trusted internal callers send JOB_PRIORITY_TOKEN in X-Internal-Token to run
+# ahead of public requests; with no token configured every job is equal.
+JOB_PRIORITY_TOKEN = os.getenv("JOB_PRIORITY_TOKEN", "")
+INTERNAL_PRIORITY = 10
 
 class GenerateRequest(BaseModel):
     topic: str
 
-app = FastAPI(title="Synthetic Radio Host API")
+def request_priority(request: Request) -> int:
+    """Queue priority for a generate request: higher only for trusted internal callers."""
+    token = request.headers.get("X-Internal-Token", "")
+    if JOB_PRIORITY_TOKEN and hmac.compare_digest(token.encode(), JOB_PRIORITY_TOKEN.encode()):
+        return INTERNAL_PRIORITY
+    return 0
+
+async def evict_jobs_periodically():
+    """Keep the job store bounded by dropping expired finished jobs."""
+    while True:
+        evicted = JOBS.evict_finished()
+        if evicted:
+            print(f"🧹 Evicted {evicted} finished jobs")
+        await asyncio.sleep(JOB_EVICT_INTERVAL)
+
+async def collect_artifacts_periodically():
+    """Keep published episodes within their age limit and disk quota."""
+    store = get_artifact_store()
+    while True:
+        removed = await asyncio.to_thread(store.collect_garbage)
+        if removed:
+            print(f"🧹 Removed {removed} old episodes")
+        await asyncio.sleep(ARTIFACT_GC_INTERVAL)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Jobs that were running when the previous process stopped can't resume
+    interrupted = JOBS.mark_interrupted()
+    if interrupted:
+        print(f"⚠️ Marked {interrupted} interrupted jobs as failed")
+    eviction_task = asyncio.create_task(evict_jobs_periodically())
+    gc_task = asyncio.create_task(collect_artifacts_periodically())
+    await SCHEDULER.start()
+    yield
+    await SCHEDULER.stop()
+    eviction_task.cancel()
+    gc_task.cancel()
+    await aclose_llm_clients()
+    await get_wikipedia_client().aclose()
+
+app = FastAPI(title="Synthetic Radio Host API", lifespan=lifespan)
 
 # Enable CORS for frontend development
 app.add_middleware(
@@ -38,6 +129,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def update_job(job_id: str, **fields):
+    """Write a partial job update and push the changed fields to listeners."""
+    if fields.keys() <= PROGRESS_FIELDS:
+        if job_id not in PENDING_PROGRESS:
+            asyncio.get_running_loop().call_later(JOB_PROGRESS_FLUSH, flush_progress, job_id)
+        PENDING_PROGRESS.setdefault(job_id, {}).update(fields)
+        EVENTS.publish(job_id, fields)
+        return
+    # Unwritten progress goes out with this update, so it can't land after it
+    JOBS.update(job_id, **{**PENDING_PROGRESS.pop(job_id, {}), **fields})
+    EVENTS.publish(job_id, fields)
+
+def flush_progress(job_id: str):
+    """Write a job's merged progress ticks, if a later update has not already."""
+    fields = PENDING_PROGRESS.pop(job_id, None)
+    if fields:
+        try:
+            JOBS.update(job_id, **fields)
+        except JobNotFoundError:
+            pass
+
+def current_job(job_id: str) -> Optional[dict]:
+    """The job record including progress that has not been written yet."""
+    job = JOBS.get(job_id)
+    if job is not None:
+        job.update(PENDING_PROGRESS.get(job_id, {}))
+    return job
+
+def audio_delivered(job_id: str) -> bool:
+    """Whether the job's audio is already out (or the job was evicted after it), so a failure must not overwrite it."""
+    job = JOBS.get(job_id)
+    return job is None or job["status"] == "completed"
+
 def progress_callback_factory(job_id: str):
     """Factory function to create a progress callback that updates job status."""
     def progress_callback(current: int, total: int, message: str):
@@ -45,133 +169,348 @@ def progress_callback_factory(job_id: str):
         # Ensure progress is within valid range
         progress_percent = max(0, min(100, progress_percent))
         
-        # Update job status atomically
-        if job_id in JOBS:
-            JOBS[job_id]["progress"] = progress_percent
-            JOBS[job_id]["message"] = message
-            # Ensure status remains "processing" during updates
-            if JOBS[job_id]["status"] == "pending":
-                JOBS[job_id]["status"] = "processing"
-            print(f"Job {job_id}: {progress_percent}% - {message}")
+        # Partial update: only the progress fields are written (merged, see update_job)
+        update_job(job_id, progress=progress_percent, message=message)
+        print(f"Job {job_id}: {progress_percent}% - {message}")
     return progress_callback
 
 async def processing_task(job_id: str, topic: str):
     """Background task to run the generation process."""
     try:
-        JOBS[job_id]["status"] = "processing"
-        JOBS[job_id]["message"] = "Starting generation..."
-        JOBS[job_id]["progress"] = 0
+        update_job(job_id, status="processing", message="Starting generation...", progress=0)
         
         # Create progress callback to update job status
         progress_cb = progress_callback_factory(job_id)
+
+        def on_stage_complete(stage: str, result):
+            """Attach each stage's result to the job as soon as it is ready."""
+            job = JOBS.get(job_id)
+            if job is None:
+                # Evicted after its audio completed; nobody can read late results any more
+                return
+            pending_stages = [s for s in job["pending_stages"] if s != stage]
+
+            if stage == "audio":
+                # Audio is downloadable right away, even if the critic is still running
+                if result and os.path.exists(result):
+                    update_job(
+                        job_id,
+                        status="completed",
+                        message="Podcast ready!",
+                        progress=100,
+                        filename=os.path.basename(result),
+                        pending_stages=pending_stages,
+                    )
+                    return
+            elif stage == "local_score" and not result.get("error"):
+                # Instant heuristic score, replaced when the critic's evaluation arrives
+                update_job(job_id, evaluation={**result, "preliminary": True}, pending_stages=pending_stages)
+                return
+            elif stage == "evaluation":
+                update_job(job_id, evaluation=result, pending_stages=pending_stages)
+                return
+            elif stage == "improvement_prompt":
+                update_job(job_id, improvement_prompt=result, pending_stages=pending_stages)
+                if result and not result.get("error"):
+                    print("✅ Improvement prompt generated successfully")
+                return
+            update_job(job_id, pending_stages=pending_stages)
         
-        # This function handles the whole pipeline and returns dict with output_file and evaluation
-        result = await run_podcast_generation(topic, progress_callback=progress_cb)
+        # This function handles the whole pipeline, including the improvement prompt
+        await run_podcast_generation(
+            topic,
+            progress_callback=progress_cb,
+            audio_stream=STREAMS.get(job_id),
+            stage_callback=on_stage_complete,
+            include_improvement_prompt=True,
+        )
         
-        if result and result.get("output_file") and os.path.exists(result["output_file"]):
-            JOBS[job_id]["status"] = "completed"
-            JOBS[job_id]["message"] = "Podcast ready!"
-            JOBS[job_id]["progress"] = 100
-            JOBS[job_id]["filename"] = os.path.basename(result["output_file"])
-            # Include evaluation results in job data
-            evaluation = result.get("evaluation", {})
-            JOBS[job_id]["evaluation"] = evaluation
-            
-            # Generate improvement prompt using DeepSeek R1
-            api_key = os.getenv("GROQ_API_KEY")
-            if api_key and evaluation and not evaluation.get("error"):
-                try:
-                    print("🚀 Generating improvement prompt with DeepSeek R1...")
-                    improvement_result = await generate_improvement_prompt(evaluation, api_key)
-                    JOBS[job_id]["improvement_prompt"] = improvement_result
-                    print("✅ Improvement prompt generated successfully")
-                except Exception as e:
-                    print(f"⚠️ Failed to generate improvement prompt: {e}")
-                    JOBS[job_id]["improvement_prompt"] = {"error": str(e)}
-        else:
-            JOBS[job_id]["status"] = "failed"
-            JOBS[job_id]["message"] = "Generation returned no output."
+        if not audio_delivered(job_id):
+            update_job(job_id, status="failed", message="Generation returned no output.")
             
+    except asyncio.CancelledError:
+        print(f"Job {job_id} cancelled")
+        # Audio that already made it out stays available
+        if not audio_delivered(job_id):
+            update_job(job_id, status="cancelled", message="Cancelled")
+        raise
     except WikipediaNotFoundError as e:
         print(f"Job {job_id} failed: {e}")
-        JOBS[job_id]["status"] = "failed"
-        JOBS[job_id]["message"] = str(e)  # Use the clean error message from the exception
+        # Use the clean error message from the exception
+        update_job(job_id, status="failed", message=str(e))
     except Exception as e:
         print(f"Job {job_id} failed: {e}")
-        JOBS[job_id]["status"] = "failed"
-        JOBS[job_id]["message"] = f"Error: {str(e)}"
+        # Audio that already made it out stays available
+        if not audio_delivered(job_id):
+            update_job(job_id, status="failed", message=f"Error: {str(e)}")
+    finally:
+        ATTACHED.pop(job_id, None)
+        job = JOBS.get(job_id)
+        if job is not None:
+            update_job(job_id, pending_stages=[])
+        # Only completed jobs can be evicted before this point
+        status = job["status"] if job is not None else "completed"
+        JOBS_FINISHED.inc(status=status)
+        # Late listeners are served the finished file from now on
+        stream = STREAMS.pop(job_id, None)
+        if stream:
+            stream.close(error=None if status == "completed" else job["message"])
+
+def find_shared_job(topic_key: str) -> Optional[dict]:
+    """
+    Find a job a new request for this topic can attach to instead of starting over.
+
+    Concurrent requests share the job already running for the topic, and a
+    recently finished episode is returned as is, without any LLM or TTS calls.
+    """
+    completed_since = time.time() - EPISODE_CACHE_TTL if EPISODE_CACHE_TTL > 0 else float("inf")
+    job_id = JOBS.find_by_topic(topic_key, completed_since)
+    if job_id is None:
+        return None
+    job = JOBS.get(job_id)
+    if job["status"] == "completed":
+        if get_artifact_store().path(job["filename"]) is None:
+            return None
+        return {"job_id": job_id, "status": "completed", "cached": True}
+    ATTACHED[job_id] = ATTACHED.get(job_id, 1) + 1
+    return {"job_id": job_id, "status": job["status"], "deduplicated": True, **SCHEDULER.queue_info(job_id)}
 
 @app.post("/api/generate")
-async def generate_podcast(req: GenerateRequest, background_tasks: BackgroundTasks):
+async def generate_podcast(req: GenerateRequest, request: Request):
+    topic_key = normalize_title(req.topic)
+    shared = find_shared_job(topic_key)
+    if shared is not None:
+        CACHE_LOOKUPS.inc(cache="episode", result="cached" if shared.get("cached") else "deduplicated")
+        return shared
+    CACHE_LOOKUPS.inc(cache="episode", result="misses")
+
+    # Admission control: reject instead of piling more work onto the workers
+    if SCHEDULER.is_full():
+        JOBS_REJECTED.inc()
+        retry_after = SCHEDULER.retry_after()
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Too many podcasts in the queue. Please try again shortly.", "retry_after": retry_after},
+            headers={"Retry-After": str(retry_after)},
+        )
+
     job_id = str(uuid.uuid4())
-    JOBS[job_id] = {
+    JOBS.create(job_id, {
         "status": "pending",
         "topic": req.topic,
+        "topic_key": topic_key,
         "message": "Queued",
         "filename": None,
         "progress": 0,
         "evaluation": None,  # Will be populated after script evaluation
-        "improvement_prompt": None  # Will be populated after improvement prompt generation
-    }
+        "improvement_prompt": None,  # Will be populated after improvement prompt generation
+        "pending_stages": ["audio", "evaluation", "improvement_prompt"]  # Stages still running
+    })
     
-    background_tasks.add_task(processing_task, job_id, req.topic)
+    STREAMS[job_id] = EpisodeStream()
+    ATTACHED[job_id] = 1
+    SCHEDULER.submit(job_id, lambda: processing_task(job_id, req.topic), priority=request_priority(request))
     
-    return {"job_id": job_id, "status": "pending"}
+    return {"job_id": job_id, "status": "pending", **SCHEDULER.queue_info(job_id)}
 
 @app.get("/api/status/{job_id}")
 async def get_status(job_id: str):
-    if job_id not in JOBS:
+    job = current_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return JOBS[job_id]
+    return {**job, **SCHEDULER.queue_info(job_id)}
+
+@app.post("/api/cancel/{job_id}")
+async def cancel_job(job_id: str):
+    """
+    Cancels a queued or running job and frees its worker slot.
+
+    A job shared by several generate requests keeps running for the others:
+    each cancel detaches one request, and only the last one stops the job.
+    """
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    attached = ATTACHED.get(job_id, 1)
+    if attached > 1 and job["status"] in ("pending", "processing"):
+        ATTACHED[job_id] = attached - 1
+        return {"job_id": job_id, "status": job["status"], "detached": True, "attached": attached - 1}
+
+    where = SCHEDULER.cancel(job_id)
+    if where is None:
+        raise HTTPException(status_code=409, detail=f"Job is already {job['status']}")
+
+    if where == "queued":
+        # Never started, so nothing else will record the cancellation
+        ATTACHED.pop(job_id, None)
+        update_job(job_id, status="cancelled", message="Cancelled", pending_stages=[])
+        JOBS_FINISHED.inc(status="cancelled")
+        stream = STREAMS.pop(job_id, None)
+        if stream:
+            stream.close(error="Cancelled")
 
-@app.get("/api/download/{filename}")
-async def download_file(filename: str):
-    file_path = os.path.join(OUTPUT_DIR, filename)
-    if not os.path.exists(file_path):
+    # A running job records its own cancellation as its tasks unwind
+    return {"job_id": job_id, "status": "cancelled"}
+
+@app.get("/api/events/{job_id}")
+async def job_events(job_id: str):
+    """
+    Pushes job progress as Server-Sent Events.
+
+    The first message is the full job record; after that only changed fields
+    are sent, throttled and coalesced. The stream ends with an "end" event once
+    the job has failed or been cancelled, or completed with no stages left pending.
+    """
+    # Subscribe before reading the job so no update falls in between
+    subscription = EVENTS.subscribe(job_id)
+    job = current_job(job_id)
+    if job is None:
+        EVENTS.unsubscribe(subscription)
+        raise HTTPException(status_code=404, detail="Job not found")
+    job.update(SCHEDULER.queue_info(job_id))
+
+    async def event_source():
+        try:
+            yield format_sse(subscription.snapshot(job))
+            while not subscription.is_finished():
+                changes = await subscription.next_changes(timeout=JOB_EVENTS_KEEPALIVE)
+                if changes is None:
+                    yield ": keep-alive\n\n"
+                elif changes:
+                    yield format_sse(changes)
+            yield format_sse({}, event="end")
+        finally:
+            EVENTS.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag, as RFC 9110 requires."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+def modified_since(if_modified_since: str, timestamp: float) -> bool:
+    """True unless the If-Modified-Since date is at or after `timestamp`."""
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return True
+    # HTTP dates have one-second resolution
+    return int(timestamp) > since
+
+@app.api_route("/api/download/{filename}", methods=["GET", "HEAD"])
+async def download_file(filename: str, request: Request):
+    """
+    Serves a published episode.
+
+    Episode files are content-addressed, so they get a strong ETag (their
+    SHA-256) and are cacheable forever. Conditional requests are answered
+    with 304, and Range requests (seeking in the player) with 206.
+    """
+    store = get_artifact_store()
+    artifact = store.get(filename)
+    file_path = store.path(filename) if artifact else None
+    if file_path is None:
         raise HTTPException(status_code=404, detail="File not found")
-        
-    return FileResponse(file_path, media_type="audio/mpeg", filename=filename)
+    store.touch(filename)
+
+    headers = {
+        "ETag": f'"{artifact["sha256"]}"',
+        "Last-Modified": formatdate(artifact["created_at"], usegmt=True),
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "Accept-Ranges": "bytes",
+    }
+
+    # If-None-Match takes precedence; If-Modified-Since is only used without it
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+    elif if_modified_since is not None and not modified_since(if_modified_since, artifact["created_at"]):
+        return Response(status_code=304, headers=headers)
+
+    if DOWNLOAD_ACCEL_PREFIX:
+        # The proxy serves the bytes (and any Range) straight from disk
+        headers["X-Accel-Redirect"] = DOWNLOAD_ACCEL_PREFIX + filename
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return Response(media_type="audio/mpeg", headers=headers)
+
+    # Handles Range/If-Range and HEAD, and uses the server's pathsend extension when offered
+    return FileResponse(file_path, media_type="audio/mpeg", filename=filename, headers=headers)
+
+@app.get("/api/chapters/{filename}")
+async def get_chapters(filename: str):
+    """
+    Returns the chapter manifest of a published episode: start time, duration,
+    byte offset/length, speaker and word timings of every script line.
+    """
+    file_path = get_artifact_store().attachment_path(filename, "chapters")
+    if file_path is None:
+        raise HTTPException(status_code=404, detail="Chapters not found")
+
+    return FileResponse(file_path, media_type="application/json", headers={"Cache-Control": "public, max-age=3600"})
+
+@app.get("/api/stream/{job_id}")
+async def stream_episode(job_id: str):
+    """
+    Streams the episode's MP3 while it is still being synthesized.
+
+    Segments are sent with chunked transfer as soon as they are ready and the
+    response blocks until later segments arrive. Once the job has finished,
+    the completed file is served instead.
+    """
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    stream = STREAMS.get(job_id)
+    if stream is None:
+        store = get_artifact_store()
+        file_path = store.path(job["filename"]) if job["filename"] else None
+        if job["status"] == "completed" and file_path:
+            store.touch(job["filename"])
+            return FileResponse(file_path, media_type="audio/mpeg")
+        raise HTTPException(status_code=404, detail="No audio available for this job")
+
+    return StreamingResponse(
+        stream.iter_chunks(),
+        media_type="audio/mpeg",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint: stage latencies, upstream errors, cache hits and job counts."""
+    stats = SCHEDULER.stats()
+    JOBS_GAUGE.set(stats["queued"], state="queued")
+    JOBS_GAUGE.set(stats["running"], state="running")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 @app.get("/api/wikipedia/suggest")
 async def get_wikipedia_suggestions(query: str):
     """
     Proxies requests to Wikipedia's OpenSearch API for autocomplete suggestions.
+
+    Served through the shared async client: repeated and longer prefixes come
+    from an in-memory cache and identical concurrent queries share one call.
     """
     if not query or len(query.strip()) < 2:
         return {"suggestions": []}
         
     try:
-        # Wikipedia OpenSearch API
-        url = "https://en.wikipedia.org/w/api.php"
-        params = {
-            "action": "opensearch",
-            "search": query,
-            "limit": 7,
-            "namespace": 0,
-            "format": "json"
-        }
-        
-        # Use a proper User-Agent as requested by Wikipedia
-        headers = {'User-Agent': 'SyntheticRadioHost/1.0 (test@example.com)'}
-        
-        # Use httpx for async request (we need to import it first, but requests is already used in main.py)
-        # For simplicity in this existing sync/async mix, we'll use requests but wrapping it 
-        # normally we should use httpx.AsyncClient, but let's stick to what's available
-        # Actually, let's use requests with verify=False consistent with main.py "nuclear option"
-        resp = requests.get(url, params=params, headers=headers, verify=False)
-        
-        if resp.status_code == 200:
-            data = resp.json()
-            # OpenSearch returns [query, [titles], [descriptions], [urls]]
-            # We just want the titles
-            if len(data) > 1:
-                return {"suggestions": data[1]}
-            return {"suggestions": []}
-        else:
-            print(f"Wikipedia API error: {resp.status_code}")
-            return {"suggestions": []}
-            
+        return {"suggestions": await get_wikipedia_client().suggest(query)}
+    except httpx.HTTPStatusError as e:
+        print(f"Wikipedia API error: {e.response.status_code}")
+        return {"suggestions": []}
     except Exception as e:
         print(f"Error fetching suggestions: {e}")
         return {"suggestions": []}
@@ -0,0 +1,192 @@
+"""
+Relevance-Ranked Source Extraction
+
+This module picks the part of a Wikipedia article that goes into the script
+prompt. Before, the prompt used the first 4000 characters, which was often
+the lead plus half of some arbitrary section. Now the plain-text extract is
+split into its sections and paragraphs, and reference-style sections (See
+also, References, ...) are dropped. Each paragraph is scored by TF-IDF
+cosine similarity against the title and lead section. The best paragraphs
+are then packed into SOURCE_TOKEN_BUDGET, always starting with the lead.
+They are emitted in article order under their section headings, so the LLM
+gets fewer tokens that are more on-topic.
+"""
+
+import os
+import re
+import math
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+
+# Approximate prompt tokens spent on the article
+SOURCE_TOKEN_BUDGET = int(os.getenv("SOURCE_TOKEN_BUDGET", "1000"))
+
+# Rough English/romanized average; good enough for budgeting, no tokenizer needed
+CHARS_PER_TOKEN = 4
+
+# Sections that are lists of links or citations rather than content
+SKIPPED_SECTIONS = {
+    "see also", "references", "external links", "further reading", "notes",
+    "bibliography", "sources", "citations", "footnotes", "gallery", "notes and references",
+}
+
+STOPWORDS = set("""
+a about after also an and any are as at be been before being but by can could did do does during each
+for from had has have he her his how however i if in into is it its itself more most no not of on
+one only or other our out over she so some such than that the their them then there these they this
+those through to under until up was we were what when where which while who whom why will with would
+you your
+""".split())
+
+HEADING_RE = re.compile(r"^(={2,6})\s*(.+?)\s*\1\s*$")
+WORD_RE = re.compile(r"[^\W\d_]{2,}")
+
+
+# (level, title) of every heading from the top-level section down, () for the lead
+HeadingPath = Tuple[Tuple[int, str], ...]
+
+
+class Paragraph(NamedTuple):
+    position: int          # order in the article
+    section: Optional[str]  # heading, None for the lead
+    text: str
+    path: HeadingPath = ()
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def tokenize(text: str) -> List[str]:
+    return [word for word in WORD_RE.findall(text.lower()) if word not in STOPWORDS]
+
+
+def heading_line(level: int, title: str) -> str:
+    return f"{'=' * level} {title} {'=' * level}"
+
+
+def split_paragraphs(extract: str) -> List[Paragraph]:
+    """Split a TextExtracts plain-text extract into paragraphs tagged with their section and heading path."""
+    paragraphs = []
+    section: Optional[str] = None
+    path: List[Tuple[int, str]] = []
+    # Level of the skipped heading, if inside a skipped section
+    skipped_level: Optional[int] = None
+    for line in extract.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        heading = HEADING_RE.match(line)
+        if heading:
+            level, title = len(heading.group(1)), heading.group(2)
+            # A skipped section's subsections are skipped with it; its siblings are not
+            if skipped_level is None or level <= skipped_level:
+                skipped_level = level if title.lower() in SKIPPED_SECTIONS else None
+            section = title
+            while path and path[-1][0] >= level:
+                path.pop()
+            path.append((level, title))
+            continue
+        if skipped_level is None:
+            paragraphs.append(Paragraph(len(paragraphs), section, line, tuple(path)))
+    return paragraphs
+
+
+def tfidf_vectors(documents: List[List[str]]) -> List[Dict[str, float]]:
+    """L2-normalized TF-IDF vectors, one per tokenized document."""
+    document_frequency = Counter()
+    for tokens in documents:
+        document_frequency.update(set(tokens))
+    count = len(documents)
+    vectors = []
+    for tokens in documents:
+        weights = {
+            term: (1 + math.log(tf)) * (math.log((1 + count) / (1 + document_frequency[term])) + 1)
+            for term, tf in Counter(tokens).items()
+        }
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        vectors.append({term: w / norm for term, w in weights.items()})
+    return vectors
+
+
+def rank_paragraphs(title: str, paragraphs: List[Paragraph]) -> List[float]:
+    """Salience of every paragraph: cosine similarity to the title and lead, with a small bonus for early text."""
+    lead = " ".join(p.text for p in paragraphs if p.section is None)
+    # The title is repeated so its words outweigh the rest of the lead
+    query = tokenize(f"{title} {title} {title} {lead}")
+    vectors = tfidf_vectors([tokenize(f"{p.section or ''} {p.text}") for p in paragraphs] + [query])
+    query_vector = vectors.pop()
+    scores = []
+    for paragraph, vector in zip(paragraphs, vectors):
+        similarity = sum(weight * query_vector.get(term, 0.0) for term, weight in vector.items())
+        scores.append(similarity / (1 + 0.02 * paragraph.position))
+    return scores
+
+
+def truncate_to_tokens(text: str, tokens: int) -> str:
+    """Cut text to about `tokens`, at the last sentence end (or else word end) that fits."""
+    limit = tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit + 1]
+    end = max(cut.rfind(". "), cut.rfind("। "), cut.rfind("? "), cut.rfind("! "))
+    if end > 0:
+        return cut[:end + 1]
+    return cut[:cut.rfind(" ")] if " " in cut else cut[:limit]
+
+
+def extract_relevant_content(title: str, extract: str, token_budget: int = SOURCE_TOKEN_BUDGET) -> str:
+    """
+    Select the most relevant paragraphs of an article within a token budget.
+
+    The lead comes first. The remaining budget goes to the highest-ranked
+    paragraphs, and section headings are charged against the budget too.
+    The result keeps article order, with a heading before each section used.
+    A subsection brings its parent headings along ("History" before
+    "Early"), and each heading is charged only the first time.
+    """
+    paragraphs = split_paragraphs(extract)
+    if not paragraphs:
+        return truncate_to_tokens(extract.strip(), token_budget)
+
+    scores = rank_paragraphs(title, paragraphs)
+    lead = [p for p in paragraphs if p.section is None]
+    rest = sorted((p for p in paragraphs if p.section is not None), key=lambda p: -scores[p.position])
+
+    selected: Dict[int, str] = {}
+    headings: Set[HeadingPath] = set()
+    remaining = token_budget
+    for paragraph in lead:
+        text = paragraph.text
+        if estimate_tokens(text) > remaining:
+            if selected:
+                break
+            # Even a tight budget keeps the start of the lead
+            text = truncate_to_tokens(text, remaining)
+        selected[paragraph.position] = text
+        remaining -= estimate_tokens(text)
+    for paragraph in rest:
+        new_headings = [paragraph.path[:depth] for depth in range(1, len(paragraph.path) + 1)
+                        if paragraph.path[:depth] not in headings]
+        cost = estimate_tokens(paragraph.text) + sum(estimate_tokens(heading_line(*h[-1])) for h in new_headings)
+        if cost <= remaining:
+            selected[paragraph.position] = paragraph.text
+            headings.update(new_headings)
+            remaining -= cost
+
+    parts = []
+    current_path: HeadingPath = ()
+    for paragraph in paragraphs:
+        if paragraph.position not in selected:
+            continue
+        if paragraph.path != current_path:
+            # Open every heading below the part of the path already shown
+            shared = 0
+            while shared < min(len(current_path), len(paragraph.path)) and current_path[shared] == paragraph.path[shared]:
+                shared += 1
+            for level, title in paragraph.path[shared:]:
+                parts.append(f"\n{heading_line(level, title)}")
+            current_path = paragraph.path
+        parts.append(selected[paragraph.position])
+    return "\n".join(parts).strip()
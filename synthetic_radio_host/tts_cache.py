@@ -0,0 +1,171 @@
+"""
+Content-Addressed TTS Segment Cache
+
+This module keeps synthesized MP3 segments on disk, keyed by a hash of the
+exact (text, voice, rate, pitch) that produced them. Short reactions like
+"Accha?" or "Haan haan" and re-runs of popular topics are then served from
+disk instead of another edge-tts round trip.
+
+The cache has a byte budget and evicts least-recently-used entries once it
+is exceeded. File modification times double as the LRU clock, so recency
+survives restarts. An entry can carry the word boundaries edge-tts reported
+for it, kept in a small JSON file next to the audio. Methods do blocking file
+I/O, so async callers run them through asyncio.to_thread.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+
+# Configuration
+TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "1") == "1"
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "cache/tts")
+TTS_CACHE_MAX_MB = float(os.getenv("TTS_CACHE_MAX_MB", "256"))
+
+ENTRY_SUFFIX = ".mp3"
+WORDS_SUFFIX = ".words.json"
+
+
+class SegmentCache:
+    """Size-bounded LRU cache of MP3 segments stored as one file per entry."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # key -> size in bytes, oldest access first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(text: str, voice: str, rate: str, pitch: str) -> str:
+        """Hash the synthesis inputs into a cache key."""
+        payload = "\x1f".join([voice, rate, pitch, text])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def _words_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + WORDS_SUFFIX)
+
+    def _write_atomic(self, path: str, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _load_index(self):
+        """Rebuild the in-memory LRU order from the files already on disk."""
+        found = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith(ENTRY_SUFFIX):
+                stat = os.stat(path)
+                found.append((stat.st_mtime, name[:-len(ENTRY_SUFFIX)], stat.st_size))
+            elif name.startswith(".tmp"):
+                # Leftover from a write that never got published
+                os.remove(path)
+
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached MP3 bytes for `key`, or None on a miss."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            try:
+                with open(self._path(key), "rb") as f:
+                    data = f.read()
+                # Bump recency both in memory and on disk
+                os.utime(self._path(key))
+            except FileNotFoundError:
+                # Removed behind our back - treat as a miss
+                self._total_bytes -= self._entries.pop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def get_words(self, key: str) -> Optional[list]:
+        """Return the word boundaries stored with `key`, or None if there are none."""
+        try:
+            with open(self._words_path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, data: bytes, words: Optional[list] = None):
+        """Store `data` (and its word boundaries) under `key` atomically, evicting old entries if needed."""
+        if len(data) > self.max_bytes:
+            return
+
+        # Words first, so a visible entry never lacks the boundaries it was stored with
+        if words is not None:
+            self._write_atomic(self._words_path(key), json.dumps(words).encode("utf-8"))
+        self._write_atomic(self._path(key), data)
+
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def _evict(self):
+        """Drop least-recently-used entries until we are within budget."""
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            for path in (self._path(key), self._words_path(key)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current usage."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+_segment_cache: Optional[SegmentCache] = None
+
+
+def get_segment_cache() -> Optional[SegmentCache]:
+    """Return the shared segment cache, or None when caching is disabled."""
+    global _segment_cache
+    if not TTS_CACHE_ENABLED:
+        return None
+    if _segment_cache is None:
+        _segment_cache = SegmentCache(TTS_CACHE_DIR, int(TTS_CACHE_MAX_MB * 1024 * 1024))
+    return _segment_cache
@@ -0,0 +1,144 @@
+"""
+Resilient edge-tts Client
+
+This module wraps single edge-tts synthesis calls so that one slow or
+dropped websocket no longer stalls or fails a whole episode:
+
+- Every attempt has a deadline (TTS_SEGMENT_TIMEOUT).
+- Transient failures (timeouts, dropped connections, empty responses) are
+  retried with full-jitter exponential backoff, up to TTS_RETRIES times.
+- With TTS_HEDGE enabled, an attempt that is still running after the
+  TTS_HEDGE_PERCENTILE latency of recent segments gets a duplicate request.
+  Whichever finishes first is used and the other is cancelled, so the TTS
+  stage is no longer as slow as its worst segment.
+"""
+
+import os
+import time
+import random
+import asyncio
+from collections import deque
+from typing import List, Optional, Tuple
+
+import aiohttp
+import edge_tts
+from edge_tts.exceptions import EdgeTTSException
+
+from metrics import HEDGES, RETRIES, upstream_call
+
+
+# Configuration
+TTS_SEGMENT_TIMEOUT = float(os.getenv("TTS_SEGMENT_TIMEOUT", "30"))
+TTS_RETRIES = int(os.getenv("TTS_RETRIES", "3"))
+TTS_BACKOFF_BASE = float(os.getenv("TTS_BACKOFF_BASE", "0.5"))
+TTS_BACKOFF_MAX = float(os.getenv("TTS_BACKOFF_MAX", "8"))
+TTS_HEDGE = os.getenv("TTS_HEDGE", "0").lower() in ("1", "true", "yes")
+TTS_HEDGE_PERCENTILE = float(os.getenv("TTS_HEDGE_PERCENTILE", "95"))
+# Never hedge sooner than this, and not before enough latencies are known
+TTS_HEDGE_MIN_DELAY = float(os.getenv("TTS_HEDGE_MIN_DELAY", "1.0"))
+TTS_HEDGE_MIN_SAMPLES = 20
+
+# Failures worth another attempt; anything else (e.g. a bad voice name) is raised at once
+TRANSIENT_ERRORS = (asyncio.TimeoutError, aiohttp.ClientError, EdgeTTSException, OSError)
+
+
+class LatencyWindow:
+    """Latencies of the most recent successful attempts, for the hedging threshold."""
+
+    def __init__(self, size: int = 200):
+        self.samples = deque(maxlen=size)
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if len(self.samples) < TTS_HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+LATENCIES = LatencyWindow()
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff before retry number `attempt` (0-based)."""
+    return random.uniform(0, min(TTS_BACKOFF_MAX, TTS_BACKOFF_BASE * 2 ** attempt))
+
+
+def hedge_delay() -> Optional[float]:
+    """How long to wait before sending a duplicate request, or None to not hedge."""
+    if not TTS_HEDGE:
+        return None
+    threshold = LATENCIES.percentile(TTS_HEDGE_PERCENTILE)
+    return max(TTS_HEDGE_MIN_DELAY, threshold) if threshold is not None else None
+
+
+async def _stream(text: str, voice: str, rate: str, pitch: str) -> Tuple[bytes, List[dict]]:
+    # Collect audio chunks and word boundaries as edge-tts streams them - no temp file round trip
+    communicate = edge_tts.Communicate(text, voice, rate=rate, pitch=pitch, boundary="WordBoundary")
+    audio = bytearray()
+    boundaries = []
+    async for chunk in communicate.stream():
+        if chunk["type"] == "audio":
+            audio.extend(chunk["data"])
+        elif chunk["type"] == "WordBoundary":
+            boundaries.append(chunk)
+    return bytes(audio), boundaries
+
+
+async def _attempt(text: str, voice: str, rate: str, pitch: str) -> Tuple[bytes, List[dict]]:
+    """One request with its deadline."""
+    started = time.perf_counter()
+    with upstream_call("edge_tts"):
+        try:
+            result = await asyncio.wait_for(_stream(text, voice, rate, pitch), TTS_SEGMENT_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(f"edge-tts did not finish within {TTS_SEGMENT_TIMEOUT:g}s")
+    LATENCIES.record(time.perf_counter() - started)
+    return result
+
+
+async def _hedged_attempt(text: str, voice: str, rate: str, pitch: str) -> Tuple[bytes, List[dict]]:
+    """One request, plus a duplicate if it is slower than usual; the first success wins."""
+    delay = hedge_delay()
+    if delay is None:
+        return await _attempt(text, voice, rate, pitch)
+
+    tasks = {asyncio.ensure_future(_attempt(text, voice, rate, pitch))}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            HEDGES.inc(service="edge_tts")
+            tasks.add(asyncio.ensure_future(_attempt(text, voice, rate, pitch)))
+
+        error = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def synthesize(text: str, voice: str, rate: str = "+0%", pitch: str = "+0Hz") -> Tuple[bytes, List[dict]]:
+    """
+    Synthesize one segment with deadlines, retries and optional hedging.
+
+    Returns:
+        tuple: (MP3 bytes, edge-tts WordBoundary chunks)
+    """
+    for attempt in range(TTS_RETRIES + 1):
+        try:
+            return await _hedged_attempt(text, voice, rate, pitch)
+        except TRANSIENT_ERRORS as e:
+            if attempt == TTS_RETRIES:
+                raise
+            delay = backoff_delay(attempt)
+            RETRIES.inc(service="edge_tts")
+            print(f"⚠️ edge-tts {type(e).__name__}, retrying in {delay:.1f}s ({attempt + 1}/{TTS_RETRIES})")
+            await asyncio.sleep(delay)
@@ -0,0 +1,335 @@
+"""
+Async Wikipedia Client with Persistent Caching
+
+This module provides a single, connection-pooled async client for the
+Wikipedia API. Article extracts are cached in SQLite keyed by normalized
+title, so popular topics skip the network entirely:
+
+- Redirects are resolved on fetch and every alias ("AI", "Artificial
+  Intelligence", ...) points at the same canonical entry.
+- Entries are fresh for WIKI_CACHE_TTL seconds. After that a cheap
+  revision-id lookup decides whether the cached extract is still current
+  before the full article is downloaded again.
+
+Autocomplete suggestions go through the same pool, with an in-memory LRU
+prefix cache and request coalescing for identical in-flight queries.
+"""
+
+import os
+import time
+import sqlite3
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import httpx
+
+from metrics import CACHE_LOOKUPS, upstream_call
+
+
+# Configuration
+WIKIPEDIA_API_URL = os.getenv("WIKIPEDIA_API_URL", "https://{lang}.wikipedia.org/w/api.php")
+WIKI_CACHE_PATH = os.getenv("WIKI_CACHE_PATH", "cache/wikipedia.db")
+WIKI_CACHE_TTL = int(os.getenv("WIKI_CACHE_TTL", str(6 * 60 * 60)))
+WIKI_TIMEOUT = float(os.getenv("WIKI_TIMEOUT", "15"))
+SUGGEST_LIMIT = 7
+SUGGEST_CACHE_SIZE = int(os.getenv("SUGGEST_CACHE_SIZE", "4096"))
+SUGGEST_CACHE_TTL = int(os.getenv("SUGGEST_CACHE_TTL", "600"))
+
+# Use a proper User-Agent as requested by Wikipedia
+USER_AGENT = "SyntheticRadioHost/1.0 (test@example.com)"
+
+
+def normalize_title(title: str) -> str:
+    """Normalize a topic or title into a cache key."""
+    return " ".join(title.replace("_", " ").split()).casefold()
+
+
+class WikipediaCache:
+    """SQLite-backed store of article extracts and the aliases that point at them."""
+
+    def __init__(self, path: str):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+                lang TEXT NOT NULL,
+                title TEXT NOT NULL,
+                revid INTEGER,
+                extract TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (lang, title)
+            );
+            CREATE TABLE IF NOT EXISTS aliases (
+                lang TEXT NOT NULL,
+                alias TEXT NOT NULL,
+                title TEXT NOT NULL,
+                PRIMARY KEY (lang, alias)
+            );
+        """)
+        self._conn.commit()
+
+    def lookup(self, lang: str, topic: str) -> Optional[dict]:
+        """Find the cached page for a topic or any of its aliases."""
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT p.title, p.revid, p.extract, p.fetched_at
+                FROM aliases a JOIN pages p ON p.lang = a.lang AND p.title = a.title
+                WHERE a.lang = ? AND a.alias = ?
+                """,
+                (lang, normalize_title(topic)),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"title": row[0], "revid": row[1], "extract": row[2], "fetched_at": row[3]}
+
+    def store(self, lang: str, page: dict, aliases: list):
+        """Save a page and point every alias (and its own title) at it."""
+        now = time.time()
+        keys = {normalize_title(a) for a in aliases} | {normalize_title(page["title"])}
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (lang, title, revid, extract, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (lang, page["title"], page.get("revid"), page["extract"], now),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO aliases (lang, alias, title) VALUES (?, ?, ?)",
+                [(lang, key, page["title"]) for key in keys],
+            )
+
+    def touch(self, lang: str, title: str):
+        """Mark a page as revalidated just now."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE pages SET fetched_at = ? WHERE lang = ? AND title = ?",
+                (time.time(), lang, title),
+            )
+
+
+class PrefixCache:
+    """In-memory LRU cache of autocomplete results keyed by normalized query."""
+
+    def __init__(self, max_entries: int = SUGGEST_CACHE_SIZE, ttl: int = SUGGEST_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, titles = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return titles
+
+    def put(self, key: str, titles: List[str]):
+        self._entries[key] = (time.time() + self.ttl, titles)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def covering(self, key: str, limit: int) -> Optional[List[str]]:
+        """
+        Answer a query from a cached shorter prefix, if possible.
+
+        A shorter prefix that returned fewer than `limit` titles already
+        holds every match there is, so the longer query's results are just
+        the titles that still start with it.
+        """
+        for end in range(len(key) - 1, 1, -1):
+            titles = self.get(key[:end])
+            if titles is not None and len(titles) < limit:
+                return [t for t in titles if normalize_title(t).startswith(key)]
+        return None
+
+
+class WikipediaClient:
+    """Pooled async Wikipedia API client with a revision-aware article cache."""
+
+    def __init__(self, cache: Optional[WikipediaCache] = None, ttl: int = WIKI_CACHE_TTL):
+        self.cache = cache
+        self.ttl = ttl
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        self.suggest_stats = {"hits": 0, "prefix_hits": 0, "coalesced": 0, "misses": 0}
+        self.suggestions = PrefixCache()
+        self._inflight_suggestions: Dict[str, asyncio.Future] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop = None
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """The shared keep-alive connection pool for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._release()
+            # Verify=False to bypass the SSL certificate issue on this machine
+            self._client = httpx.AsyncClient(
+                verify=False,
+                timeout=WIKI_TIMEOUT,
+                headers={"User-Agent": USER_AGENT},
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+            self._loop = loop
+        return self._client
+
+    async def api_get(self, params: dict, lang: str = "en"):
+        """Call the MediaWiki API and return the decoded JSON."""
+        with upstream_call("wikipedia"):
+            response = await self.http.get(WIKIPEDIA_API_URL.format(lang=lang), params=params)
+            response.raise_for_status()
+            return response.json()
+
+    def _count(self, stats: dict, cache: str, result: str):
+        stats[result] += 1
+        CACHE_LOOKUPS.inc(cache=cache, result=result)
+
+    def hit_rate(self) -> float:
+        lookups = sum(self.stats.values())
+        served = self.stats["hits"] + self.stats["revalidated"]
+        return round(served / lookups, 4) if lookups else 0.0
+
+    async def _current_revid(self, title: str, lang: str) -> Optional[int]:
+        data = await self.api_get({
+            "action": "query",
+            "format": "json",
+            "titles": title,
+            "prop": "revisions",
+            "rvprop": "ids",
+        }, lang)
+        for page in data.get("query", {}).get("pages", {}).values():
+            revisions = page.get("revisions") or []
+            if revisions:
+                return revisions[0].get("revid")
+        return None
+
+    async def fetch_page(self, topic: str, lang: str = "en") -> Optional[dict]:
+        """
+        Fetch the plain-text extract of an article.
+
+        Returns:
+            dict with "title", "extract" and "revid", or None if the page does not exist
+        """
+        # SQLite calls run in a worker thread so the event loop never waits on disk
+        if self.cache:
+            cached = await asyncio.to_thread(self.cache.lookup, lang, topic)
+            if cached:
+                if time.time() - cached["fetched_at"] < self.ttl:
+                    self._count(self.stats, "wikipedia_page", "hits")
+                    return cached
+                # Stale: only download the article again if it actually changed
+                if cached["revid"] is not None and await self._current_revid(cached["title"], lang) == cached["revid"]:
+                    await asyncio.to_thread(self.cache.touch, lang, cached["title"])
+                    self._count(self.stats, "wikipedia_page", "revalidated")
+                    return cached
+
+        self._count(self.stats, "wikipedia_page", "misses")
+        data = await self.api_get({
+            "action": "query",
+            "format": "json",
+            "titles": topic,
+            "prop": "extracts|revisions",
+            "rvprop": "ids",
+            "explaintext": True,
+            "redirects": 1,
+        }, lang)
+
+        query = data["query"]
+        pages = query["pages"]
+        page_id = list(pages.keys())[0]
+        if page_id == "-1" or "missing" in pages[page_id]:
+            return None
+
+        page_data = pages[page_id]
+        revisions = page_data.get("revisions") or []
+        page = {
+            "title": page_data.get("title", topic),
+            "extract": page_data.get("extract", ""),
+            "revid": revisions[0].get("revid") if revisions else None,
+        }
+
+        # Every spelling that led here shares the same cache entry
+        aliases = [topic]
+        for hop in query.get("normalized", []) + query.get("redirects", []):
+            aliases.extend([hop.get("from", ""), hop.get("to", "")])
+
+        if self.cache and page["extract"].strip():
+            await asyncio.to_thread(self.cache.store, lang, page, [a for a in aliases if a])
+        return page
+
+    async def _fetch_suggestions(self, query: str, limit: int) -> List[str]:
+        # Wikipedia OpenSearch API
+        data = await self.api_get({
+            "action": "opensearch",
+            "search": query,
+            "limit": limit,
+            "namespace": 0,
+            "format": "json",
+        })
+        # OpenSearch returns [query, [titles], [descriptions], [urls]]
+        # We just want the titles
+        return data[1] if len(data) > 1 else []
+
+    async def suggest(self, query: str, limit: int = SUGGEST_LIMIT) -> List[str]:
+        """Return autocomplete titles for a query, hitting the API as little as possible."""
+        key = normalize_title(query)
+
+        titles = self.suggestions.get(key)
+        if titles is not None:
+            self._count(self.suggest_stats, "wikipedia_suggest", "hits")
+            return titles
+
+        titles = self.suggestions.covering(key, limit)
+        if titles is not None:
+            self._count(self.suggest_stats, "wikipedia_suggest", "prefix_hits")
+            self.suggestions.put(key, titles)
+            return titles
+
+        # Identical queries already on the wire share the one upstream call
+        inflight = self._inflight_suggestions.get(key)
+        if inflight is not None:
+            self._count(self.suggest_stats, "wikipedia_suggest", "coalesced")
+            return await asyncio.shield(inflight)
+
+        self._count(self.suggest_stats, "wikipedia_suggest", "misses")
+        task = asyncio.ensure_future(self._fetch_suggestions(query, limit))
+        self._inflight_suggestions[key] = task
+        try:
+            titles = await asyncio.shield(task)
+        finally:
+            self._inflight_suggestions.pop(key, None)
+        self.suggestions.put(key, titles)
+        return titles
+
+    def _release(self):
+        """Let go of a pool that belongs to another event loop, closing it there if that loop is still open."""
+        client, loop = self._client, self._loop
+        self._client = self._loop = None
+        if client is not None and loop is not None and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+    async def aclose(self):
+        """Close the connection pool; call before the event loop shuts down."""
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            client, self._client, self._loop = self._client, None, None
+            await client.aclose()
+        else:
+            self._release()
+
+
+_wikipedia_client: Optional[WikipediaClient] = None
+
+
+def get_wikipedia_client() -> WikipediaClient:
+    """Return the process-wide Wikipedia client."""
+    global _wikipedia_client
+    if _wikipedia_client is None:
+        _wikipedia_client = WikipediaClient(cache=WikipediaCache(WIKI_CACHE_PATH))
+    return _wikipedia_client